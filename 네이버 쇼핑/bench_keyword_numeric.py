@@ -0,0 +1,83 @@
+"""검색수 정규화 벤치마크: 기존 행 단위 convert_to_numeric vs 벡터 연산
+
+사용 예: python bench_keyword_numeric.py 300000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from naver_numeric import normalize_keyword_frame, to_search_count
+
+
+def convert_to_numeric(val):
+    """기존 키워드 탭의 행 단위 변환 (비교용 원본)"""
+    if isinstance(val, str):
+        if val == '< 10' or val == '<10':
+            return 5
+        try:
+            return int(val.replace(',', ''))
+        except (ValueError, AttributeError):
+            return 0
+    return val if isinstance(val, (int, float)) else 0
+
+
+def make_keyword_list(n, seed=0):
+    """keywordList 응답과 비슷한 합성 데이터 (검색수 일부는 "< 10")"""
+    rng = np.random.default_rng(seed)
+    pc = rng.integers(0, 500000, n).astype(object)
+    mobile = rng.integers(0, 2000000, n).astype(object)
+    pc[rng.random(n) < 0.2] = "< 10"
+    mobile[rng.random(n) < 0.1] = "< 10"
+    return pd.DataFrame({
+        'relKeyword': [f"키워드{i}" for i in range(n)],
+        'monthlyPcQcCnt': pc,
+        'monthlyMobileQcCnt': mobile,
+        'monthlyAvePcClkCnt': rng.random(n) * 1000,
+        'monthlyAveMobileClkCnt': rng.random(n) * 5000,
+        'monthlyAvePcCtr': rng.random(n) * 5,
+        'monthlyAveMobileCtr': rng.random(n) * 5,
+        'plAvgDepth': rng.integers(0, 15, n),
+        'compIdx': rng.choice(['낮음', '중간', '높음'], n),
+    })
+
+
+def best_of(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n):
+    df = make_keyword_list(n)
+
+    def legacy():
+        pc = df['monthlyPcQcCnt'].apply(convert_to_numeric)
+        mobile = df['monthlyMobileQcCnt'].apply(convert_to_numeric)
+        return pc + mobile
+
+    def vectorized():
+        return normalize_keyword_frame(df)
+
+    # 두 경로의 결과가 같은지 먼저 확인
+    expected = legacy()
+    got = to_search_count(df['monthlyPcQcCnt']) + to_search_count(df['monthlyMobileQcCnt'])
+    assert (expected.astype(np.int64).to_numpy() == got.to_numpy()).all(), "결과 불일치"
+
+    t_legacy = best_of(legacy)
+    t_vector = best_of(vectorized)
+    mem_before = df.memory_usage(deep=True).sum()
+    mem_after = vectorized().drop(columns=['monthlyPcQcCnt', 'monthlyMobileQcCnt']).memory_usage(deep=True).sum()
+
+    print(f"행 수: {n:,}")
+    print(f"행 단위 apply (검색수 2개 컬럼): {t_legacy * 1000:,.1f} ms")
+    print(f"벡터 정규화 (숫자 필드 전체):   {t_vector * 1000:,.1f} ms  ({t_legacy / t_vector:,.1f}배)")
+    print(f"메모리: {mem_before / 1e6:,.1f} MB -> {mem_after / 1e6:,.1f} MB (원본 검색수 컬럼 제외)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
@@ -0,0 +1,68 @@
+"""검색광고 서명 벤치마크: 기존 Signature.generate + get_header vs SearchAdSigner
+
+사용 예: python bench_signer.py 200000 8
+(호출 수, 멀티스레드 측정 시 스레드 수)
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from naver_api import Signature, SearchAdSigner, get_header
+
+API_KEY = "0100000000abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+SECRET_KEY = "AQAAAAB0ZXN0LXNlY3JldC1rZXktZm9yLWJlbmNobWFyay1vbmx5=="
+CUSTOMER_ID = "1234567"
+METHOD = "GET"
+URI = "/keywordstool"
+
+
+def best_of(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n, threads):
+    signer = SearchAdSigner(API_KEY, SECRET_KEY, CUSTOMER_ID)
+
+    # 같은 타임스탬프로 두 경로의 헤더가 같은지 먼저 확인
+    timestamp = "1700000000000"
+    legacy_signature = Signature.generate(timestamp, METHOD, URI, SECRET_KEY).decode("utf-8")
+    headers = signer.headers(METHOD, URI, timestamp)
+    assert headers['X-Signature'] == legacy_signature, "서명 불일치"
+    assert set(headers) == set(get_header(METHOD, URI, API_KEY, SECRET_KEY, CUSTOMER_ID)), "헤더 키 불일치"
+
+    def legacy(count=n):
+        for _ in range(count):
+            get_header(METHOD, URI, API_KEY, SECRET_KEY, CUSTOMER_ID)
+
+    def reusable(count=n):
+        for _ in range(count):
+            signer.headers(METHOD, URI)
+
+    def threaded(func):
+        per_thread = n // threads
+
+        def run():
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda _: func(per_thread), range(threads)))
+        return run
+
+    t_legacy = best_of(legacy)
+    t_signer = best_of(reusable)
+    t_legacy_mt = best_of(threaded(legacy))
+    t_signer_mt = best_of(threaded(reusable))
+
+    print(f"호출 수: {n:,}")
+    print(f"get_header (단일 스레드):       {t_legacy / n * 1e6:,.2f} µs/호출")
+    print(f"SearchAdSigner (단일 스레드):   {t_signer / n * 1e6:,.2f} µs/호출  ({t_legacy / t_signer:,.1f}배)")
+    print(f"get_header ({threads}스레드):          {t_legacy_mt / n * 1e6:,.2f} µs/호출")
+    print(f"SearchAdSigner ({threads}스레드):      {t_signer_mt / n * 1e6:,.2f} µs/호출  ({t_legacy_mt / t_signer_mt:,.1f}배)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8)
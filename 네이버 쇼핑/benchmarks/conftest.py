@@ -0,0 +1,108 @@
+"""벤치마크 공용 픽스처: 모의 서버, 오프라인 설정, 지연 시간 측정
+
+실행: python -m pytest  (네이버 쇼핑 디렉터리에서, pytest.ini의 testpaths=benchmarks)
+비교: python -m pytest --benchmark-autosave 후 --benchmark-compare
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import naver_api
+import naver_async
+from naver_cache import configure_cache
+from naver_canon import configure_canonicalizer
+from naver_http import configure_client
+from naver_mock_server import MockNaverServer
+from naver_pool import configure_pools
+from naver_ratelimit import configure_scheduler
+
+
+CLIENT_ID = "bench-client"
+CLIENT_SECRET = "bench-client-secret"
+API_KEY = "bench-api-key"
+SECRET_KEY = "bench-secret-key"
+CUSTOMER_ID = "1234567"
+
+# 네트워크 왕복을 흉내 내는 기본 응답 지연 (초)
+MOCK_LATENCY = 0.005
+# 클라이언트 쪽 처리량을 재므로 토큰 버킷은 사실상 제한하지 않음
+BENCH_LIMITS = {endpoint: (100000, None) for endpoint in ("keywordstool", "shop", "blog", "datalab")}
+BENCH_POOL_SIZE = 64
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    server = MockNaverServer(
+        latency=MOCK_LATENCY,
+        openapi_credentials={CLIENT_ID: CLIENT_SECRET},
+        searchad_credentials={API_KEY: (SECRET_KEY, CUSTOMER_ID)},
+    )
+    with server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def offline(mock_server, monkeypatch):
+    """모든 fetcher가 모의 서버로 가도록 하고 캐시/키 풀/속도 제한을 벤치마크용으로 교체"""
+    for module in (naver_api, naver_async):
+        monkeypatch.setattr(module, "OPENAPI_BASE_URL", mock_server.base_url)
+        monkeypatch.setattr(module, "SEARCHAD_BASE_URL", mock_server.base_url)
+    monkeypatch.delenv("NAVER_CREDENTIALS", raising=False)
+    configure_cache(enabled=False)
+    configure_canonicalizer(synonyms={})
+    configure_scheduler(limits=BENCH_LIMITS, base_delay=0.01, max_delay=0.05)
+    configure_pools()
+    configure_client(pool_size=BENCH_POOL_SIZE)
+    mock_server.latency = MOCK_LATENCY
+    mock_server.rate_429 = 0.0
+    mock_server.malformed_rate = 0.0
+    mock_server.reset_stats()
+    yield mock_server
+    configure_cache()
+    configure_canonicalizer()
+    configure_scheduler()
+    configure_client()
+
+
+def record_latencies(benchmark, latencies, requests_per_round):
+    """요청별 지연 시간 분위수와 라운드 기준 처리량을 벤치마크 결과(extra_info)에 기록"""
+    if latencies:
+        ms = np.asarray(latencies) * 1000
+        benchmark.extra_info.update({
+            "requests": len(latencies),
+            "p50_ms": round(float(np.percentile(ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            "p99_ms": round(float(np.percentile(ms, 99)), 2),
+            "max_ms": round(float(ms.max()), 2),
+        })
+    stats = getattr(benchmark, "stats", None)
+    if stats is not None and stats.stats.mean:
+        benchmark.extra_info["throughput_rps"] = round(requests_per_round / stats.stats.mean, 1)
+
+
+@pytest.fixture
+def measure():
+    """measure(benchmark, call, jobs, workers): jobs를 workers개 스레드로 실행하는 라운드를 측정
+
+    요청별 지연 시간을 모아 p50/p95/p99와 처리량을 extra_info에 남기고 마지막
+    라운드의 결과 목록을 반환합니다.
+    """
+    def run(benchmark, call, jobs, workers, rounds=3):
+        latencies = []
+
+        def one(job):
+            started = time.perf_counter()
+            result = call(job)
+            latencies.append(time.perf_counter() - started)
+            return result
+
+        def batch():
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(one, jobs))
+
+        results = benchmark.pedantic(batch, rounds=rounds, iterations=1)
+        record_latencies(benchmark, latencies, len(jobs))
+        return results
+    return run
@@ -0,0 +1,195 @@
+"""fetcher별 처리량/지연 시간 벤치마크 (동시성 1, 8, 32)"""
+import asyncio
+import time
+
+import pytest
+
+from conftest import API_KEY, CLIENT_ID, CLIENT_SECRET, CUSTOMER_ID, SECRET_KEY, record_latencies
+from naver_api import get_blog_results, get_keyword_results, get_naver_trend_groups, search_naver_shopping
+from naver_async import AsyncNaverClient
+from naver_bulk import get_keyword_results_bulk
+from naver_canon import get_canonicalizer
+from naver_expand import KeywordExpander
+from naver_flight import session_scope
+from naver_opportunity import score_keywords
+from naver_price import PriceMonitor, PriceSnapshotStore
+from naver_rank import track_blog_ranks, track_ranks
+
+
+WORKERS = [1, 8, 32]
+REQUESTS_PER_ROUND = 64
+SEEDS = [f"노트북{i}" for i in range(50)]
+
+
+def _search_jobs():
+    return [(f"노트북{i % 16}", 1 + (i // 16) * 100) for i in range(REQUESTS_PER_ROUND)]
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_search_naver_shopping(benchmark, measure, workers):
+    results = measure(benchmark, lambda job: search_naver_shopping(job[0], CLIENT_ID, CLIENT_SECRET, 100, job[1]),
+                      _search_jobs(), workers)
+    assert all(error is None and len(result["items"]) == 100 for result, error in results)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_get_blog_results(benchmark, measure, workers):
+    results = measure(benchmark, lambda job: get_blog_results(CLIENT_ID, CLIENT_SECRET, job[0], 100, job[1]),
+                      _search_jobs(), workers)
+    assert all(error is None and len(df) == 100 for df, error in results)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_get_keyword_results(benchmark, measure, workers):
+    jobs = [",".join(SEEDS[i % 10 * 5:i % 10 * 5 + 5]) for i in range(REQUESTS_PER_ROUND)]
+    results = measure(benchmark, lambda hints: get_keyword_results(hints, API_KEY, SECRET_KEY, CUSTOMER_ID),
+                      jobs, workers)
+    assert all(error is None and not df.empty for df, error in results)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_get_naver_trend_groups(benchmark, measure, workers):
+    def call(i):
+        groups = [{"groupName": f"그룹{i}-{g}", "keywords": [f"키워드{i}-{g}"]} for g in range(5)]
+        return get_naver_trend_groups(CLIENT_ID, CLIENT_SECRET, "2023-01-01", "2023-12-31", "week",
+                                      groups, "", [], "")
+    results = measure(benchmark, call, list(range(REQUESTS_PER_ROUND)), workers)
+    assert all("error" not in result and len(result["results"]) == 5 for result in results)
+
+
+@pytest.mark.parametrize("workers", [1, 4, 8])
+def test_get_keyword_results_bulk(benchmark, workers):
+    df, errors = benchmark.pedantic(
+        lambda: get_keyword_results_bulk(SEEDS, API_KEY, SECRET_KEY, CUSTOMER_ID, max_workers=workers),
+        rounds=3, iterations=1)
+    record_latencies(benchmark, [], len(SEEDS) // 5)
+    assert not errors and df is not None and len(df) > len(SEEDS)
+
+
+@pytest.mark.parametrize("concurrency", WORKERS)
+def test_async_search_naver_shopping(benchmark, concurrency):
+    latencies = []
+
+    async def one(client, query, start):
+        started = time.perf_counter()
+        result = await client.search_naver_shopping(query, display=100, start=start)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    async def batch():
+        async with AsyncNaverClient(client_id=CLIENT_ID, client_secret=CLIENT_SECRET,
+                                    concurrency=concurrency) as client:
+            return await asyncio.gather(*(one(client, q, s) for q, s in _search_jobs()))
+
+    results = benchmark.pedantic(lambda: asyncio.run(batch()), rounds=3, iterations=1)
+    record_latencies(benchmark, latencies, REQUESTS_PER_ROUND)
+    assert all(error is None for _, error in results)
+
+
+@pytest.mark.parametrize("concurrency", [4, 16])
+def test_async_keyword_results_bulk(benchmark, concurrency):
+    async def batch():
+        async with AsyncNaverClient(api_key=API_KEY, secret_key=SECRET_KEY, customer_id=CUSTOMER_ID,
+                                    concurrency=concurrency) as client:
+            return await client.get_keyword_results_bulk(SEEDS)
+
+    df, errors = benchmark.pedantic(lambda: asyncio.run(batch()), rounds=3, iterations=1)
+    record_latencies(benchmark, [], len(SEEDS) // 5)
+    assert not errors and df is not None
+
+
+@pytest.mark.parametrize("concurrency", [8, 32])
+def test_track_ranks(benchmark, concurrency):
+    # 없는 상품ID: 대상마다 1~1000위 10페이지를 끝까지 조회
+    targets = [{"keyword": f"노트북{i}", "productId": "1", "mallName": None} for i in range(8)]
+    df = benchmark.pedantic(lambda: track_ranks(targets, CLIENT_ID, CLIENT_SECRET, concurrency=concurrency),
+                            rounds=3, iterations=1)
+    record_latencies(benchmark, [], len(targets) * 10)
+    assert df["rank"].isna().all() and df["error"].isna().all()
+
+
+@pytest.mark.parametrize("concurrency", [8, 32])
+def test_track_blog_ranks(benchmark, concurrency):
+    keywords = [f"아이스크림{i}" for i in range(8)]
+    df = benchmark.pedantic(
+        lambda: track_blog_ranks(keywords, ["blog.naver.com/nobody"], CLIENT_ID, CLIENT_SECRET,
+                                 concurrency=concurrency),
+        rounds=3, iterations=1)
+    record_latencies(benchmark, [], len(keywords) * 10)
+    assert df["blog.naver.com/nobody"].isna().all() and df["error"].isna().all()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_keyword_expander(benchmark, workers):
+    def run():
+        expander = KeywordExpander(SEEDS[:5], API_KEY, SECRET_KEY, CUSTOMER_ID, max_depth=2,
+                                   max_requests=20, max_workers=workers)
+        return expander.run()
+
+    df, errors = benchmark.pedantic(run, rounds=3, iterations=1)
+    record_latencies(benchmark, [], 20)
+    assert not errors and len(df) > 100
+
+
+@pytest.mark.parametrize("concurrency", [8, 32])
+def test_score_keywords(benchmark, concurrency):
+    seeds_df, _ = get_keyword_results_bulk(SEEDS[:10], API_KEY, SECRET_KEY, CUSTOMER_ID)
+    df, errors = benchmark.pedantic(
+        lambda: score_keywords(seeds_df, CLIENT_ID, CLIENT_SECRET, concurrency=concurrency),
+        rounds=3, iterations=1)
+    record_latencies(benchmark, [], len(df))
+    assert not errors and df["opportunity"].notna().all() and df["opportunity"].is_monotonic_decreasing
+
+
+@pytest.mark.parametrize("sessions", [8, 32])
+def test_coalesced_hot_keywords(benchmark, measure, mock_server, sessions):
+    # 여러 세션이 같은 인기 키워드 4개를 동시에 조회: 진행 중인 같은 요청은 한 번만 나감
+    jobs = [(f"s{i}", f"인기{i % 4}") for i in range(sessions * 4)]
+
+    def call(job):
+        with session_scope(job[0]):
+            return search_naver_shopping(job[1], CLIENT_ID, CLIENT_SECRET, 100)
+
+    results = measure(benchmark, call, jobs, sessions)
+    sent = sum(count for (endpoint, _), count in mock_server.stats.items() if endpoint == "shop")
+    benchmark.extra_info["upstream_requests"] = sent
+    assert all(error is None for _, error in results) and sent < len(jobs) * 3
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_canonical_fan_out(benchmark, mock_server, workers):
+    # 표기만 다른 변형 6개씩: 대표 검색어마다 요청 한 번, 응답은 변형마다 돌려줌
+    spellings = ["MacBook Pro{}", "macbook pro{}", "MACBOOKPRO{}", "ＭａｃＢｏｏｋ Ｐｒｏ{}", " MacBook  Pro{} ", "MacBook　Pro{}"]
+    keywords = [spelling.format(i) for i in range(8) for spelling in spellings]
+    canonicalizer = get_canonicalizer()
+    rounds = []
+
+    def run():
+        # --benchmark-disable면 한 번만 실행되므로 실제 실행 횟수로 요청 수를 확인
+        rounds.append(1)
+        return canonicalizer.fan_out(keywords, lambda q: search_naver_shopping(q, CLIENT_ID, CLIENT_SECRET, 100),
+                                     max_workers=workers)
+
+    results = benchmark.pedantic(run, rounds=3, iterations=1)
+    sent = sum(count for (endpoint, _), count in mock_server.stats.items() if endpoint == "shop")
+    benchmark.extra_info["upstream_requests"] = sent
+    record_latencies(benchmark, [], len(keywords))
+    assert len(results) == len(keywords) and all(error is None for _, error in results) and sent == 8 * len(rounds)
+
+
+@pytest.mark.parametrize("concurrency", [8, 32])
+def test_price_monitor_poll(benchmark, tmp_path, concurrency):
+    # 10개 키워드 x 200개 상품: 첫 조회로 기준값을 채운 뒤 값이 그대로인 재조회는 아무것도 쓰지 않음
+    store = PriceSnapshotStore(str(tmp_path / "prices.sqlite3"))
+    monitor = PriceMonitor(store, SEEDS[:10], CLIENT_ID, CLIENT_SECRET, pages=2, concurrency=concurrency)
+    monitor.run_once()
+    checked, changed = benchmark.pedantic(monitor.run_once, rounds=3, iterations=1)
+    record_latencies(benchmark, [], len(SEEDS[:10]) * 2)
+    assert checked == 2000 and changed == 0 and store.summary()["changes"] == 0
+
+    # 스냅샷 일부를 바꿔 두면 바뀐 상품만 잡힘
+    with store._db:
+        store._db.execute("UPDATE snapshot SET lprice = lprice + 100 WHERE product_id IN "
+                          "(SELECT product_id FROM snapshot LIMIT 5)")
+    assert monitor.run_once() == (2000, 5)
+    store.close()
@@ -0,0 +1,55 @@
+"""모의 서버 장애 주입: 서명 오류, 잘린 JSON, 페이지 한계, 429 재시도와 그때의 꼬리 지연"""
+import pytest
+
+from conftest import API_KEY, CLIENT_ID, CLIENT_SECRET, CUSTOMER_ID, SECRET_KEY
+from naver_api import get_blog_results, get_keyword_results, get_naver_trend_groups, search_naver_shopping
+from naver_ratelimit import get_scheduler
+
+
+def test_bad_signature_is_rejected(mock_server):
+    df, error = get_keyword_results("노트북", API_KEY, "wrong-secret", CUSTOMER_ID)
+    assert df is None and "401" in error
+    assert mock_server.stats[("keywordstool", 401)] == 1
+
+
+def test_bad_openapi_credentials_are_rejected():
+    result, error = search_naver_shopping("노트북", CLIENT_ID, "wrong-secret")
+    assert result is None and "401" in error
+
+
+def test_malformed_json_is_reported(mock_server):
+    mock_server.malformed_rate = 1.0
+    result, error = search_naver_shopping("노트북", CLIENT_ID, CLIENT_SECRET)
+    assert result is None and error.startswith("JSON 파싱 오류")
+    df, error = get_blog_results(CLIENT_ID, CLIENT_SECRET, "노트북")
+    assert df is None and error.startswith("JSON 파싱 오류")
+    trend = get_naver_trend_groups(CLIENT_ID, CLIENT_SECRET, "2024-01-01", "2024-01-31", "date",
+                                   [{"groupName": "a", "keywords": ["a"]}], "", [], "")
+    assert trend["error"].startswith("JSON 파싱 오류")
+
+
+def test_paging_limits():
+    result, error = search_naver_shopping("노트북", CLIENT_ID, CLIENT_SECRET, 100, 901)
+    assert error is None and len(result["items"]) == 100 and result["items"][-1]["title"].endswith("1000 &amp; 세트")
+    result, error = search_naver_shopping("노트북", CLIENT_ID, CLIENT_SECRET, 100, 1001)
+    assert result is None and "400" in error
+
+
+def test_429_is_retried(mock_server):
+    # 요청을 순서대로 보내므로 서버 난수 순서가 고정되어 결과가 결정적
+    mock_server.rate_429 = 0.3
+    for i in range(20):
+        result, error = search_naver_shopping(f"노트북{i}", CLIENT_ID, CLIENT_SECRET)
+        assert error is None
+    assert mock_server.stats[("shop", 429)] > 0
+    assert sum(row["retries"] for row in get_scheduler().snapshot()) == mock_server.stats[("shop", 429)]
+
+
+@pytest.mark.parametrize("rate_429", [0.05, 0.2])
+def test_shopping_tail_latency_under_throttling(benchmark, measure, mock_server, rate_429):
+    mock_server.rate_429 = rate_429
+    jobs = [(f"노트북{i % 16}", 1 + (i // 16) * 100) for i in range(64)]
+    results = measure(benchmark, lambda job: search_naver_shopping(job[0], CLIENT_ID, CLIENT_SECRET, 100, job[1]),
+                      jobs, 16)
+    benchmark.extra_info["throttled"] = mock_server.stats[("shop", 429)]
+    assert sum(error is None for _, error in results) >= len(jobs) - 2
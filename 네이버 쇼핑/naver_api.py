@@ -0,0 +1,333 @@
+import functools
+import inspect
+import json
+import time
+import hashlib
+import hmac
+import base64
+
+import pandas as pd
+import requests
+
+from naver_cache import cached
+from naver_canon import canonicalized
+from naver_flight import coalesced
+from naver_items import blog_json_frame
+from naver_http import get_client, OPENAPI_BASE_URL, SEARCHAD_BASE_URL
+from naver_metrics import get_metrics
+from naver_pool import get_pool, KIND_FIELDS
+from naver_ratelimit import get_scheduler, QuotaExceededError
+
+
+def _tuple_ok(result):
+    return result[1] is None
+
+
+def _trend_ok(result):
+    return "results" in result
+
+
+def _instrumented(endpoint):
+    """fetcher 전체 실행 시간을 total 단계로 기록 (캐시 적중은 제외)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_metrics().timer(endpoint, "total"):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _pooled(kind, endpoint, is_success, unavailable):
+    """자격증명 인자가 모두 비어 있으면 키 풀(naver_pool)에서 골라 호출
+
+    @cached 바깥에 두며, 풀 호출의 캐시 키는 개별 키 대신 풀 범위로 만듭니다.
+    풀이 없거나 자격증명이 하나라도 주어지면 그대로 호출합니다.
+    """
+    fields = KIND_FIELDS[kind]
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            options = {k: kwargs.pop(k) for k in ("use_cache", "cache_scope") if k in kwargs}
+            bound = signature.bind(*args, **kwargs)
+            pool = get_pool(kind)
+            if pool is None or any(bound.arguments.get(field) for field in fields):
+                return func(*args, **kwargs, **options)
+            options.setdefault("cache_scope", pool.scope)
+
+            def fetch(credentials):
+                return func(**dict(bound.arguments, **credentials), **options)
+            return pool.call(endpoint, fetch, is_success, unavailable)
+        return wrapper
+    return decorator
+
+
+def _tuple_unavailable(message):
+    return None, message
+
+
+def _trend_unavailable(message):
+    return {"error": message}
+
+
+def _send(endpoint, send):
+    """HTTP 왕복 시간, 상태 코드, 응답 크기를 기록하며 send() 실행"""
+    metrics = get_metrics()
+    try:
+        with metrics.timer(endpoint, "http"):
+            r = send()
+    except requests.exceptions.Timeout:
+        metrics.record_error(endpoint, "timeout")
+        raise
+    except requests.exceptions.RequestException:
+        metrics.record_error(endpoint, "network")
+        raise
+    metrics.record_response(endpoint, r.status_code, len(r.content))
+    return r
+
+
+def _decode(endpoint, r):
+    """JSON 파싱 시간 기록"""
+    metrics = get_metrics()
+    try:
+        with metrics.timer(endpoint, "decode"):
+            return r.json()
+    except json.JSONDecodeError:
+        metrics.record_error(endpoint, "json")
+        raise
+
+
+def _frame(endpoint, rows, build=pd.DataFrame):
+    """DataFrame 생성 시간 기록"""
+    with get_metrics().timer(endpoint, "frame"):
+        return build(rows)
+
+
+def _signed_header(method, uri, api_key, secret_key, customer_id):
+    with get_metrics().timer("keywordstool", "sign"):
+        return get_signer(api_key, secret_key, customer_id).headers(method, uri)
+
+
+def _openapi_headers(client_id, client_secret):
+    return {
+        "X-Naver-Client-Id": client_id,
+        "X-Naver-Client-Secret": client_secret,
+    }
+
+
+# 네이버 검색광고 API 서명 생성 클래스 (동일)
+class Signature:
+    @staticmethod
+    def generate(timestamp, method, uri, secret_key):
+        """네이버 검색광고 API 서명 생성"""
+        message = "{}.{}.{}".format(timestamp, method, uri)
+        hash_obj = hmac.new(bytes(secret_key, "utf-8"), bytes(message, "utf-8"), hashlib.sha256)
+        return base64.b64encode(hash_obj.digest())
+
+
+
+# API 요청 헤더 생성 함수 (동일)
+def get_header(method, uri, api_key, secret_key, customer_id):
+    timestamp = str(round(time.time() * 1000))
+    signature = Signature.generate(timestamp, method, uri, secret_key)
+    # signature는 bytes이므로 문자열로 변환
+    signature_str = signature.decode('utf-8') if isinstance(signature, bytes) else signature
+    return {
+        'Content-Type': 'application/json; charset=UTF-8',
+        'X-Timestamp': timestamp,
+        'X-API-KEY': api_key,
+        'X-Customer': str(customer_id),
+        'X-Signature': signature_str
+    }
+
+
+class SearchAdSigner:
+    """자격증명 하나에 묶인 검색광고 API 서명기 (스레드 안전)
+
+    비밀키로 초기화한 HMAC 상태와 고정 헤더를 한 번만 만들어 두고, 요청마다
+    HMAC 상태를 copy()해 타임스탬프와 메서드/URI만 이어 붙입니다. 기준 상태는
+    바꾸지 않으므로 여러 스레드가 잠금 없이 같은 서명기를 써도 됩니다.
+    get_header와 같은 헤더를 만듭니다.
+    """
+
+    def __init__(self, api_key, secret_key, customer_id):
+        self._hmac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        self._base_headers = {
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-API-KEY': api_key,
+            'X-Customer': str(customer_id),
+        }
+        # (method, uri) -> b".GET./keywordstool"
+        self._suffixes = {}
+
+    def sign(self, timestamp, method, uri):
+        """"{timestamp}.{method}.{uri}"의 HMAC-SHA256 서명 (base64 문자열)"""
+        suffix = self._suffixes.get((method, uri))
+        if suffix is None:
+            suffix = self._suffixes[(method, uri)] = f".{method}.{uri}".encode("utf-8")
+        h = self._hmac.copy()
+        h.update(timestamp.encode("ascii"))
+        h.update(suffix)
+        return base64.b64encode(h.digest()).decode("ascii")
+
+    def headers(self, method, uri, timestamp=None):
+        """요청 헤더 dict (timestamp를 생략하면 현재 시각, 밀리초)"""
+        if timestamp is None:
+            timestamp = str(time.time_ns() // 1000000)
+        headers = self._base_headers.copy()
+        headers['X-Timestamp'] = timestamp
+        headers['X-Signature'] = self.sign(timestamp, method, uri)
+        return headers
+
+
+@functools.lru_cache(maxsize=32)
+def get_signer(api_key, secret_key, customer_id):
+    """자격증명별 SearchAdSigner (프로세스 안에서 재사용)"""
+    return SearchAdSigner(api_key, secret_key, customer_id)
+
+
+
+# 연관검색어(키워드) 분석 함수 (최신 예제 적용)
+@canonicalized("keywordstool", "hint_keywords", hints=True)
+@coalesced("keywordstool", ("api_key", "secret_key", "customer_id"))
+@_pooled("searchad", "keywordstool", _tuple_ok, _tuple_unavailable)
+@cached("keywordstool", ("api_key", "secret_key", "customer_id"), _tuple_ok)
+@_instrumented("keywordstool")
+def get_keyword_results(hint_keywords, api_key, secret_key, customer_id):
+    uri = '/keywordstool'
+    method = 'GET'
+    params = {}
+    params['hintKeywords'] = hint_keywords
+    params['showDetail'] = '1'
+    try:
+        # 재시도 시 서명 타임스탬프가 새로 생성되도록 헤더도 send 안에서 만듦
+        r = get_scheduler().call(customer_id, "keywordstool", lambda: _send("keywordstool", lambda: get_client().get(
+            SEARCHAD_BASE_URL + uri, params=params,
+            headers=_signed_header(method, uri, api_key, secret_key, customer_id))))
+        if r.status_code == 200:
+            response_json = _decode("keywordstool", r)
+            if 'keywordList' in response_json:
+                return _frame("keywordstool", response_json['keywordList']), None
+            else:
+                return None, f"응답에 'keywordList' 키가 없습니다. 응답: {response_json}"
+        else:
+            return None, f"API 오류: {r.status_code} - {r.text}"
+    except QuotaExceededError as e:
+        return None, str(e)
+    except requests.exceptions.Timeout:
+        return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
+    except json.JSONDecodeError as e:
+        return None, f"JSON 파싱 오류: {str(e)}"
+    except requests.exceptions.RequestException as e:
+        return None, f"요청 실패: {str(e)}"
+    except Exception as e:
+        return None, f"예상치 못한 오류: {str(e)}"
+
+
+@canonicalized("shop", "query")
+@coalesced("shop", ("client_id", "client_secret"))
+@_pooled("openapi", "shop", _tuple_ok, _tuple_unavailable)
+@cached("shop", ("client_id", "client_secret"), _tuple_ok)
+@_instrumented("shop")
+def search_naver_shopping(query, client_id, client_secret, display=100, start=1, sort='sim'):
+    """네이버 쇼핑 검색 API 호출 (start: 1~1000)"""
+    try:
+        r = get_scheduler().call(client_id, "shop", lambda: _send("shop", lambda: get_client().get(
+            OPENAPI_BASE_URL + "/v1/search/shop.json",
+            params={"query": query, "display": display, "start": start, "sort": sort},
+            headers=_openapi_headers(client_id, client_secret))))
+        if r.status_code == 200:
+            return _decode("shop", r), None
+        else:
+            return None, f"HTTP 오류: {r.status_code} - {r.text}"
+    except QuotaExceededError as e:
+        return None, str(e)
+    except requests.exceptions.Timeout:
+        return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
+    except json.JSONDecodeError as e:
+        return None, f"JSON 파싱 오류: {str(e)}"
+    except requests.exceptions.RequestException as e:
+        return None, f"URL 오류: {str(e)}"
+    except Exception as e:
+        return None, f"검색 오류: {str(e)}"
+
+
+@canonicalized("blog", "query")
+@coalesced("blog", ("client_id", "client_secret"))
+@_pooled("openapi", "blog", _tuple_ok, _tuple_unavailable)
+@cached("blog", ("client_id", "client_secret"), _tuple_ok)
+@_instrumented("blog")
+def get_blog_results(client_id, client_secret, query, display=10, start=1, sort='sim'):
+    """네이버 블로그 검색 API 호출"""
+    try:
+        r = get_scheduler().call(client_id, "blog", lambda: _send("blog", lambda: get_client().get(
+            OPENAPI_BASE_URL + "/v1/search/blog",
+            params={"query": query, "display": display, "start": start, "sort": sort},
+            headers=_openapi_headers(client_id, client_secret))))
+        if r.status_code == 200:
+            response_json = _decode("blog", r)
+            if 'items' in response_json:
+                return _frame("blog", response_json['items'], blog_json_frame), None
+            else:
+                return None, "응답에 'items' 키가 없습니다."
+        else:
+            return None, f"HTTP 오류: {r.status_code} - {r.reason}"
+    except QuotaExceededError as e:
+        return None, str(e)
+    except requests.exceptions.Timeout:
+        return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
+    except json.JSONDecodeError as e:
+        return None, f"JSON 파싱 오류: {str(e)}"
+    except requests.exceptions.RequestException as e:
+        return None, f"URL 오류: {str(e)}"
+    except Exception as e:
+        return None, f"예상치 못한 오류: {str(e)}"
+
+
+def get_naver_trend(client_id, client_secret, start_date, end_date, time_unit, group1, keywords1, group2, keywords2, device, ages, gender):
+    """네이버 DataLab 검색 트렌드 API 호출 (그룹 2개)"""
+    keyword_groups = [
+        {"groupName": group1, "keywords": [k.strip() for k in keywords1.split(",") if k.strip()]},
+        {"groupName": group2, "keywords": [k.strip() for k in keywords2.split(",") if k.strip()]}
+    ]
+    return get_naver_trend_groups(client_id, client_secret, start_date, end_date, time_unit,
+                                  keyword_groups, device, ages, gender)
+
+
+@coalesced("datalab", ("client_id", "client_secret"))
+@_pooled("openapi", "datalab", _trend_ok, _trend_unavailable)
+@cached("datalab", ("client_id", "client_secret"), _trend_ok)
+@_instrumented("datalab")
+def get_naver_trend_groups(client_id, client_secret, start_date, end_date, time_unit, keyword_groups, device, ages, gender):
+    """네이버 DataLab 검색 트렌드 API 호출 (keyword_groups: [{"groupName", "keywords"}], 최대 5개)"""
+    body = {
+        "startDate": str(start_date),
+        "endDate": str(end_date),
+        "timeUnit": time_unit,
+        "keywordGroups": keyword_groups,
+        "device": device,
+        "ages": ages,
+        "gender": gender
+    }
+    try:
+        r = get_scheduler().call(client_id, "datalab", lambda: _send("datalab", lambda: get_client().post(
+            OPENAPI_BASE_URL + "/v1/datalab/search",
+            data=json.dumps(body).encode("utf-8"),
+            headers={**_openapi_headers(client_id, client_secret), "Content-Type": "application/json"})))
+        if r.status_code == 200:
+            return _decode("datalab", r)
+        else:
+            return {"error": f"HTTP 오류: {r.status_code}", "details": r.text}
+    except QuotaExceededError as e:
+        return {"error": str(e)}
+    except requests.exceptions.Timeout:
+        return {"error": "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."}
+    except json.JSONDecodeError as e:
+        return {"error": f"JSON 파싱 오류: {str(e)}"}
+    except requests.exceptions.RequestException as e:
+        return {"error": f"URL 오류: {str(e)}"}
+    except Exception as e:
+        return {"error": f"예상치 못한 오류: {str(e)}"}
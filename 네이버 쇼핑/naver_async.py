@@ -0,0 +1,340 @@
+import asyncio
+import json
+
+import aiohttp
+import pandas as pd
+
+from naver_api import (get_signer, get_keyword_results, search_naver_shopping, get_blog_results,
+                       get_naver_trend, get_naver_trend_groups, _tuple_ok, _trend_ok,
+                       _tuple_unavailable, _trend_unavailable)
+from naver_bulk import split_hint_keywords, chunk_keywords, get_keyword_results_bulk
+from naver_cache import get_cache, make_cache_key
+from naver_canon import fold_query
+from naver_items import blog_json_frame
+from naver_http import OPENAPI_BASE_URL, SEARCHAD_BASE_URL, DEFAULT_POOL_SIZE
+from naver_metrics import get_metrics
+from naver_pool import get_pool, KIND_FIELDS
+from naver_ratelimit import get_scheduler, QuotaExceededError
+
+
+DEFAULT_CONCURRENCY = 20
+DEFAULT_TIMEOUT = 30
+
+
+class AsyncNaverClient:
+    """Streamlit 없이 쓸 수 있는 asyncio 기반 네이버 API 클라이언트
+
+    naver_api의 네 fetcher와 같은 이름/반환 형식의 코루틴을 제공합니다.
+    하나의 이벤트 루프에서 수천 건의 요청을 concurrency 한도 안에서
+    동시에 처리하며, 응답 캐시, 속도 제한/429 재시도 스케줄러, 키 풀은 동기
+    fetcher와 공유합니다 (자격증명을 비워 두면 naver_pool 키 풀에서 골라 씀).
+
+        async with AsyncNaverClient(client_id=..., client_secret=...) as client:
+            result, error = await client.search_naver_shopping("맥북")
+    """
+
+    def __init__(self, client_id="", client_secret="", api_key="", secret_key="", customer_id="",
+                 concurrency=DEFAULT_CONCURRENCY, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.customer_id = customer_id
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=max(self.pool_size, self.concurrency))
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _openapi_headers(creds):
+        return {
+            "X-Naver-Client-Id": creds["client_id"],
+            "X-Naver-Client-Secret": creds["client_secret"],
+        }
+
+    async def _request(self, credential, endpoint, method, url, make_headers, **kwargs):
+        """(상태 코드, 사유, 본문 문자열) 반환. 네트워크 예외는 호출자가 처리"""
+        await self.open()
+
+        metrics = get_metrics()
+
+        async def send():
+            async with self._semaphore:
+                try:
+                    with metrics.timer(endpoint, "http"):
+                        async with self._session.request(method, url, headers=make_headers(), **kwargs) as response:
+                            result = response.status, response.reason, await response.text(), response.headers
+                except asyncio.TimeoutError:
+                    metrics.record_error(endpoint, "timeout")
+                    raise
+                except aiohttp.ClientError:
+                    metrics.record_error(endpoint, "network")
+                    raise
+                metrics.record_response(endpoint, result[0], len(result[2].encode("utf-8")))
+                return result
+
+        status, reason, text, _ = await get_scheduler().call_async(credential, endpoint, send)
+        return status, reason, text
+
+    @staticmethod
+    def _decode(endpoint, text):
+        metrics = get_metrics()
+        try:
+            with metrics.timer(endpoint, "decode"):
+                return json.loads(text)
+        except json.JSONDecodeError:
+            metrics.record_error(endpoint, "json")
+            raise
+
+    @staticmethod
+    def _frame(endpoint, rows, build=pd.DataFrame):
+        with get_metrics().timer(endpoint, "frame"):
+            return build(rows)
+
+    @staticmethod
+    def _signed_header(creds, uri):
+        with get_metrics().timer("keywordstool", "sign"):
+            return get_signer(creds["api_key"], creds["secret_key"], creds["customer_id"]).headers('GET', uri)
+
+    async def _call(self, kind, endpoint, params, is_success, unavailable, fetch):
+        """fetch(자격증명 dict)를 캐시를 거쳐 실행
+
+        동기 fetcher의 @_pooled와 같은 규칙으로, 이 클라이언트의 자격증명이 모두
+        비어 있고 키 풀이 있으면 풀에서 키를 골라 쓰고 (인증 오류/한도 초과 시 다른
+        키로 재시도) 캐시 키는 개별 키 대신 풀 범위로 만듭니다.
+        """
+        own = {field: getattr(self, field) for field in KIND_FIELDS[kind]}
+        pool = get_pool(kind)
+        if pool is None or any(own.values()):
+            return await self._cached(endpoint, params, list(own.values()), is_success, lambda: fetch(own))
+
+        async def pooled(creds):
+            return await self._cached(endpoint, params, [pool.scope], is_success, lambda: fetch(creds))
+        return await pool.call_async(endpoint, pooled, is_success, unavailable)
+
+    async def _cached(self, endpoint, params, credentials, is_success, fetch):
+        # 동기 fetcher의 @cached와 같은 키를 써서 캐시를 공유.
+        # SQLite 읽기/쓰기가 이벤트 루프를 막지 않도록 스레드에서 실행
+        cache = get_cache()
+        if cache is None:
+            with get_metrics().timer(endpoint, "total"):
+                return await fetch()
+        key = make_cache_key(endpoint, params, credentials)
+        hit, value = await asyncio.to_thread(cache.get, key)
+        if hit:
+            return value
+        with get_metrics().timer(endpoint, "total"):
+            value = await fetch()
+        if is_success(value):
+            await asyncio.to_thread(cache.set, key, endpoint, value)
+        return value
+
+    async def get_keyword_results(self, hint_keywords):
+        """검색광고 키워드도구 조회 (DataFrame, 오류)"""
+        hint_keywords = fold_query("keywordstool", hint_keywords, hints=True)
+
+        async def fetch(creds):
+            uri = '/keywordstool'
+            try:
+                status, _, text = await self._request(
+                    creds["customer_id"], "keywordstool", "GET", SEARCHAD_BASE_URL + uri,
+                    lambda: self._signed_header(creds, uri),
+                    params={'hintKeywords': hint_keywords, 'showDetail': '1'})
+                if status == 200:
+                    response_json = self._decode("keywordstool", text)
+                    if 'keywordList' in response_json:
+                        return self._frame("keywordstool", response_json['keywordList']), None
+                    return None, f"응답에 'keywordList' 키가 없습니다. 응답: {response_json}"
+                return None, f"API 오류: {status} - {text}"
+            except QuotaExceededError as e:
+                return None, str(e)
+            except asyncio.TimeoutError:
+                return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
+            except json.JSONDecodeError as e:
+                return None, f"JSON 파싱 오류: {str(e)}"
+            except aiohttp.ClientError as e:
+                return None, f"요청 실패: {str(e)}"
+
+        return await self._call("searchad", "keywordstool", {"hint_keywords": hint_keywords},
+                                _tuple_ok, _tuple_unavailable, fetch)
+
+    async def search_naver_shopping(self, query, display=100, start=1, sort='sim'):
+        """쇼핑 검색 (응답 JSON, 오류)"""
+        query = fold_query("shop", query)
+
+        async def fetch(creds):
+            try:
+                status, _, text = await self._request(
+                    creds["client_id"], "shop", "GET", OPENAPI_BASE_URL + "/v1/search/shop.json",
+                    lambda: self._openapi_headers(creds),
+                    params={"query": query, "display": display, "start": start, "sort": sort})
+                if status == 200:
+                    return self._decode("shop", text), None
+                return None, f"HTTP 오류: {status} - {text}"
+            except QuotaExceededError as e:
+                return None, str(e)
+            except asyncio.TimeoutError:
+                return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
+            except json.JSONDecodeError as e:
+                return None, f"JSON 파싱 오류: {str(e)}"
+            except aiohttp.ClientError as e:
+                return None, f"URL 오류: {str(e)}"
+
+        params = {"query": query, "display": display, "start": start, "sort": sort}
+        return await self._call("openapi", "shop", params, _tuple_ok, _tuple_unavailable, fetch)
+
+    async def get_blog_results(self, query, display=10, start=1, sort='sim'):
+        """블로그 검색 (DataFrame, 오류)"""
+        query = fold_query("blog", query)
+
+        async def fetch(creds):
+            try:
+                status, reason, text = await self._request(
+                    creds["client_id"], "blog", "GET", OPENAPI_BASE_URL + "/v1/search/blog",
+                    lambda: self._openapi_headers(creds),
+                    params={"query": query, "display": display, "start": start, "sort": sort})
+                if status == 200:
+                    response_json = self._decode("blog", text)
+                    if 'items' in response_json:
+                        return self._frame("blog", response_json['items'], blog_json_frame), None
+                    return None, "응답에 'items' 키가 없습니다."
+                return None, f"HTTP 오류: {status} - {reason}"
+            except QuotaExceededError as e:
+                return None, str(e)
+            except asyncio.TimeoutError:
+                return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
+            except json.JSONDecodeError as e:
+                return None, f"JSON 파싱 오류: {str(e)}"
+            except aiohttp.ClientError as e:
+                return None, f"URL 오류: {str(e)}"
+
+        params = {"query": query, "display": display, "start": start, "sort": sort}
+        return await self._call("openapi", "blog", params, _tuple_ok, _tuple_unavailable, fetch)
+
+    async def get_naver_trend(self, start_date, end_date, time_unit, group1, keywords1, group2, keywords2,
+                              device, ages, gender):
+        """DataLab 검색 트렌드, 그룹 2개 (응답 JSON 또는 {"error": ...})"""
+        keyword_groups = [
+            {"groupName": group1, "keywords": [k.strip() for k in keywords1.split(",") if k.strip()]},
+            {"groupName": group2, "keywords": [k.strip() for k in keywords2.split(",") if k.strip()]}
+        ]
+        return await self.get_naver_trend_groups(start_date, end_date, time_unit, keyword_groups,
+                                                 device, ages, gender)
+
+    async def get_naver_trend_groups(self, start_date, end_date, time_unit, keyword_groups, device, ages, gender):
+        """DataLab 검색 트렌드, 그룹 최대 5개 (응답 JSON 또는 {"error": ...})"""
+        body = {
+            "startDate": str(start_date),
+            "endDate": str(end_date),
+            "timeUnit": time_unit,
+            "keywordGroups": keyword_groups,
+            "device": device,
+            "ages": ages,
+            "gender": gender
+        }
+
+        async def fetch(creds):
+            try:
+                status, _, text = await self._request(
+                    creds["client_id"], "datalab", "POST", OPENAPI_BASE_URL + "/v1/datalab/search",
+                    lambda: {**self._openapi_headers(creds), "Content-Type": "application/json"},
+                    data=json.dumps(body).encode("utf-8"))
+                if status == 200:
+                    return self._decode("datalab", text)
+                return {"error": f"HTTP 오류: {status}", "details": text}
+            except QuotaExceededError as e:
+                return {"error": str(e)}
+            except asyncio.TimeoutError:
+                return {"error": "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."}
+            except json.JSONDecodeError as e:
+                return {"error": f"JSON 파싱 오류: {str(e)}"}
+            except aiohttp.ClientError as e:
+                return {"error": f"URL 오류: {str(e)}"}
+
+        params = {"start_date": start_date, "end_date": end_date, "time_unit": time_unit,
+                  "keyword_groups": keyword_groups, "device": device, "ages": ages, "gender": gender}
+        return await self._call("openapi", "datalab", params, _trend_ok, _trend_unavailable, fetch)
+
+    async def get_keyword_results_bulk(self, keyword_input, on_batch=None):
+        """naver_bulk.get_keyword_results_bulk의 async 버전 (DataFrame, 오류 목록)"""
+        chunks = chunk_keywords(split_hint_keywords(keyword_input))
+        if not chunks:
+            return None, ["분석할 키워드가 없습니다."]
+        # 모두 동시에 시작하되 시드 순서대로 받아서 on_batch에 넘김
+        tasks = [asyncio.ensure_future(self.get_keyword_results(",".join(c))) for c in chunks]
+        frames = []
+        errors = []
+        for chunk, task in zip(chunks, tasks):
+            df, error = await task
+            if error:
+                errors.append(f"[{', '.join(chunk)}] {error}")
+            elif df is not None and not df.empty:
+                frames.append(df)
+                if on_batch is not None:
+                    on_batch(df)
+        if not frames:
+            return None, errors
+        merged = pd.concat(frames, ignore_index=True)
+        if 'relKeyword' in merged.columns:
+            merged = merged.drop_duplicates(subset='relKeyword', keep='first').reset_index(drop=True)
+        return merged, errors
+
+
+class NaverClient:
+    """AsyncNaverClient와 같은 메서드를 가진 동기 래퍼
+
+    자격증명을 한 번만 넘기고 naver_api의 동기 fetcher(공유 연결 풀 사용)를
+    호출합니다. 이벤트 루프가 없는 스크립트/크론 작업용입니다.
+    """
+
+    def __init__(self, client_id="", client_secret="", api_key="", secret_key="", customer_id=""):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.customer_id = customer_id
+
+    def get_keyword_results(self, hint_keywords):
+        return get_keyword_results(hint_keywords, self.api_key, self.secret_key, self.customer_id)
+
+    def search_naver_shopping(self, query, display=100, start=1, sort='sim'):
+        return search_naver_shopping(query, self.client_id, self.client_secret, display, start, sort)
+
+    def get_blog_results(self, query, display=10, start=1, sort='sim'):
+        return get_blog_results(self.client_id, self.client_secret, query, display, start, sort)
+
+    def get_naver_trend(self, start_date, end_date, time_unit, group1, keywords1, group2, keywords2,
+                        device, ages, gender):
+        return get_naver_trend(self.client_id, self.client_secret, start_date, end_date, time_unit,
+                               group1, keywords1, group2, keywords2, device, ages, gender)
+
+    def get_naver_trend_groups(self, start_date, end_date, time_unit, keyword_groups, device, ages, gender):
+        return get_naver_trend_groups(self.client_id, self.client_secret, start_date, end_date, time_unit,
+                                      keyword_groups, device, ages, gender)
+
+    def get_keyword_results_bulk(self, keyword_input, on_batch=None):
+        return get_keyword_results_bulk(keyword_input, self.api_key, self.secret_key, self.customer_id,
+                                        on_batch=on_batch)
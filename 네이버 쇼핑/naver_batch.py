@@ -0,0 +1,142 @@
+"""네이버 API 헤드리스 배치 실행기 (Streamlit 불필요)
+
+사용 예:
+    python naver_batch.py keywords seeds.txt -o keywords.csv
+    python naver_batch.py shop queries.txt -o shop.jsonl --display 100
+    python naver_batch.py blog queries.txt -o blog.parquet --concurrency 50
+    python naver_batch.py opportunity seeds.txt -o opportunity.csv --min-volume 100
+
+입력 파일은 한 줄에 키워드 하나입니다 (빈 줄과 '#'으로 시작하는 줄은 무시).
+결과는 도착하는 대로 출력 파일에 이어 씁니다 (.csv, .jsonl, .parquet).
+API 키는 환경 변수에서 읽습니다:
+    NAVER_CLIENT_ID, NAVER_CLIENT_SECRET            (shop, blog)
+    NAVER_API_KEY, NAVER_SECRET_KEY, NAVER_CUSTOMER_ID  (keywords)
+환경 변수를 비워 두면 naver_pool 키 풀(.naver_data/credentials.json 또는
+NAVER_CREDENTIALS)의 키를 나눠 씁니다.
+opportunity는 시드의 연관 키워드마다 쇼핑 상품 수를 조회해 기회 점수 순위표를
+만들므로 두 API 키가 모두 필요하고, 결과는 점수 계산 후 한 번에 씁니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from naver_async import AsyncNaverClient, DEFAULT_CONCURRENCY
+from naver_canon import group_queries
+from naver_export import ResultWriter
+from naver_items import shop_json_frame
+from naver_opportunity import fetch_shopping_totals_async, opportunity_scores, select_candidates
+from naver_pool import get_pool
+
+
+def read_keyword_file(path):
+    """한 줄에 하나씩 적힌 키워드 파일 읽기 (중복 제거, 순서 유지)"""
+    with open(path, encoding="utf-8-sig") as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+
+async def run_keywords(client, keywords, writer):
+    """키워드도구 묶음 결과를 시드 순서대로 writer에 기록하고 오류 목록 반환"""
+    _, errors = await client.get_keyword_results_bulk(keywords, on_batch=writer.write)
+    return errors
+
+
+async def run_search(client, queries, mode, display, writer):
+    """쇼핑/블로그 검색을 한 이벤트 루프에서 동시에 실행하고 query 컬럼을 붙여 기록
+
+    표기만 다른 검색어(naver_canon)는 한 번만 조회하고 같은 결과를 변형마다
+    각자의 query 값으로 기록합니다. 결과는 대표 검색어가 처음 나온 순서대로
+    writer에 바로 넘기고 메모리에 모아 두지 않습니다.
+    """
+    async def one(request):
+        if mode == "shop":
+            result, error = await client.search_naver_shopping(request, display=display)
+            df = shop_json_frame(result["items"]) if result and "items" in result else None
+        else:
+            df, error = await client.get_blog_results(request, display=display)
+        if df is not None:
+            # 쿼리 안에서의 노출 순위
+            df.insert(0, "rank", range(1, len(df) + 1))
+        return df, error
+
+    errors = []
+    groups = group_queries(queries)
+    tasks = [(variants, asyncio.ensure_future(one(request))) for request, variants in groups.items()]
+    for variants, task in tasks:
+        df, error = await task
+        for query in variants:
+            if error:
+                errors.append(f"[{query}] {error}")
+            else:
+                out = df.copy(deep=False)
+                out.insert(0, "query", query)
+                writer.write(out)
+    return errors
+
+
+async def run_opportunity(client, seeds, writer, min_volume=0, max_keywords=None):
+    """연관 키워드 조회 → 쇼핑 상품 수 동시 조회 → 기회 점수 순위표 기록"""
+    df, errors = await client.get_keyword_results_bulk(seeds)
+    candidates = select_candidates(df, min_volume, max_keywords)
+    if candidates.empty:
+        return errors
+    totals, shop_errors = await fetch_shopping_totals_async(client, candidates['relKeyword'].tolist())
+    writer.write(opportunity_scores(candidates, totals))
+    return errors + shop_errors
+
+
+async def main_async(args, writer):
+    queries = read_keyword_file(args.input)
+    client = AsyncNaverClient(
+        client_id=os.getenv("NAVER_CLIENT_ID", ""),
+        client_secret=os.getenv("NAVER_CLIENT_SECRET", ""),
+        api_key=os.getenv("NAVER_API_KEY", ""),
+        secret_key=os.getenv("NAVER_SECRET_KEY", ""),
+        customer_id=os.getenv("NAVER_CUSTOMER_ID", ""),
+        concurrency=args.concurrency,
+    )
+    async with client:
+        if args.mode == "keywords":
+            return await run_keywords(client, queries, writer)
+        if args.mode == "opportunity":
+            return await run_opportunity(client, queries, writer, args.min_volume, args.max_keywords)
+        return await run_search(client, queries, args.mode, args.display, writer)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 API 배치 조회")
+    parser.add_argument("mode", choices=["keywords", "shop", "blog", "opportunity"], help="조회 종류")
+    parser.add_argument("input", help="키워드 파일 (한 줄에 하나)")
+    parser.add_argument("-o", "--output", required=True, help="결과 파일 (.csv, .jsonl, .parquet)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--display", type=int, default=100, help="쇼핑/블로그 검색 결과 수 (최대 100)")
+    parser.add_argument("--min-volume", type=int, default=0, help="opportunity: 점수를 낼 최소 총 검색수")
+    parser.add_argument("--max-keywords", type=int, help="opportunity: 총 검색수 상위 몇 개까지 점수를 낼지")
+    args = parser.parse_args(argv)
+
+    # 키 풀(credentials.json, NAVER_CREDENTIALS)이 있는 종류는 환경 변수가 없어도 됨
+    required = []
+    if args.mode in ("keywords", "opportunity") and get_pool("searchad") is None:
+        required += ["NAVER_API_KEY", "NAVER_SECRET_KEY", "NAVER_CUSTOMER_ID"]
+    if args.mode != "keywords" and get_pool("openapi") is None:
+        required += ["NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET"]
+    missing = [name for name in required if not os.getenv(name)]
+    if missing:
+        print(f"⚠️  환경 변수가 설정되지 않았습니다: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    dedupe_on = "relKeyword" if args.mode == "keywords" else None
+    with ResultWriter(args.output, dedupe_on=dedupe_on) as writer:
+        errors = asyncio.run(main_async(args, writer))
+    for error in errors:
+        print(f"[ERROR] {error}", file=sys.stderr)
+    if writer.rows == 0:
+        print("결과가 없습니다.", file=sys.stderr)
+        return 1
+    print(f"✅ {writer.rows}행 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from naver_api import get_keyword_results
+from naver_canon import canonical_query
+from naver_flight import ContextThreadPoolExecutor
+
+
+# 검색광고 키워드도구는 hintKeywords를 최대 5개까지만 허용
+MAX_HINT_KEYWORDS = 5
+DEFAULT_MAX_WORKERS = 4
+
+
+def split_hint_keywords(keyword_input):
+    """쉼표/줄바꿈으로 구분된 입력을 중복 없는 키워드 목록으로 변환
+
+    표기만 다른 키워드("맥북 프로", "ＭａｃＢｏｏｋ")는 naver_canon의 대표 표기로 합칩니다.
+    """
+    if isinstance(keyword_input, str):
+        raw = keyword_input.replace("\n", ",").split(",")
+    else:
+        raw = keyword_input
+    keywords = []
+    seen = set()
+    for k in raw:
+        # 키워드도구는 공백이 포함된 힌트 키워드를 거부하므로 공백 제거
+        k = "".join(canonical_query(str(k)).split())
+        if k and k not in seen:
+            seen.add(k)
+            keywords.append(k)
+    return keywords
+
+
+def chunk_keywords(keywords, size=MAX_HINT_KEYWORDS):
+    """키워드 목록을 API 허용 크기의 묶음으로 분할"""
+    return [keywords[i:i + size] for i in range(0, len(keywords), size)]
+
+
+def get_keyword_results_bulk(keyword_input, api_key, secret_key, customer_id,
+                             max_workers=DEFAULT_MAX_WORKERS, on_batch=None):
+    """여러 시드 키워드를 5개씩 나누어 병렬 조회 후 relKeyword 기준으로 병합
+
+    (DataFrame, 오류 메시지 목록)을 반환합니다. 일부 묶음만 실패한 경우에도
+    성공한 묶음의 결과는 DataFrame에 포함됩니다. 계정별 속도 제한과 429 재시도는
+    get_keyword_results 내부의 공용 스케줄러(naver_ratelimit)가 처리합니다.
+    on_batch를 주면 묶음 결과가 도착하는 대로 (시드 순서대로) 호출합니다
+    (예: naver_export.ResultWriter.write).
+    """
+    keywords = split_hint_keywords(keyword_input)
+    chunks = chunk_keywords(keywords)
+    if not chunks:
+        return None, ["분석할 키워드가 없습니다."]
+
+    def fetch(chunk):
+        return get_keyword_results(",".join(chunk), api_key, secret_key, customer_id)
+
+    frames = []
+    errors = []
+    workers = max(1, min(max_workers, len(chunks)))
+    with ContextThreadPoolExecutor(max_workers=workers) as executor:
+        # map은 입력 순서를 유지하므로 병합 결과도 시드 순서를 따름
+        for chunk, (df, error) in zip(chunks, executor.map(fetch, chunks)):
+            if error:
+                errors.append(f"[{', '.join(chunk)}] {error}")
+            elif df is not None and not df.empty:
+                frames.append(df)
+                if on_batch is not None:
+                    on_batch(df)
+
+    if not frames:
+        return None, errors
+    merged = pd.concat(frames, ignore_index=True)
+    if 'relKeyword' in merged.columns:
+        merged = merged.drop_duplicates(subset='relKeyword', keep='first').reset_index(drop=True)
+    return merged, errors
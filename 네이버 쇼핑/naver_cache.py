@@ -0,0 +1,201 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+DATA_DIR = os.environ.get(
+    "NAVER_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".naver_data")
+)
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, "cache.sqlite3")
+
+# 엔드포인트별 TTL (초): 키워드도구 검색량은 월 단위, 쇼핑/블로그 순위는 시간 단위로 변함
+DEFAULT_TTLS = {
+    "keywordstool": 24 * 3600,
+    "shop": 3600,
+    "blog": 3600,
+    "datalab": 12 * 3600,
+}
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def make_cache_key(endpoint, params, credentials):
+    """(엔드포인트, 정규화된 파라미터, 자격증명 식별자)로 캐시 키 생성
+
+    자격증명은 원문 대신 해시만 키에 들어갑니다.
+    """
+    identity = hashlib.sha256("\0".join(str(c) for c in credentials).encode("utf-8")).hexdigest()[:16]
+    normalized = {k: (v.strip() if isinstance(v, str) else v) for k, v in params.items()}
+    raw = json.dumps([endpoint, normalized, identity], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """메모리 LRU + SQLite 2단 TTL 캐시
+
+    값은 pickle 바이트로 저장하므로 호출자가 결과를 수정해도 캐시는 변하지
+    않습니다. 메모리 계층은 항목 수와 바이트 합계로 제한되며, 디스크 계층은
+    프로세스를 재시작해도 유지됩니다 (db_path=None이면 메모리만 사용).
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, ttls=None, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()  # key -> (expires_at, blob)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, endpoint TEXT, expires_at REAL, value BLOB)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at)")
+            self._db.commit()
+
+    def _remember(self, key, expires_at, blob):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old[1])
+        self._memory[key] = (expires_at, blob)
+        self._memory_bytes += len(blob)
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def get(self, key):
+        """캐시 조회. 없거나 만료되었으면 (False, None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return True, pickle.loads(entry[1])
+                self._memory_bytes -= len(entry[1])
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, value FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                    return True, pickle.loads(row[1])
+            self.stats["misses"] += 1
+            return False, None
+
+    def set(self, key, endpoint, value):
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, blob)
+            self.stats["stores"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, endpoint, expires_at, value) VALUES (?, ?, ?, ?)",
+                    (key, endpoint, expires_at, blob)
+                )
+                self._db.commit()
+
+    def purge_expired(self):
+        """만료된 디스크 항목 삭제"""
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def summary(self):
+        """히트/미스 카운터와 현재 메모리 사용량"""
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            total = hits + self.stats["misses"]
+            return dict(self.stats, entries=len(self._memory), memory_bytes=self._memory_bytes,
+                        hit_rate=(hits / total if total else 0.0))
+
+
+_cache = None
+_cache_enabled = True
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전역 캐시 (비활성화 시 None)"""
+    global _cache
+    with _cache_lock:
+        if not _cache_enabled:
+            return None
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def configure_cache(enabled=True, **kwargs):
+    """전역 캐시 설정 교체 (kwargs는 ResponseCache 인자)"""
+    global _cache, _cache_enabled
+    with _cache_lock:
+        _cache_enabled = enabled
+        _cache = ResponseCache(**kwargs) if enabled else None
+        return _cache
+
+
+def cached(endpoint, credential_args, is_success):
+    """fetcher 결과를 캐시하는 데코레이터
+
+    credential_args에 해당하는 인자는 해시된 식별자로만 키에 반영되고,
+    is_success(결과)가 참인 경우에만 저장합니다. 호출 시 use_cache=False로
+    캐시를 건너뛸 수 있고, cache_scope를 주면 자격증명 대신 그 값으로 키를
+    만듭니다 (키 풀처럼 여러 자격증명이 결과를 공유하는 경우).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, use_cache=True, cache_scope=None, **kwargs):
+            cache = get_cache() if use_cache else None
+            if cache is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            credentials = [params.pop(name) for name in credential_args]
+            if cache_scope is not None:
+                credentials = [cache_scope]
+            key = make_cache_key(endpoint, params, credentials)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            if is_success(value):
+                cache.set(key, endpoint, value)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
@@ -0,0 +1,215 @@
+"""검색어 정규화 색인: 같은 검색어의 변형을 요청 하나로 합침
+
+"맥북 프로", "맥북프로", "ＭａｃＢｏｏｋ Ｐｒｏ", "macbook pro " 처럼 표기만 다른
+검색어는 유니코드 NFKC(전각 → 반각, 한글 자모 조합 포함), 대소문자 무시,
+공백 제거로 같은 키가 되고, 동의어 파일로 "MacBook Pro"와 "맥북프로"처럼 다른
+말도 한 키로 묶을 수 있습니다. 키마다 처음 본 표기(동의어가 있으면 대표어)를
+실제 요청 문자열로 기억해 두므로 변형들은 모두 같은 요청, 같은 캐시 항목을
+씁니다.
+
+동의어 파일(.naver_data/synonyms.txt 또는 NAVER_SYNONYMS)은 한 줄에
+'대표어: 변형1, 변형2' 형식입니다.
+    맥북프로: MacBook Pro, 맥북 pro
+"""
+import functools
+import inspect
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from naver_cache import DATA_DIR
+from naver_metrics import get_metrics
+
+
+DEFAULT_SYNONYMS_PATH = os.environ.get("NAVER_SYNONYMS", os.path.join(DATA_DIR, "synonyms.txt"))
+DEFAULT_MAX_ENTRIES = 100000
+
+
+def canonical_key(keyword):
+    """비교용 키 (NFKC, 대소문자 무시, 모든 공백 제거)"""
+    return "".join(unicodedata.normalize("NFKC", str(keyword)).casefold().split())
+
+
+def display_form(keyword):
+    """요청용 표기 (NFKC, 앞뒤 공백 제거, 연속 공백은 하나로)"""
+    return " ".join(unicodedata.normalize("NFKC", str(keyword)).split())
+
+
+def parse_synonyms(text):
+    """'대표어: 변형1, 변형2' 줄 목록을 {변형 키: 대표어 표기}로 변환"""
+    synonyms = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or ":" not in line:
+            continue
+        head, variants = line.split(":", 1)
+        head = display_form(head)
+        if not head:
+            continue
+        for variant in [head] + variants.split(","):
+            key = canonical_key(variant)
+            if key:
+                synonyms.setdefault(key, head)
+    return synonyms
+
+
+class KeywordCanonicalizer:
+    """변형 → 대표 요청 문자열 색인 (스레드 안전, LRU로 max_entries개까지)"""
+
+    def __init__(self, synonyms=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.synonyms = dict(synonyms or {})
+        self.max_entries = max_entries
+        self._requests = OrderedDict()  # 키 -> 요청 문자열
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "folded": 0}
+
+    def key(self, keyword):
+        """동의어까지 접은 비교용 키"""
+        key = canonical_key(keyword)
+        head = self.synonyms.get(key)
+        return canonical_key(head) if head is not None else key
+
+    def request(self, keyword):
+        """keyword 대신 보낼 요청 문자열 (같은 키의 변형은 모두 같은 값)"""
+        key = self.key(keyword)
+        if not key:
+            return keyword
+        with self._lock:
+            self.stats["lookups"] += 1
+            request = self._requests.get(key)
+            if request is None:
+                request = self.synonyms.get(key) or display_form(keyword)
+                self._requests[key] = request
+                if len(self._requests) > self.max_entries:
+                    self._requests.popitem(last=False)
+            else:
+                self._requests.move_to_end(key)
+            if request != keyword:
+                self.stats["folded"] += 1
+        return request
+
+    def hint_request(self, hint_keywords):
+        """키워드도구 hintKeywords('a,b,c')의 각 키워드를 대표 표기로 바꾸고 중복 제거
+
+        키워드도구는 공백이 들어간 힌트를 거부하므로 공백도 뺍니다.
+        """
+        hints = []
+        for hint in str(hint_keywords).split(","):
+            hint = "".join(self.request(hint).split())
+            if hint and hint not in hints:
+                hints.append(hint)
+        return ",".join(hints)
+
+    def group(self, keywords):
+        """{요청 문자열: [변형, ...]} (처음 나온 순서 유지)"""
+        groups = OrderedDict()
+        for keyword in keywords:
+            groups.setdefault(self.request(keyword), []).append(keyword)
+        return groups
+
+    def fan_out(self, keywords, fetch, max_workers=1):
+        """대표 요청마다 fetch(요청 문자열)를 한 번씩 부르고 결과를 keywords 순서대로 반환
+
+        같은 대표를 가진 변형들은 같은 결과 객체를 받습니다 (수정하려면 복사).
+        """
+        groups = self.group(keywords)
+        requests = list(groups)
+        if max_workers > 1 and len(requests) > 1:
+            # 세션 id가 작업자 스레드로 넘어가도록 naver_flight의 풀을 씀
+            from naver_flight import ContextThreadPoolExecutor
+            with ContextThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as executor:
+                results = dict(zip(requests, executor.map(fetch, requests)))
+        else:
+            results = {request: fetch(request) for request in requests}
+        # 색인을 다시 조회하지 않고 group()이 정한 대표를 그대로 씀 (통계 중복, 사이 축출 방지)
+        request_of = {keyword: request for request, variants in groups.items() for keyword in variants}
+        return [results[request_of[keyword]] for keyword in keywords]
+
+    def summary(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._requests), synonyms=len(self.synonyms))
+
+
+_canonicalizer = None
+_canonical_enabled = True
+_canonical_lock = threading.Lock()
+
+
+def load_synonyms(path=DEFAULT_SYNONYMS_PATH):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8-sig") as f:
+        return parse_synonyms(f.read())
+
+
+def get_canonicalizer():
+    """프로세스 전역 색인 (비활성화 시 None). 처음 만들 때 동의어 파일을 읽음"""
+    global _canonicalizer
+    with _canonical_lock:
+        if not _canonical_enabled:
+            return None
+        if _canonicalizer is None:
+            _canonicalizer = KeywordCanonicalizer(load_synonyms())
+        return _canonicalizer
+
+
+def configure_canonicalizer(enabled=True, synonyms=None, synonyms_path=DEFAULT_SYNONYMS_PATH, **kwargs):
+    """전역 색인 교체 (synonyms dict 또는 파일, kwargs는 KeywordCanonicalizer 인자)"""
+    global _canonicalizer, _canonical_enabled
+    with _canonical_lock:
+        _canonical_enabled = enabled
+        if synonyms is None:
+            synonyms = load_synonyms(synonyms_path)
+        _canonicalizer = KeywordCanonicalizer(synonyms, **kwargs) if enabled else None
+        return _canonicalizer
+
+
+def canonical_query(query):
+    """전역 색인으로 검색어를 대표 요청 문자열로 (비활성화 시 그대로)"""
+    canonicalizer = get_canonicalizer()
+    return canonicalizer.request(query) if canonicalizer is not None else query
+
+
+def canonical_hints(hint_keywords):
+    """전역 색인으로 hintKeywords의 각 키워드를 대표 표기로 (비활성화 시 그대로)"""
+    canonicalizer = get_canonicalizer()
+    return canonicalizer.hint_request(hint_keywords) if canonicalizer is not None else hint_keywords
+
+
+def group_queries(queries):
+    """{대표 요청 문자열: [변형, ...]} (비활성화 시 검색어마다 한 그룹)"""
+    canonicalizer = get_canonicalizer()
+    if canonicalizer is None:
+        return {query: [query] for query in dict.fromkeys(queries)}
+    return canonicalizer.group(queries)
+
+
+def fold_query(endpoint, query, hints=False):
+    """검색어를 대표 요청 문자열로 바꾸고, 바뀌었으면 naver_canonical_folded_total 증가"""
+    request = canonical_hints(query) if hints else canonical_query(query)
+    if request != query:
+        get_metrics().inc("naver_canonical_folded_total", endpoint=endpoint)
+    return request
+
+
+def canonicalized(endpoint, arg_name, hints=False):
+    """fetcher의 검색어 인자(arg_name)를 대표 요청 문자열로 바꿔 호출하는 데코레이터
+
+    @coalesced/@cached보다 바깥에 두어 변형들이 같은 합치기/캐시 키를 쓰게 합니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # coalesce/use_cache/cache_scope 같은 안쪽 데코레이터 옵션은 그대로 넘김
+            options = {k: kwargs.pop(k) for k in list(kwargs) if k not in signature.parameters}
+            bound = signature.bind_partial(*args, **kwargs)
+            query = bound.arguments.get(arg_name)
+            if query is not None:
+                bound.arguments[arg_name] = fold_query(endpoint, query, hints)
+            return func(*bound.args, **bound.kwargs, **options)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,154 @@
+import functools
+import io
+import platform
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# 플랫폼별 한글 폰트 후보 (앞에서부터 설치된 것을 사용)
+KOREAN_FONT_CANDIDATES = {
+    "Windows": ["Malgun Gothic"],
+    "Darwin": ["AppleGothic", "Apple SD Gothic Neo"],
+}
+LINUX_FONT_CANDIDATES = ["NanumGothic", "Noto Sans CJK KR", "Noto Sans KR", "UnDotum"]
+FALLBACK_FONT = "DejaVu Sans"
+
+NAVER_GREEN = "#03C75A"
+NAVER_LIGHT_GREEN = "#1EC800"
+DEFAULT_TOP_N = 20
+DEFAULT_BINS = 20
+CHART_CACHE_ENTRIES = 64
+
+
+@functools.lru_cache(maxsize=1)
+def resolve_korean_font():
+    """설치된 한글 폰트를 한 번만 찾아 matplotlib rcParams에 설정하고 이름을 반환
+
+    PNG 출력에만 필요하며 Vega-Lite 차트는 브라우저 폰트를 그대로 씁니다.
+    """
+    import matplotlib
+    from matplotlib import font_manager
+
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    candidates = KOREAN_FONT_CANDIDATES.get(platform.system(), LINUX_FONT_CANDIDATES)
+    family = next((name for name in candidates if name in installed), FALLBACK_FONT)
+    matplotlib.rcParams['font.family'] = family
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return family
+
+
+def volume_frame(df_display, top_n=DEFAULT_TOP_N):
+    """키워드 표 상위 top_n개를 (연관 키워드, 디바이스, 검색수) long 형식으로"""
+    top = df_display.head(top_n)
+    columns = {'월간 PC 검색수_num': 'PC', '월간 모바일 검색수_num': '모바일'}
+    columns = {k: v for k, v in columns.items() if k in top.columns}
+    if '연관 키워드' not in top.columns or not columns:
+        return pd.DataFrame(columns=['연관 키워드', '디바이스', '검색수'])
+    long = top[['연관 키워드', *columns]].rename(columns=columns).melt(
+        id_vars='연관 키워드', var_name='디바이스', value_name='검색수')
+    long['검색수'] = long['검색수'].astype('float64')
+    return long
+
+
+def price_bins(prices, bins=DEFAULT_BINS):
+    """가격 히스토그램을 미리 집계 (구간 시작, 구간 끝, 상품 수)"""
+    prices = pd.Series(prices, dtype='float64').dropna().to_numpy()
+    if prices.size == 0:
+        return pd.DataFrame(columns=['구간 시작', '구간 끝', '상품 수'])
+    counts, edges = np.histogram(prices, bins=bins)
+    return pd.DataFrame({'구간 시작': edges[:-1], '구간 끝': edges[1:], '상품 수': counts})
+
+
+# Vega-Lite 스펙은 미리 집계한 작은 표만 담으므로 브라우저로 보내는 데이터가 최소화됨
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def volume_chart_spec(result_id, _df_display, top_n=DEFAULT_TOP_N):
+    """키워드별 PC/모바일 월간 검색수 묶음 막대 차트"""
+    data = volume_frame(_df_display, top_n)
+    return {
+        "data": {"values": data.to_dict(orient="records")},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "x": {"field": "연관 키워드", "type": "nominal", "sort": None,
+                  "axis": {"labelAngle": -45, "title": "키워드"}},
+            "xOffset": {"field": "디바이스"},
+            "y": {"field": "검색수", "type": "quantitative", "title": "검색수"},
+            "color": {"field": "디바이스", "type": "nominal",
+                      "scale": {"domain": ["PC", "모바일"], "range": [NAVER_GREEN, NAVER_LIGHT_GREEN]}},
+        },
+        "title": f"키워드별 월간 검색수 (상위 {top_n}개)",
+        "height": 400,
+    }
+
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def price_histogram_spec(result_id, _prices, bins=DEFAULT_BINS):
+    """최저가 분포 히스토그램 (구간은 numpy로 미리 계산)"""
+    data = price_bins(_prices, bins)
+    return {
+        "data": {"values": data.to_dict(orient="records")},
+        "mark": {"type": "bar", "color": NAVER_GREEN, "tooltip": True},
+        "encoding": {
+            "x": {"field": "구간 시작", "type": "quantitative", "bin": {"binned": True}, "title": "가격 (원)"},
+            "x2": {"field": "구간 끝"},
+            "y": {"field": "상품 수", "type": "quantitative", "title": "상품 수"},
+        },
+        "title": "가격 분포",
+        "height": 300,
+    }
+
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def mall_counts_spec(result_id, _mall_counts):
+    """쇼핑몰별 상품 수 가로 막대 차트 (value_counts 결과를 그대로 사용)"""
+    data = [{"쇼핑몰": str(mall), "상품 수": int(count)} for mall, count in _mall_counts.items()]
+    return {
+        "data": {"values": data},
+        "mark": {"type": "bar", "color": NAVER_LIGHT_GREEN, "tooltip": True},
+        "encoding": {
+            "y": {"field": "쇼핑몰", "type": "nominal", "sort": "-x", "title": "쇼핑몰"},
+            "x": {"field": "상품 수", "type": "quantitative", "title": "상품 수"},
+        },
+        "title": f"쇼핑몰별 상품 수 (상위 {len(data)}개)",
+        "height": 300,
+    }
+
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def volume_chart_png(result_id, _df_display, top_n=DEFAULT_TOP_N):
+    """다운로드용 검색수 막대 차트 PNG (결과별로 한 번만 렌더링)
+
+    pyplot 전역 상태를 쓰지 않는 Figure 객체로 그린 뒤 바로 정리하므로
+    서버 프로세스에 그림이 쌓이지 않습니다.
+    """
+    from matplotlib.figure import Figure
+
+    resolve_korean_font()
+    data = volume_frame(_df_display, top_n)
+    table = data.pivot(index='연관 키워드', columns='디바이스', values='검색수')
+    table = table.reindex(data['연관 키워드'].drop_duplicates())
+
+    fig = Figure(figsize=(12, 6))
+    try:
+        ax = fig.subplots()
+        x = np.arange(len(table))
+        width = 0.35
+        colors = {'PC': NAVER_GREEN, '모바일': NAVER_LIGHT_GREEN}
+        for i, device in enumerate(table.columns):
+            offset = (i - (len(table.columns) - 1) / 2) * width
+            ax.bar(x + offset, table[device].to_numpy(), width, label=f'{device} 검색수',
+                   color=colors.get(device, NAVER_GREEN))
+        ax.set_xlabel('키워드')
+        ax.set_ylabel('검색수')
+        ax.set_title(f'키워드별 월간 검색수 (상위 {top_n}개)')
+        ax.set_xticks(x)
+        ax.set_xticklabels(table.index, rotation=45, ha='right')
+        ax.legend()
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=100)
+        return buffer.getvalue()
+    finally:
+        fig.clear()
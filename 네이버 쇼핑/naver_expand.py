@@ -0,0 +1,244 @@
+"""연관 키워드 확장 크롤러 (키워드도구 relKeyword 그래프 너비 우선 탐색)
+
+사용 예:
+    python naver_expand.py "노트북, 맥북" -o expand.csv --depth 2 --max-keywords 5000
+
+시드에서 시작해 단계(depth)별로 연관 키워드를 다시 힌트 키워드로 보내 확장합니다.
+같은 단계 안에서는 총 검색수가 큰 키워드부터 5개씩 묶어 요청하고, 묶음마다
+상태를 체크포인트 파일에 저장하므로 중단 후 같은 명령으로 다시 실행하면
+이미 조회한 키워드는 다시 요청하지 않고 이어서 진행합니다.
+API 키는 NAVER_API_KEY, NAVER_SECRET_KEY, NAVER_CUSTOMER_ID 환경 변수나
+naver_pool 설정 파일(.naver_data/credentials.json)에서 읽습니다.
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import sys
+
+import pandas as pd
+
+from naver_api import get_keyword_results
+from naver_bulk import MAX_HINT_KEYWORDS, DEFAULT_MAX_WORKERS, split_hint_keywords
+from naver_cache import DATA_DIR
+from naver_export import ResultWriter
+from naver_flight import ContextThreadPoolExecutor
+from naver_numeric import normalize_keyword_frame
+from naver_pool import get_pool
+
+
+CHECKPOINT_DIR = os.path.join(DATA_DIR, "expand")
+CHECKPOINT_VERSION = 1
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_KEYWORDS = 5000
+
+
+def normalize_keyword(keyword):
+    """중복 판정용 키워드 (공백 제거, 대소문자 무시). 키워드도구도 공백 없는 형태로 돌려줌"""
+    return "".join(str(keyword).split()).casefold()
+
+
+def default_checkpoint_path(seeds):
+    """시드 목록별 체크포인트 경로 (같은 시드로 다시 실행하면 이어서 진행)"""
+    key = "\n".join(sorted(normalize_keyword(seed) for seed in split_hint_keywords(seeds)))
+    return os.path.join(CHECKPOINT_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] + ".json")
+
+
+class KeywordExpander:
+    """시드 키워드에서 연관 키워드를 너비 우선으로 넓혀 가는 크롤러
+
+    frontier는 (단계, -총 검색수) 순서의 힙이라 얕은 단계가 먼저, 같은 단계에서는
+    검색수가 큰 키워드가 먼저 확장됩니다. 정규화한 키워드 집합으로 중복을 거르므로
+    한 키워드는 한 번만 힌트로 요청됩니다.
+
+    - max_depth: 시드(0단계)에서 몇 단계까지 확장할지
+    - max_keywords: 수집한 키워드가 이 수에 도달하면 더 요청하지 않음
+    - max_requests: 이번 실행에서 보낼 최대 API 요청 수 (None이면 제한 없음)
+    - min_volume: 총 검색수가 이보다 작은 키워드는 수집만 하고 확장하지 않음
+    """
+
+    def __init__(self, seeds, api_key, secret_key, customer_id, max_depth=DEFAULT_MAX_DEPTH,
+                 max_keywords=DEFAULT_MAX_KEYWORDS, max_requests=None, min_volume=0,
+                 max_workers=DEFAULT_MAX_WORKERS, checkpoint_path=None):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.customer_id = customer_id
+        self.max_depth = max_depth
+        self.max_keywords = max_keywords
+        self.max_requests = max_requests
+        self.min_volume = min_volume
+        self.max_workers = max(1, max_workers)
+        self.checkpoint_path = checkpoint_path
+        self.seen = set()
+        self.frontier = []
+        self.rows = {}
+        self.requests = 0
+        self._seq = 0
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self._load()
+        # 체크포인트에 없던 새 시드만 추가됨
+        for seed in split_hint_keywords(seeds):
+            self._discover(seed, 0, 0)
+
+    def _discover(self, keyword, depth, volume):
+        """처음 보는 키워드면 기록하고 확장 대상이면 frontier에 넣음"""
+        norm = normalize_keyword(keyword)
+        if not norm or norm in self.seen:
+            return
+        self.seen.add(norm)
+        if depth < self.max_depth and (depth == 0 or volume >= self.min_volume):
+            heapq.heappush(self.frontier, (depth, -volume, self._seq, keyword))
+            self._seq += 1
+
+    def _absorb(self, batch, df):
+        """묶음 응답을 반영: 새 키워드는 결과에 추가하고 다음 단계 후보로 등록"""
+        depth_of = {normalize_keyword(entry[3]): entry[0] for entry in batch}
+        child_depth = min(depth_of.values()) + 1
+        if df is None or df.empty or 'relKeyword' not in df.columns:
+            return
+        totals = normalize_keyword_frame(df)['totalQcCnt'].tolist() \
+            if 'monthlyPcQcCnt' in df.columns and 'monthlyMobileQcCnt' in df.columns else [0] * len(df)
+        for row, total in zip(df.to_dict("records"), totals):
+            norm = normalize_keyword(row['relKeyword'])
+            if not norm or norm in self.rows:
+                continue
+            depth = depth_of.get(norm, child_depth)
+            row['depth'] = depth
+            self.rows[norm] = row
+            self._discover(row['relKeyword'], depth, int(total))
+
+    def _next_batches(self, count):
+        batches = []
+        while self.frontier and len(batches) < count:
+            batch = []
+            while self.frontier and len(batch) < MAX_HINT_KEYWORDS:
+                batch.append(heapq.heappop(self.frontier))
+            batches.append(batch)
+        return batches
+
+    def run(self, on_progress=None):
+        """frontier가 비거나 예산을 다 쓸 때까지 확장하고 (DataFrame, 오류 목록)을 반환
+
+        요청이 실패하면 (한도 초과 등) 그 묶음을 frontier에 되돌리고 저장한 뒤 멈춥니다.
+        on_progress(수집 키워드 수, 남은 frontier 수, 요청 수)는 라운드마다 호출됩니다.
+        """
+        start_requests = self.requests
+        errors = []
+
+        def fetch(batch):
+            return get_keyword_results(",".join(entry[3] for entry in batch),
+                                       self.api_key, self.secret_key, self.customer_id)
+
+        with ContextThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while self.frontier and len(self.rows) < self.max_keywords:
+                count = self.max_workers
+                if self.max_requests is not None:
+                    count = min(count, self.max_requests - (self.requests - start_requests))
+                batches = self._next_batches(count)
+                if not batches:
+                    break
+                failed = []
+                for batch, (df, error) in zip(batches, executor.map(fetch, batches)):
+                    self.requests += 1
+                    if error:
+                        errors.append(f"[{', '.join(entry[3] for entry in batch)}] {error}")
+                        failed.extend(batch)
+                    else:
+                        self._absorb(batch, df)
+                for entry in failed:
+                    heapq.heappush(self.frontier, entry)
+                self.save()
+                if on_progress is not None:
+                    on_progress(len(self.rows), len(self.frontier), self.requests)
+                if failed:
+                    break
+        return self.frame(), errors
+
+    def frame(self):
+        """수집한 키워드 DataFrame (키워드도구 컬럼 + depth, 총 검색수 내림차순)"""
+        if not self.rows:
+            return pd.DataFrame(columns=['relKeyword', 'depth'])
+        df = normalize_keyword_frame(pd.DataFrame(list(self.rows.values())))
+        if 'totalQcCnt' in df.columns:
+            df = df.sort_values(['totalQcCnt', 'depth'], ascending=[False, True], kind='stable')
+        return df.reset_index(drop=True)
+
+    def save(self):
+        """체크포인트 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 이전 상태가 남음)"""
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "requests": self.requests,
+            "seq": self._seq,
+            "seen": sorted(self.seen),
+            "frontier": self.frontier,
+            "rows": list(self.rows.values()),
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load(self):
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            return
+        self.requests = state["requests"]
+        self._seq = state["seq"]
+        self.seen = set(state["seen"])
+        self.frontier = [tuple(entry) for entry in state["frontier"]]
+        heapq.heapify(self.frontier)
+        self.rows = {normalize_keyword(row['relKeyword']): row for row in state["rows"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 연관 키워드 확장 (너비 우선)")
+    parser.add_argument("seeds", help="시드 키워드 (쉼표 구분) 또는 @파일 (한 줄에 하나)")
+    parser.add_argument("-o", "--output", required=True, help="결과 파일 (.csv, .jsonl, .parquet)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_MAX_DEPTH, help="확장 단계 수")
+    parser.add_argument("--max-keywords", type=int, default=DEFAULT_MAX_KEYWORDS, help="최대 수집 키워드 수")
+    parser.add_argument("--max-requests", type=int, help="이번 실행의 최대 API 요청 수")
+    parser.add_argument("--min-volume", type=int, default=0, help="확장할 최소 총 검색수")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="동시 요청 수")
+    parser.add_argument("--checkpoint", help="체크포인트 파일 (생략 시 시드별 기본 경로)")
+    args = parser.parse_args(argv)
+
+    seeds = args.seeds
+    if seeds.startswith("@"):
+        with open(seeds[1:], encoding="utf-8-sig") as f:
+            seeds = f.read()
+
+    credentials = [os.getenv(name, "") for name in ("NAVER_API_KEY", "NAVER_SECRET_KEY", "NAVER_CUSTOMER_ID")]
+    # 키 풀(credentials.json, NAVER_CREDENTIALS)이 있으면 풀에서 키를 나눠 씀
+    if get_pool("searchad") is not None:
+        credentials = ["", "", ""]
+    elif not all(credentials):
+        print("⚠️  환경 변수가 설정되지 않았습니다: NAVER_API_KEY, NAVER_SECRET_KEY, NAVER_CUSTOMER_ID",
+              file=sys.stderr)
+        return 1
+
+    checkpoint = args.checkpoint or default_checkpoint_path(seeds)
+    expander = KeywordExpander(seeds, *credentials, max_depth=args.depth, max_keywords=args.max_keywords,
+                               max_requests=args.max_requests, min_volume=args.min_volume,
+                               max_workers=args.workers, checkpoint_path=checkpoint)
+
+    def progress(collected, frontier, requests):
+        print(f"[INFO] 수집 {collected}개, 대기 {frontier}개, 요청 {requests}회", file=sys.stderr)
+
+    df, errors = expander.run(on_progress=progress)
+    for error in errors:
+        print(f"[ERROR] {error}", file=sys.stderr)
+    with ResultWriter(args.output) as writer:
+        writer.write(df)
+    print(f"✅ {writer.rows}행 저장: {args.output} (체크포인트: {checkpoint})")
+    if expander.frontier:
+        print(f"남은 키워드 {len(expander.frontier)}개: 같은 명령으로 다시 실행하면 이어서 확장합니다.")
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+import glob
+import importlib.util
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from naver_cache import DATA_DIR
+
+
+# 형식별 (MIME 타입, 확장자). Parquet은 pyarrow가 설치된 경우에만 제공
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "jsonl": ("application/x-ndjson", ".jsonl"),
+}
+if importlib.util.find_spec("pyarrow") is None:
+    del EXPORT_FORMATS["parquet"]
+EXPORT_DIR = os.path.join(DATA_DIR, "exports")
+# 다운로드용 임시 파일 보관 시간 (새 파일을 만들 때 오래된 것을 정리)
+EXPORT_TTL = 3600
+# DataFrame 하나를 쓸 때 나누는 행 수 (문자열 변환 버퍼 크기 제한)
+DEFAULT_CHUNK_ROWS = 50000
+
+
+def format_from_path(path):
+    """확장자로 형식 추정 (.parquet, .jsonl, 나머지는 csv)"""
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, (_, suffix) in EXPORT_FORMATS.items():
+        if ext == suffix:
+            return fmt
+    return "csv"
+
+
+class ResultWriter:
+    """결과 묶음(DataFrame)을 도착하는 대로 파일에 이어 쓰는 내보내기 도구
+
+    CSV는 utf-8-sig(엑셀 호환 BOM), JSONL은 한 줄에 한 레코드, Parquet은
+    묶음마다 row group 하나로 기록합니다. 컬럼과 순서는 첫 묶음을 따르며
+    columns(원래 이름 -> 한글 헤더)가 있으면 이름을 바꿔 씁니다. dedupe_on
+    컬럼을 주면 앞서 쓴 값과 겹치는 행은 건너뜁니다.
+
+        with ResultWriter("out.parquet", columns=KEYWORD_COLUMNS) as writer:
+            for df in batches:
+                writer.write(df)
+
+    path를 생략하면 EXPORT_DIR 아래 임시 파일에 씁니다 (다운로드용).
+    """
+
+    def __init__(self, path=None, fmt=None, columns=None, dedupe_on=None):
+        self.fmt = fmt or (format_from_path(path) if path else "csv")
+        if self.fmt not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {self.fmt}")
+        if path is None:
+            path = _temp_export_path(EXPORT_FORMATS[self.fmt][1])
+        self.path = path
+        self.columns = columns
+        self.dedupe_on = dedupe_on
+        self.rows = 0
+        self._seen = set()
+        self._header = None
+        self._file = None
+        self._parquet = None
+        self._schema = None
+        self._template = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _prepare(self, df):
+        if self.dedupe_on and self.dedupe_on in df.columns:
+            keys = df[self.dedupe_on]
+            fresh = ~keys.isin(self._seen) & ~keys.duplicated()
+            df = df[fresh]
+            self._seen.update(df[self.dedupe_on])
+        if self.columns:
+            df = df.rename(columns=self.columns)
+        if self._header is None:
+            self._header = list(df.columns)
+        else:
+            # 뒤 묶음에 없는 컬럼은 빈 값, 새 컬럼은 버림 (파일 안에서 스키마 고정)
+            df = df.reindex(columns=self._header)
+        return df
+
+    def write(self, df):
+        """묶음 하나를 기록하고 실제로 쓴 행 수를 반환"""
+        if df is None:
+            return 0
+        if df.empty:
+            # 결과가 끝까지 비면 이 컬럼으로 빈 파일을 만듦
+            if self._template is None:
+                self._template = df.iloc[:0]
+            return 0
+        df = self._prepare(df)
+        if df.empty:
+            return 0
+        for start in range(0, len(df), DEFAULT_CHUNK_ROWS):
+            self._write_chunk(df.iloc[start:start + DEFAULT_CHUNK_ROWS])
+        self.rows += len(df)
+        return len(df)
+
+    def _write_chunk(self, df):
+        if self.fmt == "parquet":
+            self._write_parquet(df)
+            return
+        if self._file is None:
+            encoding = "utf-8-sig" if self.fmt == "csv" else "utf-8"
+            self._file = open(self.path, "w", encoding=encoding, newline="")
+            if self.fmt == "csv":
+                df.iloc[:0].to_csv(self._file, index=False)
+        if self.fmt == "csv":
+            df.to_csv(self._file, index=False, header=False)
+        else:
+            text = df.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+            self._file.write(text if text.endswith("\n") else text + "\n")
+
+    def _write_parquet(self, df):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+        # 키워드도구의 '< 10'처럼 숫자/문자가 섞인 object 컬럼은 문자열로 고정.
+        # 뒤 묶음은 첫 묶음에서 문자열이었던 컬럼도 문자열로 맞춤
+        text_columns = {c for c in df.columns if df[c].dtype == object}
+        if self._schema is not None:
+            text_columns.update(f.name for f in self._schema
+                                if pa.types.is_string(f.type) or pa.types.is_large_string(f.type))
+        text_columns &= set(df.columns)
+        if text_columns:
+            df = df.astype({c: "string" for c in text_columns})
+        if self._parquet is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._schema = table.schema
+            self._parquet = pq.ParquetWriter(self.path, self._schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._parquet.write_table(table)
+
+    def close(self):
+        if self.rows == 0 and self._file is None and self._parquet is None:
+            self._write_empty()
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_empty(self):
+        """빈 결과도 열 수 있는 파일로 남김 (CSV는 헤더만, Parquet은 스키마만, JSONL은 빈 파일)"""
+        if self.fmt == "jsonl":
+            open(self.path, "w", encoding="utf-8").close()
+            return
+        if self._header is not None:
+            template = pd.DataFrame(columns=self._header)
+        else:
+            template = self._template if self._template is not None else pd.DataFrame()
+            if self.columns:
+                template = template.rename(columns=self.columns)
+        self._write_chunk(template)
+
+    @property
+    def mime(self):
+        return EXPORT_FORMATS[self.fmt][0]
+
+
+def _temp_export_path(suffix):
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    cutoff = time.time() - EXPORT_TTL
+    for old in glob.glob(os.path.join(EXPORT_DIR, "export-*")):
+        try:
+            if os.path.getmtime(old) < cutoff:
+                os.remove(old)
+        except OSError:
+            pass
+    fd, path = tempfile.mkstemp(prefix="export-", suffix=suffix, dir=EXPORT_DIR)
+    os.close(fd)
+    return path
+
+
+def export_frame(df, fmt="csv", columns=None):
+    """DataFrame 하나를 임시 파일로 내보내고 경로를 반환 (행 단위 청크로 기록)"""
+    with ResultWriter(fmt=fmt, columns=columns) as writer:
+        writer.write(df)
+    return writer.path
+
+
+def export_bytes(df, fmt="csv", columns=None):
+    """DataFrame 하나를 임시 파일로 내보낸 뒤 내용을 읽고 파일은 지움
+
+    파일 쓰기는 청크 단위지만 반환값은 파일 전체 bytes이므로 최대 메모리는
+    내보낸 파일 크기만큼입니다.
+    """
+    path = export_frame(df, fmt, columns)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def deferred_download(df, fmt="csv", columns=None):
+    """st.download_button(data=...)용 콜백: 클릭할 때 내보낸 파일 내용을 반환
+
+    스크립트 실행 중에는 내보내기를 하지 않으므로 화면이 멈추지 않습니다.
+    Streamlit은 다운로드 데이터를 한 번에 메모리로 읽으므로 내용 전체를 bytes로
+    돌려줍니다.
+    """
+    def build():
+        return export_bytes(df, fmt, columns)
+    return build
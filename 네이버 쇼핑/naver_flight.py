@@ -0,0 +1,162 @@
+"""동일 요청 합치기 (single-flight) 와 세션 식별
+
+여러 Streamlit 세션이 같은 파라미터로 동시에 fetcher를 호출하면 먼저 온 호출만
+API로 보내고 나머지는 그 결과를 기다렸다가 복사본을 받습니다. 요청 키는 응답
+캐시와 같은 규칙(make_cache_key)으로 만들므로 자격증명(또는 키 풀 범위)이 같은
+호출끼리만 합쳐집니다.
+
+세션 id는 contextvars로 전달되며 naver_ratelimit이 세션별로 차례를 나눠 주는 데
+씁니다. ContextThreadPoolExecutor는 작업을 넣을 때의 컨텍스트(세션 id 포함)를
+작업자 스레드로 넘깁니다.
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from naver_cache import make_cache_key
+from naver_metrics import get_metrics
+
+
+_session = contextvars.ContextVar("naver_session", default=None)
+
+
+def current_session():
+    """지금 호출을 보낸 세션 id (없으면 None)"""
+    return _session.get()
+
+
+def set_session(session_id):
+    """현재 스레드(컨텍스트)의 세션 id 지정 (Streamlit 스크립트 시작 시 호출)"""
+    _session.set(session_id)
+
+
+@contextlib.contextmanager
+def session_scope(session_id):
+    """with 블록 안의 호출을 session_id로 표시"""
+    token = _session.set(session_id)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """submit 시점의 contextvars(세션 id)를 작업자 스레드에서 그대로 쓰는 스레드 풀"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.blob = None
+        self.value = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """같은 키의 호출이 진행 중이면 새로 보내지 않고 그 결과를 기다림"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "followers": 0}
+
+    def do(self, key, fn):
+        """fn()을 키당 한 번만 실행하고 결과를 돌려줌 (bool: 합쳐진 호출인지)
+
+        기다린 호출자는 pickle 복사본을 받으므로 결과를 고쳐도 서로 영향이 없습니다
+        (pickle할 수 없는 값이면 같은 객체를 받습니다).
+        fn이 예외를 던지면 기다리던 호출자에게도 같은 예외를 던집니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.stats["followers"] += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if call.blob is None:
+                # 복사할 수 없는 값은 같은 객체를 나눠 받음
+                return call.value, True
+            return pickle.loads(call.blob), True
+
+        try:
+            value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            # 기다리는 호출자가 있을 때만 복사본을 만듦
+            with self._lock:
+                del self._calls[key]
+                followers = call.followers
+            if followers:
+                try:
+                    call.blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    call.value = value
+            return value, False
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def inflight(self):
+        """진행 중인 키 수"""
+        with self._lock:
+            return len(self._calls)
+
+
+_flight = SingleFlight()
+
+
+def get_flight():
+    """프로세스 전역 SingleFlight"""
+    return _flight
+
+
+def coalesced(endpoint, credential_args):
+    """동시에 들어온 같은 호출을 하나로 합치는 fetcher 데코레이터
+
+    @cached와 같은 키 규칙을 쓰며 (cache_scope 포함), 합쳐진 호출 수는
+    naver_coalesced_total 카운터로 남깁니다. coalesce=False로 끌 수 있습니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, coalesce=True, **kwargs):
+            if not coalesce:
+                return func(*args, **kwargs)
+            options = {k: kwargs.pop(k) for k in ("use_cache", "cache_scope") if k in kwargs}
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            credentials = [params.pop(name) for name in credential_args]
+            if options.get("cache_scope") is not None:
+                credentials = [options["cache_scope"]]
+            # 캐시를 건너뛰는 호출은 캐시를 쓰는 호출의 결과를 받지 않도록 키를 나눔
+            params["use_cache"] = options.get("use_cache", True)
+            key = make_cache_key(endpoint, params, credentials)
+            value, shared = _flight.do(key, lambda: func(*args, **kwargs, **options))
+            if shared:
+                get_metrics().inc("naver_coalesced_total", endpoint=endpoint)
+            return value
+
+        return wrapper
+    return decorator
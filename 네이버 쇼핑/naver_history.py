@@ -0,0 +1,333 @@
+"""쇼핑/블로그 순위 이력 수집기
+
+사용 예:
+    python naver_history.py collect watchlist.txt --interval 3600
+    python naver_history.py query --keyword 노트북 --start 2024-01-01 --end 2024-03-31 -o history.csv
+
+watchlist 파일은 한 줄에 '종류 | 키워드 | 대상' 형식입니다.
+    shop | 맥북 프로 | 12345678901      (상품ID 또는 쇼핑몰명)
+    blog | 아이스크림 | blog.naver.com/myblog
+API 키는 NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경 변수에서 읽습니다. 여러 키는
+naver_pool 설정 파일(.naver_data/credentials.json)이나 NAVER_CREDENTIALS로 등록합니다.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from naver_cache import DATA_DIR
+from naver_export import ResultWriter
+from naver_periodic import PeriodicCollector, day_of, to_ts
+from naver_pool import get_pool
+from naver_rank import track_ranks, track_blog_ranks
+from naver_ratelimit import KST
+
+
+DEFAULT_HISTORY_PATH = os.path.join(DATA_DIR, "history.sqlite3")
+DEFAULT_INTERVAL = 3600
+DEFAULT_BLOG_WORKERS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    target TEXT NOT NULL,
+    UNIQUE (kind, keyword, target)
+);
+-- 값이 바뀐 관측만 저장. (대상, 시각) 순으로 클러스터링되어 대상별 범위 조회가 빠름
+CREATE TABLE IF NOT EXISTS observations (
+    target_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    rank INTEGER,
+    price INTEGER,
+    PRIMARY KEY (target_id, ts)
+) WITHOUT ROWID;
+-- 날짜(KST YYYYMMDD) 파티션 키: 기간 전체 조회용
+CREATE INDEX IF NOT EXISTS idx_observations_day ON observations (day, target_id);
+-- 대상별 마지막 값과 마지막 확인 시각 (변경 여부 비교용)
+CREATE TABLE IF NOT EXISTS latest (
+    target_id INTEGER PRIMARY KEY,
+    checked_ts INTEGER NOT NULL,
+    rank INTEGER,
+    price INTEGER
+);
+"""
+
+
+def parse_watchlist(text):
+    """'종류 | 키워드 | 대상' 줄 목록을 감시 대상 dict 목록으로 변환"""
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) != 3 or parts[0] not in ("shop", "blog") or not parts[1] or not parts[2]:
+            continue
+        items.append({"kind": parts[0], "keyword": parts[1], "target": parts[2]})
+    return items
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RankHistoryStore:
+    """변경분만 추가하는 SQLite 순위 이력 저장소 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _target_ids(self, keys):
+        """(kind, keyword, target) 목록의 id (없으면 생성)"""
+        self._db.executemany("INSERT OR IGNORE INTO targets (kind, keyword, target) VALUES (?, ?, ?)", keys)
+        ids = {}
+        for kind, keyword, target in keys:
+            row = self._db.execute(
+                "SELECT id FROM targets WHERE kind = ? AND keyword = ? AND target = ?", (kind, keyword, target)
+            ).fetchone()
+            ids[(kind, keyword, target)] = row[0]
+        return ids
+
+    def record_many(self, rows, ts=None):
+        """관측 목록을 한 트랜잭션으로 기록하고 실제로 저장된(바뀐) 행 수를 반환
+
+        rows는 (kind, keyword, target, rank, price) 튜플입니다. 직전 값과
+        순위/가격이 같으면 마지막 확인 시각만 갱신합니다.
+        """
+        ts = int(ts if ts is not None else time.time())
+        day = day_of(ts)
+        with self._lock, self._db:
+            ids = self._target_ids(list(dict.fromkeys((r[0], r[1], r[2]) for r in rows)))
+            id_list = list(ids.values())
+            latest = {}
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(id_list), 500):
+                chunk = id_list[i:i + 500]
+                latest.update(
+                    (row[0], (row[1], row[2]))
+                    for row in self._db.execute(
+                        f"SELECT target_id, rank, price FROM latest WHERE target_id IN ({','.join('?' * len(chunk))})",
+                        chunk))
+            changed = []
+            for kind, keyword, target, rank, price in rows:
+                target_id = ids[(kind, keyword, target)]
+                value = (_to_int(rank), _to_int(price))
+                if latest.get(target_id) != value:
+                    changed.append((target_id, ts, day, value[0], value[1]))
+                    latest[target_id] = value
+            self._db.executemany(
+                "INSERT OR REPLACE INTO observations (target_id, ts, day, rank, price) VALUES (?, ?, ?, ?, ?)",
+                changed)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO latest (target_id, checked_ts, rank, price) VALUES (?, ?, ?, ?)",
+                [(target_id, ts, value[0], value[1]) for target_id, value in latest.items()])
+        return len(changed)
+
+    def query(self, kind=None, keyword=None, target=None, start=None, end=None, include_prior=True):
+        """조건에 맞는 이력만 SQL로 골라 DataFrame으로 반환
+
+        start/end는 'YYYY-MM-DD' 또는 datetime (KST 기준, end 포함). include_prior가
+        참이면 start 직전의 마지막 관측도 포함해 기간 시작 시점의 값을 알 수 있게 합니다.
+        """
+        sql, params = self._query_sql(kind, keyword, target, start, end, include_prior)
+        with self._lock:
+            df = pd.read_sql_query(sql, self._db, params=params)
+        return self._finish(df)
+
+    def iter_query(self, kind=None, keyword=None, target=None, start=None, end=None, include_prior=True,
+                   chunksize=50000):
+        """query와 같은 조건의 결과를 chunksize행씩 DataFrame으로 내보냄 (대량 내보내기용)
+
+        별도 읽기 연결을 쓰므로 순회하는 동안 수집기의 기록을 막지 않습니다.
+        """
+        sql, params = self._query_sql(kind, keyword, target, start, end, include_prior)
+        db = sqlite3.connect(self.path)
+        try:
+            for df in pd.read_sql_query(sql, db, params=params, chunksize=chunksize):
+                yield self._finish(df)
+        finally:
+            db.close()
+
+    def _query_sql(self, kind, keyword, target, start, end, include_prior):
+        where = []
+        params = []
+        for column, value in (("t.kind", kind), ("t.keyword", keyword), ("t.target", target)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        start_ts = to_ts(start) if start else None
+        end_ts = to_ts(end, end_of_day=True) if end else None
+        range_where = list(where)
+        range_params = list(params)
+        # day 조건을 함께 걸어 대상 조건이 없을 때도 날짜 인덱스를 타게 함
+        if start_ts is not None:
+            range_where += ["o.day >= ?", "o.ts >= ?"]
+            range_params += [day_of(start_ts), start_ts]
+        if end_ts is not None:
+            range_where += ["o.day <= ?", "o.ts <= ?"]
+            range_params += [day_of(end_ts), end_ts]
+
+        select = ("SELECT t.kind, t.keyword, t.target, o.ts, o.rank, o.price "
+                  "FROM observations o JOIN targets t ON t.id = o.target_id")
+        sql = select + (" WHERE " + " AND ".join(range_where) if range_where else "")
+        if include_prior and start_ts is not None:
+            prior_where = where + [
+                "o.ts = (SELECT MAX(p.ts) FROM observations p WHERE p.target_id = o.target_id AND p.ts < ?)"
+            ]
+            sql += " UNION ALL " + select + " WHERE " + " AND ".join(prior_where)
+            range_params += params + [start_ts]
+        sql += " ORDER BY 1, 2, 3, 4"
+        return sql, range_params
+
+    @staticmethod
+    def _finish(df):
+        df["observed_at"] = pd.to_datetime(df.pop("ts"), unit="s", utc=True).dt.tz_convert(KST)
+        df["rank"] = df["rank"].astype("Int32")
+        df["price"] = df["price"].astype("Int64")
+        return df
+
+    def targets(self):
+        """등록된 감시 대상과 마지막 값"""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT t.kind, t.keyword, t.target, l.rank, l.price, l.checked_ts "
+                "FROM targets t LEFT JOIN latest l ON l.target_id = t.id ORDER BY 1, 2, 3", self._db)
+
+    def close(self):
+        self._db.close()
+
+
+class RankHistoryCollector(PeriodicCollector):
+    """watchlist의 쇼핑/블로그 순위를 주기적으로 조회해 저장소에 기록
+
+    캐시된 순위가 새 관측값으로 기록되지 않도록 응답 캐시를 쓰지 않습니다.
+    """
+
+    thread_name = "rank-history-collector"
+
+    def __init__(self, store, watchlist, client_id, client_secret, interval=DEFAULT_INTERVAL,
+                 blog_workers=DEFAULT_BLOG_WORKERS, on_error=None):
+        super().__init__(interval, on_error)
+        self.store = store
+        self.watchlist = watchlist
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.blog_workers = blog_workers
+
+    def _collect_shop(self, items):
+        if not items:
+            return []
+        targets = [
+            {"keyword": w["keyword"],
+             "productId": w["target"] if w["target"].isdigit() else None,
+             "mallName": None if w["target"].isdigit() else w["target"]}
+            for w in items
+        ]
+        df = track_ranks(targets, self.client_id, self.client_secret, use_cache=False)
+        rows = []
+        for w, row in zip(items, df.to_dict("records")):
+            if row["error"]:
+                self.on_error(f"shop [{w['keyword']} | {w['target']}] {row['error']}")
+                continue
+            rank = None if pd.isna(row["rank"]) else int(row["rank"])
+            rows.append(("shop", w["keyword"], w["target"], rank, row["lprice"] if rank else None))
+        return rows
+
+    def _collect_blog(self, items):
+        # 키워드별 대상 묶음이 같은 키워드끼리 한 번에 조회 (대상마다 페이지를 다시 받지 않음)
+        targets_of = {}
+        for w in items:
+            targets_of.setdefault(w["keyword"], []).append(w["target"])
+        groups = {}
+        for keyword, targets in targets_of.items():
+            groups.setdefault(tuple(dict.fromkeys(targets)), []).append(keyword)
+
+        rows = []
+        for targets, keywords in groups.items():
+            df = track_blog_ranks(keywords, targets, self.client_id, self.client_secret,
+                                  concurrency=self.blog_workers, use_cache=False)
+            for row in df.to_dict("records"):
+                for target in targets:
+                    if row["error"]:
+                        self.on_error(f"blog [{row['keyword']} | {target}] {row['error']}")
+                        continue
+                    rank = None if pd.isna(row[target]) else int(row[target])
+                    rows.append(("blog", row["keyword"], target, rank, None))
+        return rows
+
+    def run_once(self):
+        """한 번 조회해서 기록하고 (조회 건수, 변경 건수)를 반환"""
+        ts = int(time.time())
+        rows = self._collect_shop([w for w in self.watchlist if w["kind"] == "shop"])
+        rows += self._collect_blog([w for w in self.watchlist if w["kind"] == "blog"])
+        changed = self.store.record_many(rows, ts) if rows else 0
+        return len(rows), changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 순위 이력 수집/조회")
+    parser.add_argument("--db", default=DEFAULT_HISTORY_PATH, help="이력 저장소 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    collect = sub.add_parser("collect", help="watchlist를 주기적으로 수집")
+    collect.add_argument("watchlist", help="'종류 | 키워드 | 대상' 형식 파일")
+    collect.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help="수집 주기(초)")
+    collect.add_argument("--once", action="store_true", help="한 번만 수집하고 종료")
+    query = sub.add_parser("query", help="이력 조회")
+    query.add_argument("--kind", choices=["shop", "blog"])
+    query.add_argument("--keyword")
+    query.add_argument("--target")
+    query.add_argument("--start")
+    query.add_argument("--end")
+    query.add_argument("-o", "--output", help="파일로 저장 (.csv, .jsonl, .parquet. 생략 시 화면 출력)")
+    args = parser.parse_args(argv)
+
+    store = RankHistoryStore(args.db)
+    if args.command == "query":
+        if args.output:
+            with ResultWriter(args.output) as writer:
+                for df in store.iter_query(args.kind, args.keyword, args.target, args.start, args.end):
+                    writer.write(df)
+            print(f"✅ {writer.rows}행 저장: {args.output}")
+        else:
+            df = store.query(args.kind, args.keyword, args.target, args.start, args.end)
+            print(df.to_string(index=False))
+        return 0
+
+    client_id = os.getenv("NAVER_CLIENT_ID", "")
+    client_secret = os.getenv("NAVER_CLIENT_SECRET", "")
+    # 키 풀(credentials.json, NAVER_CREDENTIALS)이 있으면 풀에서 키를 나눠 씀
+    if get_pool("openapi") is not None:
+        client_id = client_secret = ""
+    elif not client_id or not client_secret:
+        print("⚠️  환경 변수가 설정되지 않았습니다: NAVER_CLIENT_ID, NAVER_CLIENT_SECRET", file=sys.stderr)
+        return 1
+    with open(args.watchlist, encoding="utf-8-sig") as f:
+        watchlist = parse_watchlist(f.read())
+    collector = RankHistoryCollector(store, watchlist, client_id, client_secret, args.interval)
+    if args.once:
+        checked, changed = collector.run_once()
+        print(f"✅ 조회 {checked}건, 변경 {changed}건")
+        return 0
+    try:
+        collector.run_forever()
+    except KeyboardInterrupt:
+        collector.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
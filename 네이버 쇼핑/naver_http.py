@@ -0,0 +1,72 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# 환경 변수로 바꾸면 모의 서버(naver_mock_server.py) 등으로 요청을 보낼 수 있음
+OPENAPI_BASE_URL = os.getenv("NAVER_OPENAPI_BASE_URL", "https://openapi.naver.com").rstrip("/")
+SEARCHAD_BASE_URL = os.getenv("NAVER_SEARCHAD_BASE_URL", "https://api.naver.com").rstrip("/")
+
+# (연결, 읽기) 타임아웃 초
+DEFAULT_TIMEOUT = (5, 30)
+# 호스트당 유지할 keep-alive 연결 수
+DEFAULT_POOL_SIZE = 10
+
+
+class NaverHttpClient:
+    """openapi.naver.com / api.naver.com 공용 HTTP 클라이언트
+
+    requests.Session 위에 연결 풀을 두어 호출마다 TCP+TLS 핸드셰이크를
+    반복하지 않도록 합니다. 모든 호출에는 기본 타임아웃이 적용되고
+    gzip 응답은 자동으로 해제됩니다.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 전역 공유 클라이언트 반환 (최초 호출 시 생성)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NaverHttpClient()
+        return _client
+
+
+def configure_client(pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+    """공유 클라이언트를 새 설정으로 교체 (기존 연결 풀은 닫음)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = NaverHttpClient(pool_size=pool_size, timeout=timeout)
+        return _client
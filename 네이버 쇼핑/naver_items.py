@@ -0,0 +1,180 @@
+import html
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+_TAG_RE = re.compile(r"<[^<>]*>")
+
+# (속성 이름, API/DataFrame 컬럼 이름). 컬럼 이름은 응답 JSON 키를 그대로 써서
+# SHOP_COLUMNS 같은 기존 한글 컬럼 매핑과 productId/mallName 비교 코드가 그대로 동작
+SHOP_FIELDS = (
+    ("title", "title"), ("link", "link"), ("image", "image"),
+    ("lprice", "lprice"), ("hprice", "hprice"), ("mall_name", "mallName"),
+    ("product_id", "productId"), ("product_type", "productType"),
+    ("brand", "brand"), ("maker", "maker"),
+    ("category1", "category1"), ("category2", "category2"),
+    ("category3", "category3"), ("category4", "category4"),
+)
+BLOG_FIELDS = (
+    ("title", "title"), ("link", "link"), ("description", "description"),
+    ("blogger_name", "bloggername"), ("blogger_link", "bloggerlink"),
+    ("postdate", "postdate"),
+)
+# 값 종류가 적어 DataFrame에서 범주형으로 두는 컬럼
+SHOP_CATEGORY_COLUMNS = ("mallName", "brand", "maker", "category1", "category2", "category3", "category4")
+BLOG_CATEGORY_COLUMNS = ("bloggername", "bloggerlink")
+# 결측 가능 정수 컬럼 (pandas nullable 정수)
+SHOP_INT_COLUMNS = ("lprice", "hprice", "productId")
+SHOP_SMALL_INT_COLUMNS = ("productType",)
+
+
+def clean_text(text):
+    """<b> 등 HTML 태그 제거와 &amp; 같은 엔티티 복원을 한 번에 (태그/엔티티가 없으면 그대로)"""
+    if not text:
+        return ""
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return text
+
+
+def _to_int(value):
+    """'12900' -> 12900, 빈 값/해석 불가 -> None"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _intern(value):
+    """같은 쇼핑몰/브랜드/분류 문자열이 항목마다 따로 메모리를 차지하지 않도록 공유"""
+    return sys.intern(value) if value else ""
+
+
+class ShopItem:
+    """쇼핑 검색 결과 상품 하나 (가격은 정수, 쇼핑몰/브랜드/분류는 intern된 문자열)"""
+
+    __slots__ = tuple(attr for attr, _ in SHOP_FIELDS)
+
+    def __init__(self, title, link, image, lprice, hprice, mall_name, product_id, product_type,
+                 brand, maker, category1, category2, category3, category4):
+        self.title = title
+        self.link = link
+        self.image = image
+        self.lprice = lprice
+        self.hprice = hprice
+        self.mall_name = mall_name
+        self.product_id = product_id
+        self.product_type = product_type
+        self.brand = brand
+        self.maker = maker
+        self.category1 = category1
+        self.category2 = category2
+        self.category3 = category3
+        self.category4 = category4
+
+    @classmethod
+    def from_json(cls, item):
+        """응답 items의 dict 하나를 파싱 (태그 제거, 숫자 변환, intern을 여기서 한 번만)"""
+        get = item.get
+        return cls(
+            clean_text(get("title")), get("link") or "", get("image") or "",
+            _to_int(get("lprice")), _to_int(get("hprice")), _intern(get("mallName")),
+            _to_int(get("productId")), _to_int(get("productType")),
+            _intern(get("brand")), _intern(get("maker")),
+            _intern(get("category1")), _intern(get("category2")),
+            _intern(get("category3")), _intern(get("category4")),
+        )
+
+    def __repr__(self):
+        return f"ShopItem(product_id={self.product_id!r}, title={self.title!r}, lprice={self.lprice!r})"
+
+
+class BlogItem:
+    """블로그 검색 결과 글 하나 (postdate는 YYYYMMDD 정수, 블로거 이름/링크는 intern)"""
+
+    __slots__ = tuple(attr for attr, _ in BLOG_FIELDS)
+
+    def __init__(self, title, link, description, blogger_name, blogger_link, postdate):
+        self.title = title
+        self.link = link
+        self.description = description
+        self.blogger_name = blogger_name
+        self.blogger_link = blogger_link
+        self.postdate = postdate
+
+    @classmethod
+    def from_json(cls, item):
+        get = item.get
+        return cls(
+            clean_text(get("title")), get("link") or "", clean_text(get("description")),
+            _intern(get("bloggername")), _intern(get("bloggerlink")), _to_int(get("postdate")),
+        )
+
+    def __repr__(self):
+        return f"BlogItem(title={self.title!r}, link={self.link!r})"
+
+
+def parse_shop_items(items):
+    """쇼핑 검색 응답의 items(dict 목록) -> ShopItem 목록"""
+    return [ShopItem.from_json(item) for item in items or ()]
+
+
+def parse_blog_items(items):
+    """블로그 검색 응답의 items(dict 목록) -> BlogItem 목록"""
+    return [BlogItem.from_json(item) for item in items or ()]
+
+
+def _columns(items, fields, columns):
+    """필요한 컬럼만 속성 목록에서 바로 뽑음 (dict 목록을 거치지 않음)"""
+    wanted = [(attr, column) for attr, column in fields if columns is None or column in columns]
+    if columns is not None:
+        order = {column: i for i, column in enumerate(columns)}
+        wanted.sort(key=lambda pair: order[pair[1]])
+    return {column: [getattr(item, attr) for item in items] for attr, column in wanted}
+
+
+def shop_frame(items, columns=None):
+    """ShopItem 목록 -> DataFrame (columns: 남길 API 컬럼 이름, 생략 시 전체)
+
+    가격/상품ID는 Int64, 상품타입은 Int8, 쇼핑몰/브랜드/분류는 범주형입니다.
+    """
+    data = _columns(items, SHOP_FIELDS, columns)
+    for column in SHOP_INT_COLUMNS:
+        if column in data:
+            data[column] = pd.array(data[column], dtype="Int64")
+    for column in SHOP_SMALL_INT_COLUMNS:
+        if column in data:
+            data[column] = pd.array(data[column], dtype="Int8")
+    for column in SHOP_CATEGORY_COLUMNS:
+        if column in data:
+            data[column] = pd.Categorical(data[column])
+    return pd.DataFrame(data, columns=list(data))
+
+
+def blog_frame(items, columns=None):
+    """BlogItem 목록 -> DataFrame (postdate는 datetime64, 블로거 이름/링크는 범주형)"""
+    data = _columns(items, BLOG_FIELDS, columns)
+    if "postdate" in data:
+        dates = np.array([d if d is not None else 0 for d in data["postdate"]], dtype=np.int64)
+        data["postdate"] = pd.to_datetime(dates.astype(str), format="%Y%m%d", errors="coerce")
+    for column in BLOG_CATEGORY_COLUMNS:
+        if column in data:
+            data[column] = pd.Categorical(data[column])
+    return pd.DataFrame(data, columns=list(data))
+
+
+def shop_json_frame(items, columns=None):
+    """쇼핑 검색 응답 items -> 정리된 DataFrame (parse_shop_items + shop_frame)"""
+    return shop_frame(parse_shop_items(items), columns)
+
+
+def blog_json_frame(items, columns=None):
+    """블로그 검색 응답 items -> 정리된 DataFrame (parse_blog_items + blog_frame)"""
+    return blog_frame(parse_blog_items(items), columns)
@@ -0,0 +1,556 @@
+"""로컬 작업 큐 (SQLite) 와 작업자 프로세스 풀
+
+사용 예:
+    python naver_jobs.py worker --processes 4
+    python naver_jobs.py submit keywords seeds.txt
+    python naver_jobs.py list
+    python naver_jobs.py cancel 12
+    python naver_jobs.py result 12 -o keywords.csv
+
+Streamlit 화면에서 넣은 대량 작업(키워드 대량 분석, 쇼핑 순위 추적, 트렌드)을
+별도 프로세스에서 실행합니다. 작업 상태, 진행률, 부분 결과는 모두 SQLite
+파일에 있으므로 브라우저가 다시 연결되어도 이어서 볼 수 있고 여러 사용자가
+같은 서버에서 동시에 작업을 넣을 수 있습니다. 외부 브로커는 필요 없습니다.
+작업자는 단계마다 취소 요청을 확인하고 중단합니다.
+
+API 키는 작업 큐에 저장하지 않습니다. 작업자는 자기 키 풀(naver_pool:
+credentials.json 또는 환경 변수)에서 키를 고르고, 작업에 특정 키를 지정할
+때는 그 키의 지문(credential_fingerprint)만 params에 넣습니다.
+"""
+import argparse
+import json
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from naver_bulk import chunk_keywords, get_keyword_results_bulk, split_hint_keywords, MAX_HINT_KEYWORDS
+from naver_cache import DATA_DIR
+from naver_export import ResultWriter
+from naver_numeric import normalize_keyword_frame
+from naver_pool import KIND_FIELDS, get_pool
+from naver_rank import parse_rank_targets, track_ranks
+from naver_ratelimit import ENDPOINT_LIMITS, configure_scheduler
+from naver_trend import get_trend_frame, parse_keyword_groups
+
+
+DEFAULT_JOBS_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+DEFAULT_PROCESSES = 2
+DEFAULT_POLL_INTERVAL = 1.0
+# 작업 중인 작업자가 이 간격으로 살아 있음을 기록하고, STALE_AFTER 초 동안
+# 기록이 없으면 (프로세스가 죽은 경우) 작업을 다시 대기열로 돌림
+HEARTBEAT_INTERVAL = 5.0
+STALE_AFTER = 60.0
+# 키워드 작업은 시드 KEYWORD_STEP개(요청 10회)마다, 순위 작업은 대상 RANK_STEP개마다
+# 진행률/부분 결과를 남기고 취소 요청을 확인
+KEYWORD_STEP = MAX_HINT_KEYWORDS * 10
+RANK_STEP = 5
+
+STATUSES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED = ("done", "failed", "cancelled")
+# 작업이 끝나면 params에서 지우는 키 (API 키를 디스크에 남기지 않음)
+CREDENTIAL_PARAMS = ("client_id", "client_secret", "api_key", "secret_key", "customer_id")
+# 작업 종류별로 쓰는 자격증명 종류 (params["credential"]은 그 종류의 키 지문)
+JOB_CREDENTIAL_KINDS = {"keywords": "searchad", "shop_rank": "openapi", "trend": "openapi"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    owner TEXT NOT NULL DEFAULT '',
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    errors TEXT NOT NULL DEFAULT '[]',
+    worker TEXT,
+    created_ts REAL NOT NULL,
+    started_ts REAL,
+    heartbeat_ts REAL,
+    finished_ts REAL
+);
+-- 대기 작업을 들어온 순서대로 꺼내기 위한 인덱스
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+-- 부분 결과: 작업 단계마다 DataFrame 하나 (pickle)
+CREATE TABLE IF NOT EXISTS job_parts (
+    job_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class JobCancelled(Exception):
+    """작업 중 취소 요청을 확인한 경우"""
+
+
+class JobQueue:
+    """SQLite 작업 큐 (여러 프로세스/스레드에서 동시에 사용 가능)
+
+    WAL 모드라 작업자가 부분 결과를 쓰는 동안에도 화면 쪽 조회가 막히지 않습니다.
+    """
+
+    def __init__(self, path=DEFAULT_JOBS_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params)
+
+    def _fetch(self, sql, params=()):
+        """(행 목록, 컬럼 이름) - 연결을 스레드끼리 나눠 쓰므로 잠금 안에서 다 읽음"""
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            return cursor.fetchall(), [c[0] for c in cursor.description]
+
+    def submit(self, kind, params, owner=""):
+        """작업을 대기열에 넣고 id 반환 (params에 API 키가 있으면 빼고 저장)"""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        params = {k: v for k, v in params.items() if k not in CREDENTIAL_PARAMS}
+        cursor = self._execute(
+            "INSERT INTO jobs (kind, owner, params, created_ts) VALUES (?, ?, ?, ?)",
+            (kind, owner, json.dumps(params, ensure_ascii=False), time.time()))
+        return cursor.lastrowid
+
+    def claim(self, worker):
+        """가장 오래 기다린 작업 하나를 running으로 바꿔 가져옴 (없으면 None)"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, started_ts = ?, heartbeat_ts = ? "
+                        "WHERE id = ?", (worker, now, now, row[0]))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return None if row is None else self.get(row[0])
+
+    def heartbeat(self, job_id):
+        self._execute("UPDATE jobs SET heartbeat_ts = ? WHERE id = ?", (time.time(), job_id))
+
+    def update_progress(self, job_id, done, total, message=""):
+        """진행률을 기록하고 취소 요청 여부를 반환"""
+        self._execute(
+            "UPDATE jobs SET done = ?, total = ?, message = ?, heartbeat_ts = ? WHERE id = ?",
+            (done, total, message, time.time(), job_id))
+        rows, _ = self._fetch("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,))
+        return bool(rows and rows[0][0])
+
+    def add_part(self, job_id, df):
+        """부분 결과 DataFrame 추가"""
+        with self._lock:
+            seq = self._db.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM job_parts WHERE job_id = ?", (job_id,)).fetchone()[0]
+            self._db.execute(
+                "INSERT INTO job_parts (job_id, seq, rows, data) VALUES (?, ?, ?, ?)",
+                (job_id, seq, len(df), pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)))
+
+    def finish(self, job_id, status, message="", errors=()):
+        """작업을 끝난 상태로 바꾸고 params의 API 키를 지움 (이전 버전이 넣은 작업)"""
+        rows, _ = self._fetch("SELECT params FROM jobs WHERE id = ?", (job_id,))
+        params = {k: v for k, v in json.loads(rows[0][0]).items() if k not in CREDENTIAL_PARAMS} if rows else {}
+        self._execute(
+            "UPDATE jobs SET status = ?, message = COALESCE(NULLIF(?, ''), message), errors = ?, params = ?, "
+            "finished_ts = ? WHERE id = ?",
+            (status, message, json.dumps(list(errors), ensure_ascii=False),
+             json.dumps(params, ensure_ascii=False), time.time(), job_id))
+
+    def cancel(self, job_id):
+        """대기 중이면 바로 취소, 실행 중이면 작업자가 다음 단계에서 멈추도록 표시"""
+        self._execute(
+            "UPDATE jobs SET status = 'cancelled', finished_ts = ?, params = '{}' WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id))
+        self._execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+
+    def requeue_stale(self, stale_after=STALE_AFTER):
+        """heartbeat가 끊긴 running 작업을 대기열로 되돌리고 (부분 결과 삭제) 개수 반환"""
+        limit = time.time() - stale_after
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [row[0] for row in self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'running' AND heartbeat_ts < ?", (limit,))]
+                for job_id in ids:
+                    self._db.execute("DELETE FROM job_parts WHERE job_id = ?", (job_id,))
+                    # 죽기 전에 취소 요청을 받은 작업은 다시 돌리지 않음
+                    self._db.execute(
+                        "UPDATE jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END, "
+                        "worker = NULL, done = 0, message = '' WHERE id = ?", (job_id,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(ids)
+
+    def get(self, job_id):
+        """작업 하나의 상태 dict (없으면 None)"""
+        rows, columns = self._fetch("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(zip(columns, rows[0]))
+        job["params"] = json.loads(job["params"])
+        job["errors"] = json.loads(job["errors"])
+        (job["parts"], job["rows"]), = self._fetch(
+            "SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM job_parts WHERE job_id = ?", (job_id,))[0]
+        return job
+
+    def list_jobs(self, owner=None, limit=100):
+        """최근 작업 목록 DataFrame (id, kind, owner, status, done, total, message, rows, 시각)"""
+        sql = ("SELECT j.id, j.kind, j.owner, j.status, j.done, j.total, j.message, "
+               "(SELECT COALESCE(SUM(p.rows), 0) FROM job_parts p WHERE p.job_id = j.id) AS rows, "
+               "j.created_ts, j.started_ts, j.finished_ts FROM jobs j")
+        params = []
+        if owner:
+            sql += " WHERE j.owner = ?"
+            params.append(owner)
+        sql += " ORDER BY j.id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return pd.read_sql_query(sql, self._db, params=params)
+
+    def iter_parts(self, job_id, start=0):
+        """부분 결과 DataFrame을 순서대로 (start번째 묶음부터)"""
+        rows, _ = self._fetch(
+            "SELECT data FROM job_parts WHERE job_id = ? AND seq >= ? ORDER BY seq", (job_id, start))
+        for (data,) in rows:
+            yield pickle.loads(data)
+
+    def result(self, job_id):
+        """지금까지 쌓인 부분 결과를 합친 DataFrame (없으면 None)"""
+        frames = list(self.iter_parts(job_id))
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+    def delete(self, job_id):
+        """끝난 작업과 결과 삭제"""
+        placeholders = ",".join("?" * len(FINISHED))
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(f"DELETE FROM jobs WHERE id = ? AND status IN ({placeholders})",
+                                 (job_id, *FINISHED))
+                self._db.execute("DELETE FROM job_parts WHERE job_id = ? AND job_id NOT IN (SELECT id FROM jobs)",
+                                 (job_id,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        self._db.close()
+
+
+class JobContext:
+    """작업 함수에 넘기는 진행률/부분 결과 기록기"""
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+        self.errors = []
+
+    def progress(self, done, total, message=""):
+        """진행률 기록. 취소 요청이 있으면 JobCancelled"""
+        if self.queue.update_progress(self.job_id, done, total, message):
+            raise JobCancelled()
+
+    def emit(self, df):
+        if df is not None and not df.empty:
+            self.queue.add_part(self.job_id, df)
+
+
+def job_credentials(kind, params):
+    """작업에 쓸 자격증명 dict
+
+    params["credential"] 지문이 있으면 이 프로세스의 키 풀에서 같은 키를 찾고,
+    없으면 빈 값을 돌려줘 fetcher가 키 풀에서 고르게 합니다.
+    """
+    credential_kind = JOB_CREDENTIAL_KINDS[kind]
+    fingerprint = params.get("credential")
+    if not fingerprint:
+        return dict.fromkeys(KIND_FIELDS[credential_kind], "")
+    pool = get_pool(credential_kind)
+    credentials = pool.find(fingerprint) if pool is not None else None
+    if credentials is None:
+        raise ValueError("작업에 지정된 API 키가 작업자의 키 풀(credentials.json 또는 환경 변수)에 없습니다.")
+    return credentials
+
+
+def _run_keywords(params, ctx):
+    """시드 키워드 대량 분석 (KEYWORD_STEP개씩 나눠 조회, relKeyword 중복 제거)
+
+    숫자 변환(normalize_keyword_frame)도 작업자 프로세스에서 해서 저장합니다.
+    """
+    creds = job_credentials("keywords", params)
+    seeds = split_hint_keywords(params["seeds"])
+    seen = set()
+    total = len(chunk_keywords(seeds))
+    done = 0
+    ctx.progress(0, total, "대기")
+    for i in range(0, len(seeds), KEYWORD_STEP):
+        step = seeds[i:i + KEYWORD_STEP]
+        df, errors = get_keyword_results_bulk(step, creds["api_key"], creds["secret_key"], creds["customer_id"])
+        ctx.errors.extend(errors)
+        if df is not None and 'relKeyword' in df.columns:
+            df = df[~df['relKeyword'].isin(seen)]
+            seen.update(df['relKeyword'])
+            ctx.emit(normalize_keyword_frame(df))
+        done += len(chunk_keywords(step))
+        ctx.progress(done, total, f"연관 키워드 {len(seen):,}개")
+
+
+def _run_shop_rank(params, ctx):
+    """쇼핑 순위 추적 (대상 RANK_STEP개씩)"""
+    creds = job_credentials("shop_rank", params)
+    targets = params["targets"]
+    ctx.progress(0, len(targets), "대기")
+    for i in range(0, len(targets), RANK_STEP):
+        step = targets[i:i + RANK_STEP]
+        df = track_ranks(step, creds["client_id"], creds["client_secret"], concurrency=params.get("concurrency", 8))
+        ctx.errors.extend(f"[{k}] {e}" for k, e in zip(df["keyword"], df["error"]) if pd.notna(e) and e)
+        ctx.emit(df)
+        ctx.progress(i + len(step), len(targets), f"대상 {i + len(step):,}개 조회")
+
+
+def _run_trend(params, ctx):
+    """검색어 트렌드 (그룹 전체를 같은 척도로 맞추므로 결과는 끝에 한 번에 기록)"""
+    creds = job_credentials("trend", params)
+    groups = params["groups"]
+    ctx.progress(0, 1, f"그룹 {len(groups):,}개 조회 중")
+    df, errors = get_trend_frame(creds["client_id"], creds["client_secret"],
+                                 params["start_date"], params["end_date"], params.get("time_unit", "month"),
+                                 groups, params.get("device", ""), params.get("ages"), params.get("gender", ""),
+                                 anchor=params.get("anchor"))
+    ctx.errors.extend(errors)
+    ctx.emit(df)
+    ctx.progress(1, 1, f"그룹 {len(groups):,}개")
+
+
+# 작업 종류 -> 실행 함수 fn(params, ctx)
+JOB_KINDS = {
+    "keywords": _run_keywords,
+    "shop_rank": _run_shop_rank,
+    "trend": _run_trend,
+}
+
+JOB_KIND_LABELS = {
+    "keywords": "키워드 대량 분석",
+    "shop_rank": "쇼핑 순위 추적",
+    "trend": "검색어 트렌드",
+}
+
+
+def run_job(queue, job):
+    """가져온 작업 하나를 실행하고 결과 상태를 기록"""
+    ctx = JobContext(queue, job["id"])
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            queue.heartbeat(job["id"])
+
+    beater = threading.Thread(target=beat, name=f"job-{job['id']}-heartbeat", daemon=True)
+    beater.start()
+    try:
+        JOB_KINDS[job["kind"]](job["params"], ctx)
+        status, message = "done", ""
+    except JobCancelled:
+        status, message = "cancelled", "사용자 취소"
+    except Exception as e:
+        status, message = "failed", f"{type(e).__name__}: {e}"
+    finally:
+        stop.set()
+    queue.finish(job["id"], status, message, ctx.errors)
+    return status
+
+
+def worker_loop(path=DEFAULT_JOBS_PATH, name=None, poll_interval=DEFAULT_POLL_INTERVAL, stop_event=None):
+    """대기열에서 작업을 꺼내 실행하는 루프 (stop_event가 설정될 때까지)"""
+    name = name or f"pid-{os.getpid()}"
+    queue = JobQueue(path)
+    try:
+        while stop_event is None or not stop_event.is_set():
+            queue.requeue_stale()
+            job = queue.claim(name)
+            if job is None:
+                if stop_event is not None:
+                    stop_event.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+                continue
+            run_job(queue, job)
+    finally:
+        queue.close()
+
+
+def configure_shared_limits(path=DEFAULT_JOBS_PATH, share=1):
+    """이 프로세스의 속도 제한을 같은 키를 쓰는 다른 프로세스들과 나눠 쓰도록 설정
+
+    초당 요청 수는 프로세스마다 따로 세므로 share(UI 프로세스를 포함한 프로세스
+    수)로 나누고, 일일 한도는 작업 큐 DB에서 함께 세어 모든 프로세스가 한
+    예산에서 씁니다.
+    """
+    return configure_scheduler(limits={endpoint: (qps / max(1, share), daily)
+                                       for endpoint, (qps, daily) in ENDPOINT_LIMITS.items()},
+                               quota_path=path)
+
+
+def serve_worker(path=DEFAULT_JOBS_PATH, share=1, poll_interval=DEFAULT_POLL_INTERVAL, watch_stdin=False):
+    """작업자 하나를 이 프로세스에서 실행
+
+    속도 제한은 configure_shared_limits(path, share)로 나눠 씁니다.
+    watch_stdin이면 표준 입력이 닫힐 때 (부모 프로세스 종료 포함) 지금 작업을
+    마치고 끝납니다.
+    """
+    configure_shared_limits(path, share)
+    stop = threading.Event()
+    if watch_stdin:
+        def wait_stdin():
+            sys.stdin.read()
+            stop.set()
+        threading.Thread(target=wait_stdin, name="job-worker-stdin", daemon=True).start()
+    try:
+        worker_loop(path, poll_interval=poll_interval, stop_event=stop)
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerPool:
+    """작업자 프로세스 묶음
+
+    multiprocessing 대신 이 파일을 'worker' 명령으로 실행합니다. Streamlit은
+    앱 스크립트를 __main__으로 실행하므로 spawn 방식이면 자식 프로세스가 앱
+    스크립트를 다시 실행하게 되기 때문입니다. 자식은 표준 입력 파이프가 닫히면
+    (stop() 또는 서버 종료) 실행 중인 작업을 마치고 끝납니다.
+
+    share는 속도 제한을 나눠 쓸 프로세스 수입니다 (기본: 작업자 수). 같은 키로
+    API를 부르는 Streamlit 프로세스가 있으면 processes + 1을 넘깁니다.
+    """
+
+    def __init__(self, path=DEFAULT_JOBS_PATH, processes=DEFAULT_PROCESSES, poll_interval=DEFAULT_POLL_INTERVAL,
+                 share=None):
+        self.path = path
+        self.processes = max(1, processes)
+        self.share = max(self.processes, share or 0)
+        self.poll_interval = poll_interval
+        self._workers = []
+
+    def start(self):
+        self._workers = [p for p in self._workers if p.poll() is None]
+        script = os.path.abspath(__file__)
+        while len(self._workers) < self.processes:
+            self._workers.append(subprocess.Popen(
+                [sys.executable, script, "--db", os.path.abspath(self.path), "worker", "--processes", "1",
+                 "--share", str(self.share), "--poll", str(self.poll_interval), "--watch-stdin"],
+                stdin=subprocess.PIPE, cwd=os.path.dirname(script)))
+        return self
+
+    def alive(self):
+        return sum(p.poll() is None for p in self._workers)
+
+    def stop(self, timeout=10):
+        """새 작업을 꺼내지 않도록 알리고 종료를 기다림 (실행 중인 작업은 끝까지)"""
+        for process in self._workers:
+            if process.stdin and not process.stdin.closed:
+                process.stdin.close()
+        for process in self._workers:
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 작업 큐")
+    parser.add_argument("--db", default=DEFAULT_JOBS_PATH, help="작업 큐 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    worker = sub.add_parser("worker", help="작업자 프로세스 실행")
+    worker.add_argument("--processes", type=int, default=DEFAULT_PROCESSES, help="작업자 프로세스 수")
+    worker.add_argument("--share", type=int, help="속도 제한을 나눠 쓸 프로세스 수 (기본: --processes)")
+    worker.add_argument("--poll", type=float, default=DEFAULT_POLL_INTERVAL, help="대기열 확인 간격(초)")
+    worker.add_argument("--watch-stdin", action="store_true", help=argparse.SUPPRESS)
+    submit = sub.add_parser("submit", help="작업 넣기 (API 키는 작업자가 자기 키 풀에서 고름)")
+    submit.add_argument("kind", choices=list(JOB_KINDS))
+    submit.add_argument("input", help="keywords: 시드 파일, shop_rank: '키워드 | 상품ID 또는 쇼핑몰' 파일, "
+                                      "trend: '그룹명: 키워드, 키워드' 파일")
+    submit.add_argument("--owner", default=os.getenv("USER", ""))
+    submit.add_argument("--start", help="trend: 시작일 (YYYY-MM-DD)")
+    submit.add_argument("--end", help="trend: 종료일 (YYYY-MM-DD)")
+    submit.add_argument("--time-unit", default="month", choices=["date", "week", "month"])
+    sub.add_parser("list", help="작업 목록")
+    cancel = sub.add_parser("cancel", help="작업 취소")
+    cancel.add_argument("job_id", type=int)
+    result = sub.add_parser("result", help="작업 결과 저장")
+    result.add_argument("job_id", type=int)
+    result.add_argument("-o", "--output", required=True, help="결과 파일 (.csv, .jsonl, .parquet)")
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        if args.processes <= 1:
+            serve_worker(args.db, args.share or 1, args.poll, args.watch_stdin)
+            return 0
+        pool = WorkerPool(args.db, args.processes, args.poll, args.share).start()
+        print(f"[INFO] 작업자 {args.processes}개 시작: {args.db}")
+        try:
+            while pool.alive():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pool.stop()
+        return 0
+
+    queue = JobQueue(args.db)
+    if args.command == "submit":
+        with open(args.input, encoding="utf-8-sig") as f:
+            text = f.read()
+        params = {}
+        if args.kind == "keywords":
+            params["seeds"] = split_hint_keywords(text)
+        elif args.kind == "shop_rank":
+            params["targets"] = parse_rank_targets(text)
+        else:
+            if not args.start or not args.end:
+                print("⚠️  trend 작업은 --start, --end가 필요합니다.", file=sys.stderr)
+                return 1
+            params.update(groups=parse_keyword_groups(text), start_date=args.start, end_date=args.end,
+                          time_unit=args.time_unit)
+        print(f"✅ 작업 {queue.submit(args.kind, params, args.owner)} 등록")
+    elif args.command == "list":
+        print(queue.list_jobs().to_string(index=False))
+    elif args.command == "cancel":
+        queue.cancel(args.job_id)
+        print(f"작업 {args.job_id} 취소 요청")
+    else:
+        with ResultWriter(args.output) as writer:
+            for df in queue.iter_parts(args.job_id):
+                writer.write(df)
+        print(f"✅ {writer.rows}행 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
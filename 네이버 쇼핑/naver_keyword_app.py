@@ -1,18 +1,30 @@
 import os
-import urllib.request
-import urllib.parse
-import urllib.error
 import json
 import pandas as pd
-import matplotlib.pyplot as plt
 import time
-import requests
-import hashlib
-import hmac
-import base64
 import streamlit as st
-import io
 import traceback
+import uuid
+
+from naver_api import search_naver_shopping, get_blog_results
+from naver_cache import get_cache
+from naver_charts import volume_chart_spec, volume_chart_png, price_histogram_spec, mall_counts_spec
+from naver_opportunity import OPPORTUNITY_COLUMNS, score_keywords
+from naver_bulk import get_keyword_results_bulk, split_hint_keywords
+from naver_expand import KeywordExpander, default_checkpoint_path
+from naver_canon import get_canonicalizer
+from naver_flight import get_flight, set_session
+from naver_history import RankHistoryStore
+from naver_price import PriceSnapshotStore, CHANGE_COLUMNS, CHANGE_KINDS
+from naver_jobs import JobQueue, WorkerPool, JOB_KIND_LABELS, JOB_CREDENTIAL_KINDS, FINISHED, DEFAULT_PROCESSES, \
+    configure_shared_limits
+from naver_log import RingLogSink, LEVELS as LOG_LEVELS
+from naver_metrics import get_metrics, mask_credential, quota_gauges
+from naver_pool import credential_fingerprint, get_pool
+from naver_ratelimit import get_scheduler
+from naver_rank import parse_rank_targets, track_ranks, parse_blog_keywords, track_blog_ranks
+from naver_trend import parse_keyword_groups, get_trend_frame
+from naver_views import store_result, get_result, keyword_view, shopping_view, price_stats, export_buttons
 
 # 페이지 설정 (반드시 첫 번째 Streamlit 명령이어야 함)
 try:
@@ -25,6 +37,28 @@ except Exception:
     # 이미 설정된 경우 무시
     pass
 
+# 세션 id: 같은 요청을 동시에 보낸 세션끼리 응답을 나눠 받고 (naver_flight),
+# 속도 제한 토큰은 세션별로 돌아가며 받음 (naver_ratelimit)
+if 'session_id' not in st.session_state:
+    st.session_state['session_id'] = uuid.uuid4().hex[:12]
+set_session(st.session_state['session_id'])
+
+
+@st.cache_resource
+def get_worker_pool():
+    """서버 프로세스당 한 번만 작업자 시작 (NAVER_JOB_WORKERS=0이면 외부 'naver_jobs.py worker' 사용)
+
+    이 프로세스도 같은 키로 API를 부르므로 초당 요청 수는 작업자 수 + 1로 나누고,
+    일일 한도는 작업 큐 DB에서 작업자들과 함께 셉니다.
+    """
+    processes = int(os.getenv("NAVER_JOB_WORKERS", str(DEFAULT_PROCESSES)))
+    configure_shared_limits(share=max(0, processes) + 1)
+    return WorkerPool(processes=processes, share=processes + 1).start() if processes > 0 else None
+
+
+# API를 부르기 전에 속도 제한 설정이 적용되도록 맨 앞에서 시작
+get_worker_pool()
+
 # API 키 설정 (사이드바에서 직접 입력)
 st.sidebar.header("🔐 API 설정")
 st.sidebar.caption("💡 API 키를 사이드바에 직접 입력해주세요")
@@ -64,168 +98,49 @@ SECRET_KEY = st.sidebar.text_input(
     help="네이버 검색광고 API Secret Key를 입력하세요"
 ).strip()
 
+# API 키 풀 (credentials.json / 환경 변수). 사이드바 키를 비워 두면 풀에서 키를 골라 호출
+openapi_pool = get_pool("openapi")
+searchad_pool = get_pool("searchad")
+OPENAPI_READY = bool(NAVER_CLIENT_ID and NAVER_CLIENT_SECRET) or openapi_pool is not None
+SEARCHAD_READY = bool(API_KEY and SECRET_KEY and CUSTOMER_ID) or searchad_pool is not None
+if openapi_pool is not None or searchad_pool is not None:
+    with st.sidebar.expander("🔑 API 키 풀"):
+        st.caption(
+            f"검색 API {len(openapi_pool or [])}개 · 검색광고 API {len(searchad_pool or [])}개. "
+            "위 입력란을 비워 두면 남은 한도와 응답 속도에 따라 키를 나눠 씁니다."
+        )
+        pool_rows = [row for pool in (openapi_pool, searchad_pool) if pool is not None for row in pool.usage()]
+        st.dataframe(pd.DataFrame(pool_rows).rename(columns={
+            'kind': '종류',
+            'key': '키',
+            'status': '상태',
+            'requests': '요청',
+            'errors': '오류',
+            'inflight': '진행 중',
+            'latency_ms': '지연(ms)',
+            'used_today': '오늘 사용',
+            'remaining_today': '오늘 남음',
+            'last_error': '마지막 오류'
+        }), use_container_width=True, hide_index=True)
+        if st.button("제외된 키 복귀", key="reinstate_keys"):
+            for pool in (openapi_pool, searchad_pool):
+                if pool is not None:
+                    pool.reinstate()
+
+# 응답 캐시 (같은 파라미터의 반복 호출은 API 할당량을 쓰지 않음)
+with st.sidebar.expander("🗄️ 응답 캐시"):
+    response_cache = get_cache()
+    if response_cache is not None:
+        cache_stats = response_cache.summary()
+        st.caption(
+            f"히트 {cache_stats['memory_hits'] + cache_stats['disk_hits']}회 "
+            f"(메모리 {cache_stats['memory_hits']} / 디스크 {cache_stats['disk_hits']}) · "
+            f"미스 {cache_stats['misses']}회 · 적중률 {cache_stats['hit_rate']:.0%}"
+        )
+        if st.button("캐시 비우기", key="clear_cache"):
+            response_cache.clear()
 
 
-# 네이버 검색광고 API 서명 생성 클래스 (동일)
-class Signature:
-    @staticmethod
-    def generate(timestamp, method, uri, secret_key):
-        """네이버 검색광고 API 서명 생성"""
-        message = "{}.{}.{}".format(timestamp, method, uri)
-        hash_obj = hmac.new(bytes(secret_key, "utf-8"), bytes(message, "utf-8"), hashlib.sha256)
-        return base64.b64encode(hash_obj.digest())
-
-
-
-# API 요청 헤더 생성 함수 (동일)
-def get_header(method, uri, api_key, secret_key, customer_id):
-    timestamp = str(round(time.time() * 1000))
-    signature = Signature.generate(timestamp, method, uri, secret_key)
-    # signature는 bytes이므로 문자열로 변환
-    signature_str = signature.decode('utf-8') if isinstance(signature, bytes) else signature
-    return {
-        'Content-Type': 'application/json; charset=UTF-8',
-        'X-Timestamp': timestamp,
-        'X-API-KEY': api_key,
-        'X-Customer': str(customer_id),
-        'X-Signature': signature_str
-    }
-
-
-
-# 연관검색어(키워드) 분석 함수 (최신 예제 적용)
-def get_keyword_results(hint_keywords, api_key, secret_key, customer_id):
-    BASE_URL = 'https://api.naver.com'
-    uri = '/keywordstool'
-    method = 'GET'
-    params = {}
-    params['hintKeywords'] = hint_keywords
-    params['showDetail'] = '1'
-    try:
-        r = requests.get(BASE_URL + uri, params=params,
-                         headers=get_header(method, uri, api_key, secret_key, customer_id),
-                         timeout=30)
-        if r.status_code == 200:
-            response_json = r.json()
-            if 'keywordList' in response_json:
-                return pd.DataFrame(response_json['keywordList']), None
-            else:
-                return None, f"응답에 'keywordList' 키가 없습니다. 응답: {response_json}"
-        else:
-            return None, f"API 오류: {r.status_code} - {r.text}"
-    except requests.exceptions.Timeout:
-        return None, "요청 시간 초과: API 응답이 너무 오래 걸렸습니다."
-    except requests.exceptions.RequestException as e:
-        return None, f"요청 실패: {str(e)}"
-    except json.JSONDecodeError as e:
-        return None, f"JSON 파싱 오류: {str(e)}"
-    except Exception as e:
-        return None, f"예상치 못한 오류: {str(e)}"
-
-
-def search_naver_shopping(query, client_id, client_secret, display=100):
-    """네이버 쇼핑 검색 API 호출"""
-    try:
-        encText = urllib.parse.quote(query)
-        url = f"https://openapi.naver.com/v1/search/shop.json?query={encText}&display={display}"
-        
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", client_id)
-        request.add_header("X-Naver-Client-Secret", client_secret)
-        
-        response = urllib.request.urlopen(request)
-        rescode = response.getcode()
-        
-        if rescode == 200:
-            response_body = response.read()
-            result = json.loads(response_body.decode('utf-8'))
-            return result, None
-        else:
-            error_body = response.read().decode('utf-8')
-            return None, f"API 오류: {rescode} - {error_body}"
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8') if hasattr(e, 'read') else str(e.reason)
-        return None, f"HTTP 오류: {e.code} - {error_body}"
-    except urllib.error.URLError as e:
-        return None, f"URL 오류: {str(e)}"
-    except json.JSONDecodeError as e:
-        return None, f"JSON 파싱 오류: {str(e)}"
-    except Exception as e:
-        return None, f"검색 오류: {str(e)}"
-
-
-def get_blog_results(client_id, client_secret, query, display=10, start=1, sort='sim'):
-    """네이버 블로그 검색 API 호출"""
-    try:
-        encText = urllib.parse.quote(query)
-        url = "https://openapi.naver.com/v1/search/blog?query=" + encText + \
-            "&display=" + str(display) + "&start=" + str(start) + "&sort=" + sort
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", client_id)
-        request.add_header("X-Naver-Client-Secret", client_secret)
-        response = urllib.request.urlopen(request)
-        rescode = response.getcode()
-        if rescode == 200:
-            response_body = response.read()
-            response_json = json.loads(response_body.decode('utf-8'))
-            if 'items' in response_json:
-                return pd.DataFrame(response_json['items']), None
-            else:
-                return None, "응답에 'items' 키가 없습니다."
-        else:
-            try:
-                error_body = response.read().decode('utf-8')
-                return None, f"API 오류: {rescode} - {error_body}"
-            except:
-                return None, f"API 오류: {rescode}"
-    except urllib.error.HTTPError as e:
-        return None, f"HTTP 오류: {e.code} - {e.reason}"
-    except urllib.error.URLError as e:
-        return None, f"URL 오류: {str(e)}"
-    except json.JSONDecodeError as e:
-        return None, f"JSON 파싱 오류: {str(e)}"
-    except Exception as e:
-        return None, f"예상치 못한 오류: {str(e)}"
-
-
-def get_naver_trend(client_id, client_secret, start_date, end_date, time_unit, group1, keywords1, group2, keywords2, device, ages, gender):
-    """네이버 DataLab 검색 트렌드 API 호출"""
-    url = "https://openapi.naver.com/v1/datalab/search"
-    body = {
-        "startDate": str(start_date),
-        "endDate": str(end_date),
-        "timeUnit": time_unit,
-        "keywordGroups": [
-            {"groupName": group1, "keywords": [k.strip() for k in keywords1.split(",") if k.strip()]},
-            {"groupName": group2, "keywords": [k.strip() for k in keywords2.split(",") if k.strip()]}
-        ],
-        "device": device,
-        "ages": ages,
-        "gender": gender
-    }
-    request = urllib.request.Request(url)
-    request.add_header("X-Naver-Client-Id", client_id)
-    request.add_header("X-Naver-Client-Secret", client_secret)
-    request.add_header("Content-Type", "application/json")
-    try:
-        response = urllib.request.urlopen(request, data=json.dumps(body).encode("utf-8"))
-        rescode = response.getcode()
-        if rescode == 200:
-            response_body = response.read()
-            return json.loads(response_body.decode("utf-8"))
-        else:
-            error_body = response.read().decode("utf-8")
-            return {"error": f"Error Code: {rescode}", "details": error_body}
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8") if hasattr(e, 'read') else str(e.reason)
-        return {"error": f"HTTP 오류: {e.code}", "details": error_body}
-    except urllib.error.URLError as e:
-        return {"error": f"URL 오류: {str(e)}"}
-    except json.JSONDecodeError as e:
-        return {"error": f"JSON 파싱 오류: {str(e)}"}
-    except Exception as e:
-        return {"error": f"예상치 못한 오류: {str(e)}"}
-
 
 # 메인 타이틀
 st.title("🔍 네이버 키워드 분석 도구")
@@ -233,18 +148,28 @@ st.markdown("---")
 
 
 
-# 로그 출력을 위한 StringIO 객체 (전역)
-if 'log_stream' not in st.session_state:
-    st.session_state['log_stream'] = io.StringIO()
-log_stream = st.session_state['log_stream']
+# 로그 버퍼 (세션별, 최근 LOG_CAPACITY개만 유지. NAVER_LOG_FILE 지정 시 회전 파일에도 기록)
+LOG_CAPACITY = int(os.getenv("NAVER_LOG_CAPACITY", "2000"))
+if 'log_sink' not in st.session_state:
+    st.session_state['log_sink'] = RingLogSink(LOG_CAPACITY, file_path=os.getenv("NAVER_LOG_FILE"))
+log_sink = st.session_state['log_sink']
+
+
+def log_print(level, message, **fields):
+    """콘솔과 로그 버퍼에 구조화 레코드 기록 (fields: endpoint, latency_ms, status 등)"""
+    print(f"[{level}] {message}")
+    log_sink.log(level, message, **fields)
 
 
 # 탭 생성 (네이버 블로그 순위 추가)
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab6, tab8, tab7, tab5 = st.tabs([
     "📊 키워드 분석 (검색광고 API)",
     "🛒 쇼핑 검색 (검색 API)",
     "🔎 통합검색 트렌드",
     "🏆 블로그 순위",
+    "📈 순위 이력",
+    "🗂️ 작업 큐",
+    "📊 성능 지표",
     "📝 로그(콘솔)"
 ])
 # 탭 4: 네이버 블로그 순위
@@ -259,46 +184,76 @@ with tab4:
 
     if search_btn and blog_query:
         # API 키 검증
-        if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        blog_key = (blog_query, display_count, sort_type)
+        if not OPENAPI_READY:
             st.error("⚠️ 네이버 검색 API 키를 모두 입력해주세요.")
-        else:
+        elif get_result(st.session_state, "blog", blog_key) is None:
             with st.spinner("블로그 검색 중..."):
                 try:
+                    started = time.perf_counter()
                     df_blog, error = get_blog_results(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, blog_query, display_count, 1, sort_type)
+                    latency_ms = (time.perf_counter() - started) * 1000
                     if error:
+                        log_print("ERROR", error, endpoint="blog", latency_ms=latency_ms, query=blog_query)
                         st.error(error)
-                    elif df_blog is not None and not df_blog.empty:
-                        st.success(f"{len(df_blog)}개의 블로그 글을 찾았습니다!")
-                        st.dataframe(df_blog, use_container_width=True, height=400)
                     else:
-                        st.warning("검색 결과가 없습니다.")
+                        log_print("INFO", f"블로그 검색: query={blog_query}, items={len(df_blog)}",
+                                  endpoint="blog", latency_ms=latency_ms, status=200)
+                        store_result(st.session_state, "blog", blog_key, df_blog, endpoint="blog")
                 except Exception as e:
                     st.error(f"API 호출 오류: {e}")
 
+    # 마지막 조회 결과는 세션에 남아 있어 위젯을 바꿔도 다시 호출하지 않음
+    blog_entry = get_result(st.session_state, "blog")
+    if blog_entry is not None:
+        df_blog = blog_entry["value"]
+        if df_blog is not None and not df_blog.empty:
+            st.success(f"'{blog_entry['query'][0]}' {len(df_blog)}개의 블로그 글을 찾았습니다!")
+            st.dataframe(df_blog, use_container_width=True, height=400)
+        else:
+            st.warning("검색 결과가 없습니다.")
+
+    # 여러 키워드 x 대상 블로그 순위 행렬 (1~1000위)
+    st.markdown("---")
+    st.subheader("🎯 블로그 순위 추적 (여러 키워드)")
+    st.caption("키워드마다 대상 블로그가 처음 나오는 순위를 최대 1000위까지 찾습니다. "
+               "모든 대상을 찾은 키워드는 더 이상 페이지를 요청하지 않습니다.")
+    col1, col2 = st.columns(2)
+    blog_rank_keywords = col1.text_area("검색 키워드 (한 줄에 하나)", placeholder="아이스크림\n수제 아이스크림", height=150)
+    blog_rank_targets = col2.text_area("대상 블로그 URL 또는 bloggerlink (한 줄에 하나)",
+                                       placeholder="blog.naver.com/myblog", height=150)
+    blog_rank_concurrency = st.slider("동시 요청 수", min_value=1, max_value=20, value=8, key="blog_rank_concurrency")
+    blog_rank_btn = st.button("🎯 블로그 순위 조회", key="blog_rank_track")
+
+    if blog_rank_btn:
+        rank_keywords = parse_blog_keywords(blog_rank_keywords)
+        rank_targets = [t.strip() for t in blog_rank_targets.splitlines() if t.strip()]
+        blog_rank_key = (tuple(rank_keywords), tuple(rank_targets), sort_type)
+        if not OPENAPI_READY:
+            st.error("⚠️ 네이버 검색 API 키를 모두 입력해주세요.")
+        elif not rank_keywords or not rank_targets:
+            st.warning("키워드와 대상 블로그를 한 개 이상 입력해주세요.")
+        elif get_result(st.session_state, "blog_rank", blog_rank_key) is None:
+            with st.spinner(f"블로그 순위 조회 중... (키워드 {len(rank_keywords)}개, 대상 {len(rank_targets)}개)"):
+                started = time.perf_counter()
+                df_blog_rank = track_blog_ranks(rank_keywords, rank_targets, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET,
+                                                concurrency=blog_rank_concurrency, sort=sort_type)
+                latency_ms = (time.perf_counter() - started) * 1000
+            failed = df_blog_rank['error'].notna().sum()
+            log_print("INFO", f"블로그 순위 추적: keywords={len(rank_keywords)}, targets={len(rank_targets)}, "
+                              f"errors={failed}", endpoint="blog", latency_ms=latency_ms)
+            store_result(st.session_state, "blog_rank", blog_rank_key, df_blog_rank, endpoint="blog")
+
+    blog_rank_entry = get_result(st.session_state, "blog_rank")
+    if blog_rank_entry is not None:
+        df_blog_rank = blog_rank_entry["value"]
+        rank_columns = [c for c in df_blog_rank.columns if c not in ('keyword', 'error')]
+        found = df_blog_rank[rank_columns].notna().any(axis=1).sum()
+        st.success(f"✅ 키워드 {len(df_blog_rank)}개 중 {found}개에서 대상 블로그를 찾았습니다.")
+        df_blog_rank = df_blog_rank.rename(columns={'keyword': '키워드', 'error': '오류'})
+        st.dataframe(df_blog_rank, use_container_width=True)
+        export_buttons(df_blog_rank, "blog_rank", "blog_rank_export")
 
-def log_print(*args, **kwargs):
-    print(*args, **kwargs)
-    print(*args, **kwargs, file=log_stream)
-
-
-def setup_korean_font():
-    """플랫폼별 한글 폰트 설정"""
-    import platform
-    system = platform.system()
-    
-    if system == 'Windows':
-        plt.rcParams['font.family'] = 'Malgun Gothic'
-    elif system == 'Darwin':  # macOS
-        plt.rcParams['font.family'] = 'AppleGothic'
-    else:  # Linux
-        # Linux에서는 나눔고딕 또는 기본 폰트 사용
-        try:
-            plt.rcParams['font.family'] = 'NanumGothic'
-        except (KeyError, ValueError, OSError):
-            # 폰트를 찾을 수 없는 경우 기본 폰트 사용
-            plt.rcParams['font.family'] = 'DejaVu Sans'
-    
-    plt.rcParams['axes.unicode_minus'] = False
 
 # 탭 1: 키워드 분석
 with tab1:
@@ -307,7 +262,7 @@ with tab1:
     
     # 키워드 입력
     keyword_input = st.text_input(
-        "분석할 키워드를 입력하세요 (여러 개는 쉼표로 구분)",
+        "분석할 키워드를 입력하세요 (여러 개는 쉼표로 구분, 5개 초과 시 자동 분할 조회)",
         placeholder="예: 노트북, 맥북, 갤럭시북"
     )
     
@@ -317,96 +272,171 @@ with tab1:
     
     if analyze_btn and keyword_input:
         # API 키 검증
-        if not API_KEY or not SECRET_KEY or not CUSTOMER_ID:
+        keyword_key = tuple(split_hint_keywords(keyword_input))
+        if not SEARCHAD_READY:
+            st.error("⚠️ 네이버 검색광고 API 키를 모두 입력해주세요.")
+        elif get_result(st.session_state, "keyword", keyword_key) is None:
+            with st.spinner(f"키워드 분석 중... (시드 {len(keyword_key)}개)"):
+                started = time.perf_counter()
+                df, errors = get_keyword_results_bulk(keyword_input, API_KEY, SECRET_KEY, CUSTOMER_ID)
+                latency_ms = (time.perf_counter() - started) * 1000
+                for keyword_error in errors:
+                    log_print("ERROR", keyword_error, endpoint="keywordstool")
+                log_print("INFO", f"키워드 분석: seeds={len(keyword_key)}, "
+                                  f"rows={0 if df is None else len(df)}, errors={len(errors)}",
+                          endpoint="keywordstool", latency_ms=latency_ms)
+            if errors and (df is None or df.empty):
+                st.error("\n".join(errors))
+            else:
+                store_result(st.session_state, "keyword", keyword_key, (df, errors), endpoint="keywordstool")
+
+    # 마지막 조회 결과 표시 (파생 표/CSV는 결과별로 한 번만 계산)
+    keyword_entry = get_result(st.session_state, "keyword")
+    if keyword_entry is not None:
+        df, errors = keyword_entry["value"]
+        if errors:
+            st.warning("일부 키워드 묶음 조회 실패:\n" + "\n".join(errors))
+        if df is not None and not df.empty:
+            st.success(f"✅ {len(df)}개의 관련 키워드를 찾았습니다!")
+
+            # '< 10' 같은 값을 숫자로 변환, 한글 컬럼, 총 검색수 기준 정렬
+            df_display = keyword_view(keyword_entry["id"], df)
+
+            # 데이터 테이블 표시
+            st.dataframe(df_display, use_container_width=True, height=400)
+
+            # 시각화
+            st.subheader("📈 검색량 시각화")
+
+            # 상위 20개만 시각화 (미리 집계한 데이터로 만든 Vega-Lite 차트)
+            st.vega_lite_chart(volume_chart_spec(keyword_entry["id"], df_display), use_container_width=True)
+
+            # 내보내기 (CSV/Parquet/JSONL)
+            # 파일명에서 특수문자 제거
+            safe_filename = "_".join(keyword_entry["query"])
+            safe_filename = "".join(c for c in safe_filename if c.isalnum() or c in ('-', '_'))[:50]  # 길이 제한
+            export_buttons(df_display, f"keyword_analysis_{safe_filename}", "keyword_export")
+            # PNG는 요청할 때만 렌더링 (결과별로 캐시)
+            if st.checkbox("차트 이미지(PNG) 만들기", key="keyword_chart_png"):
+                st.download_button(
+                    label="🖼️ PNG 다운로드",
+                    data=volume_chart_png(keyword_entry["id"], df_display),
+                    file_name=f"keyword_analysis_{safe_filename}.png",
+                    mime="image/png"
+                )
+        else:
+            st.warning("검색 결과가 없습니다. 다른 키워드를 시도해보세요.")
+
+    # 연관 키워드 확장 (체크포인트 덕분에 다시 누르면 이어서 확장)
+    st.markdown("---")
+    st.subheader("🌱 연관 키워드 확장")
+    st.caption("위 입력의 키워드를 시드로 연관 키워드를 단계별로 다시 조회합니다. "
+               "같은 단계에서는 총 검색수가 큰 키워드부터 확장하며, 이미 조회한 키워드는 다시 요청하지 않습니다.")
+    col1, col2, col3, col4 = st.columns(4)
+    expand_depth = col1.number_input("확장 단계", min_value=1, max_value=5, value=2)
+    expand_max_keywords = col2.number_input("최대 키워드 수", min_value=100, max_value=100000, value=5000, step=100)
+    expand_min_volume = col3.number_input("확장할 최소 총 검색수", min_value=0, value=100, step=100)
+    expand_requests = col4.number_input("이번 실행 최대 요청 수", min_value=1, max_value=1000, value=50)
+    expand_btn = st.button("🌱 확장 실행 / 이어서 확장", key="expand")
+
+    if expand_btn and keyword_input:
+        expand_key = (tuple(split_hint_keywords(keyword_input)), int(expand_depth),
+                      int(expand_max_keywords), int(expand_min_volume))
+        if not SEARCHAD_READY:
             st.error("⚠️ 네이버 검색광고 API 키를 모두 입력해주세요.")
         else:
-            with st.spinner("키워드 분석 중..."):
-                df, error = get_keyword_results(keyword_input, API_KEY, SECRET_KEY, CUSTOMER_ID)
-                
-                if error:
-                    st.error(error)
-                elif df is not None and not df.empty:
-                    st.success(f"✅ {len(df)}개의 관련 키워드를 찾았습니다!")
-                
-                # 데이터프레임 컬럼명 한글화
-                column_mapping = {
-                    'relKeyword': '연관 키워드',
-                    'monthlyPcQcCnt': '월간 PC 검색수',
-                    'monthlyMobileQcCnt': '월간 모바일 검색수',
-                    'monthlyAvePcClkCnt': '월평균 PC 클릭수',
-                    'monthlyAveMobileClkCnt': '월평균 모바일 클릭수',
-                    'monthlyAvePcCtr': '월평균 PC 클릭률',
-                    'monthlyAveMobileCtr': '월평균 모바일 클릭률',
-                    'plAvgDepth': '월평균 노출 광고수',
-                    'compIdx': '경쟁정도'
-                }
-                    
-                    df_display = df.rename(columns=column_mapping)
-                    
-                    # 검색수 합계 컬럼 추가
-                    if '월간 PC 검색수' in df_display.columns and '월간 모바일 검색수' in df_display.columns:
-                        # '<10' 같은 값을 숫자로 변환
-                        def convert_to_numeric(val):
-                            if isinstance(val, str):
-                                if val == '< 10' or val == '<10':
-                                    return 5
-                                try:
-                                    return int(val.replace(',', ''))
-                                except (ValueError, AttributeError):
-                                    return 0
-                            return val if isinstance(val, (int, float)) else 0
-                        
-                        df_display['월간 PC 검색수_num'] = df_display['월간 PC 검색수'].apply(convert_to_numeric)
-                        df_display['월간 모바일 검색수_num'] = df_display['월간 모바일 검색수'].apply(convert_to_numeric)
-                        df_display['총 검색수'] = df_display['월간 PC 검색수_num'] + df_display['월간 모바일 검색수_num']
-                        
-                        # 정렬
-                        df_display = df_display.sort_values('총 검색수', ascending=False)
-                    
-                    # 데이터 테이블 표시
-                    st.dataframe(df_display, use_container_width=True, height=400)
-                    
-                    # 시각화
-                    st.subheader("📈 검색량 시각화")
-                    
-                    # 상위 20개만 시각화
-                    top_df = df_display.head(20)
-                    
-                    fig, ax = plt.subplots(figsize=(12, 6))
-                    
-                    # 한글 폰트 설정
-                    setup_korean_font()
-                    
-                    x = range(len(top_df))
-                    width = 0.35
-                    
-                    if '월간 PC 검색수_num' in top_df.columns:
-                        bars1 = ax.bar([i - width/2 for i in x], top_df['월간 PC 검색수_num'], width, label='PC 검색수', color='#03C75A')
-                        bars2 = ax.bar([i + width/2 for i in x], top_df['월간 모바일 검색수_num'], width, label='모바일 검색수', color='#1EC800')
-                    
-                    ax.set_xlabel('키워드')
-                    ax.set_ylabel('검색수')
-                    ax.set_title('키워드별 월간 검색수 (상위 20개)')
-                    ax.set_xticks(x)
-                    ax.set_xticklabels(top_df['연관 키워드'], rotation=45, ha='right')
-                    ax.legend()
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    
-                    # CSV 다운로드 버튼
-                    csv = df_display.to_csv(index=False, encoding='utf-8-sig')
-                    # 파일명에서 특수문자 제거
-                    safe_filename = "".join(c for c in keyword_input if c.isalnum() or c in (' ', '-', '_', ',')).strip()
-                    safe_filename = safe_filename.replace(',', '_').replace(' ', '_')[:50]  # 길이 제한
-                    st.download_button(
-                        label="📥 CSV 다운로드",
-                        data=csv,
-                        file_name=f"keyword_analysis_{safe_filename}.csv",
-                        mime="text/csv"
-                    )
-                else:
-                    st.warning("검색 결과가 없습니다. 다른 키워드를 시도해보세요.")
+            expander = KeywordExpander(keyword_input, API_KEY, SECRET_KEY, CUSTOMER_ID,
+                                       max_depth=int(expand_depth), max_keywords=int(expand_max_keywords),
+                                       max_requests=int(expand_requests), min_volume=int(expand_min_volume),
+                                       checkpoint_path=default_checkpoint_path(keyword_input))
+            expand_progress = st.progress(0.0, text="확장 중...")
+
+            def show_expand_progress(collected, frontier, requests):
+                expand_progress.progress(min(1.0, collected / int(expand_max_keywords)),
+                                         text=f"수집 {collected:,}개, 대기 {frontier:,}개, 누적 요청 {requests:,}회")
+
+            started = time.perf_counter()
+            df_expand, expand_errors = expander.run(on_progress=show_expand_progress)
+            latency_ms = (time.perf_counter() - started) * 1000
+            for expand_error in expand_errors:
+                log_print("ERROR", expand_error, endpoint="keywordstool")
+            log_print("INFO", f"키워드 확장: collected={len(df_expand)}, frontier={len(expander.frontier)}, "
+                              f"requests={expander.requests}", endpoint="keywordstool", latency_ms=latency_ms)
+            store_result(st.session_state, "expand", expand_key,
+                         (df_expand, expand_errors, len(expander.frontier)), endpoint="keywordstool")
+
+    expand_entry = get_result(st.session_state, "expand")
+    if expand_entry is not None:
+        df_expand, expand_errors, expand_remaining = expand_entry["value"]
+        if expand_errors:
+            st.warning("확장 중 오류 (다시 실행하면 실패한 키워드부터 이어서 진행):\n" + "\n".join(expand_errors))
+        if not df_expand.empty:
+            st.success(f"✅ {len(df_expand):,}개의 키워드를 수집했습니다. 남은 확장 대기 {expand_remaining:,}개")
+            df_expand_display = keyword_view(expand_entry["id"], df_expand).rename(columns={'depth': '확장 단계'})
+            st.dataframe(df_expand_display, use_container_width=True, height=400)
+            export_buttons(df_expand_display, "keyword_expand", "expand_export")
+
+    # 키워드 기회 점수 (검색수 대비 쇼핑 상품 수, 클릭률, 경쟁정도)
+    st.markdown("---")
+    st.subheader("💎 키워드 기회 점수")
+    st.caption("키워드마다 쇼핑 검색 상품 수를 조회해 검색수 대비 상품 수, 클릭률로 본 예상 클릭수, "
+               "경쟁정도를 합친 점수(최고 100)로 정렬합니다.")
+    opportunity_sources = {}
+    if keyword_entry is not None and keyword_entry["value"][0] is not None:
+        opportunity_sources["키워드 분석 결과"] = (keyword_entry["id"], keyword_entry["value"][0])
+    if expand_entry is not None:
+        opportunity_sources["연관 키워드 확장 결과"] = (expand_entry["id"], expand_entry["value"][0])
+    if not opportunity_sources:
+        st.info("먼저 키워드 분석이나 연관 키워드 확장을 실행해주세요.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        opportunity_source = col1.selectbox("대상 키워드", list(opportunity_sources))
+        opportunity_min_volume = col2.number_input("최소 총 검색수", min_value=0, value=100, step=100,
+                                                   key="opportunity_min_volume")
+        opportunity_max_keywords = col3.number_input("최대 키워드 수 (검색수 상위)", min_value=10, max_value=100000,
+                                                     value=1000, step=100)
+        opportunity_concurrency = col4.slider("동시 요청 수", min_value=1, max_value=32, value=8,
+                                              key="opportunity_concurrency")
+        opportunity_btn = st.button("💎 기회 점수 계산", key="opportunity")
+
+        if opportunity_btn:
+            source_id, df_source = opportunity_sources[opportunity_source]
+            opportunity_key = (source_id, int(opportunity_min_volume), int(opportunity_max_keywords))
+            if not OPENAPI_READY:
+                st.error("⚠️ 네이버 검색 API 키를 모두 입력해주세요.")
+            elif get_result(st.session_state, "opportunity", opportunity_key) is None:
+                opportunity_progress = st.progress(0.0, text="쇼핑 상품 수 조회 중...")
+
+                def show_opportunity_progress(done, total):
+                    if done == total or done % 50 == 0:
+                        opportunity_progress.progress(done / total, text=f"쇼핑 상품 수 조회 {done:,}/{total:,}")
+
+                started = time.perf_counter()
+                df_opportunity, opportunity_errors = score_keywords(
+                    df_source, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, min_volume=int(opportunity_min_volume),
+                    max_keywords=int(opportunity_max_keywords), concurrency=opportunity_concurrency,
+                    on_progress=show_opportunity_progress)
+                latency_ms = (time.perf_counter() - started) * 1000
+                for opportunity_error in opportunity_errors:
+                    log_print("ERROR", opportunity_error, endpoint="shop")
+                log_print("INFO", f"기회 점수: keywords={len(df_opportunity)}, errors={len(opportunity_errors)}",
+                          endpoint="shop", latency_ms=latency_ms)
+                store_result(st.session_state, "opportunity", opportunity_key,
+                             (df_opportunity, opportunity_errors), endpoint="shop")
+
+    opportunity_entry = get_result(st.session_state, "opportunity")
+    if opportunity_entry is not None:
+        df_opportunity, opportunity_errors = opportunity_entry["value"]
+        if opportunity_errors:
+            st.warning(f"쇼핑 상품 수 조회 실패 {len(opportunity_errors):,}건 (점수 없이 맨 아래 표시):\n"
+                       + "\n".join(opportunity_errors[:20]))
+        if df_opportunity.empty:
+            st.warning("조건에 맞는 키워드가 없습니다.")
+        else:
+            st.success(f"✅ {len(df_opportunity):,}개 키워드의 기회 점수를 계산했습니다.")
+            df_opportunity_display = df_opportunity.rename(columns=OPPORTUNITY_COLUMNS)
+            st.dataframe(df_opportunity_display, use_container_width=True, height=400)
+            export_buttons(df_opportunity_display, "keyword_opportunity", "opportunity_export")
 
 with tab2:
     st.header("쇼핑 검색")
@@ -426,115 +456,106 @@ with tab2:
     
     if search_btn and shopping_query:
         # API 키 검증
-        if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        shop_key = (shopping_query, display_count)
+        if not OPENAPI_READY:
             st.error("⚠️ 네이버 검색 API 키를 모두 입력해주세요.")
-        else:
+        elif get_result(st.session_state, "shop", shop_key) is None:
             with st.spinner("상품 검색 중..."):
                 # 로그 출력을 위해 try-except로 감싸기
-                result = None
                 try:
-                    log_print(f"[INFO] 쇼핑 검색 API 호출: query={shopping_query}, display={display_count}")
+                    started = time.perf_counter()
                     result, error = search_naver_shopping(shopping_query, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, display_count)
-                    log_print(f"[INFO] API 응답: {result}")
-                    
+                    latency_ms = (time.perf_counter() - started) * 1000
+
                     if error:
                         st.error(error)
-                        log_print(f"[ERROR] {error}")
+                        log_print("ERROR", error, endpoint="shop", latency_ms=latency_ms, query=shopping_query)
+                    else:
+                        # 응답 전문 대신 요약만 기록
+                        log_print("INFO", f"쇼핑 검색: query={shopping_query}, display={display_count}, "
+                                          f"items={len(result.get('items', []))}, total={result.get('total')}",
+                                  endpoint="shop", latency_ms=latency_ms, status=200)
+                        store_result(st.session_state, "shop", shop_key, result, endpoint="shop")
                 except Exception as e:
                     st.error(f"API 호출 중 예외 발생: {e}")
-                    log_print(f"[ERROR] API 호출 중 예외 발생: {e}")
-                    log_print(traceback.format_exc())
-                    result = None
-                
-                if result and 'items' in result:
-                    items = result['items']
-                    st.success(f"✅ {len(items)}개의 상품을 찾았습니다!")
-                    
-                    # 데이터프레임 생성
-                    df_items = pd.DataFrame(items)
-                    
-                    # 필요한 컬럼만 선택하고 한글화
-                    columns_to_show = ['title', 'lprice', 'hprice', 'mallName', 'productId', 'productType', 'brand', 'maker', 'category1', 'category2', 'category3', 'category4']
-                    df_items = df_items[[col for col in columns_to_show if col in df_items.columns]]
-                    
-                    column_mapping = {
-                        'title': '상품명',
-                        'lprice': '최저가',
-                        'hprice': '최고가',
-                        'mallName': '쇼핑몰',
-                        'productId': '상품ID',
-                        'productType': '상품타입',
-                        'brand': '브랜드',
-                        'maker': '제조사',
-                        'category1': '대분류',
-                        'category2': '중분류',
-                        'category3': '소분류',
-                        'category4': '세분류'
-                    }
-                    
-                    df_items = df_items.rename(columns=column_mapping)
-                    
-                    # HTML 태그 제거
-                    if '상품명' in df_items.columns:
-                        df_items['상품명'] = df_items['상품명'].str.replace('<[^<]+?>', '', regex=True)
-                    
-                    # 가격 숫자 변환
-                    if '최저가' in df_items.columns:
-                        df_items['최저가'] = pd.to_numeric(df_items['최저가'], errors='coerce')
-                    
-                    # 데이터 테이블 표시
-                    st.dataframe(df_items, use_container_width=True, height=400)
-                    
-                    # 가격 분포 시각화
-                    if '최저가' in df_items.columns:
-                        st.subheader("📈 가격 분포")
-                        
-                        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-                        
-                        # 한글 폰트 설정
-                        setup_korean_font()
-                        
-                        # 히스토그램
-                        axes[0].hist(df_items['최저가'].dropna(), bins=20, color='#03C75A', edgecolor='white')
-                        axes[0].set_xlabel('가격 (원)')
-                        axes[0].set_ylabel('상품 수')
-                        axes[0].set_title('가격 분포')
-                        
-                        # 쇼핑몰별 상품 수
-                        if '쇼핑몰' in df_items.columns:
-                            mall_counts = df_items['쇼핑몰'].value_counts().head(10)
-                            axes[1].barh(mall_counts.index, mall_counts.values, color='#1EC800')
-                            axes[1].set_xlabel('상품 수')
-                            axes[1].set_ylabel('쇼핑몰')
-                            axes[1].set_title('쇼핑몰별 상품 수 (상위 10개)')
-                        
-                        plt.tight_layout()
-                        st.pyplot(fig)
-                    
-                    # 통계 정보
-                    st.subheader("📊 가격 통계")
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    if '최저가' in df_items.columns:
-                        prices = df_items['최저가'].dropna()
-                        col1.metric("최저가", f"{prices.min():,.0f}원")
-                        col2.metric("최고가", f"{prices.max():,.0f}원")
-                        col3.metric("평균가", f"{prices.mean():,.0f}원")
-                        col4.metric("중간가", f"{prices.median():,.0f}원")
-                    
-                        # CSV 다운로드 버튼
-                        csv = df_items.to_csv(index=False, encoding='utf-8-sig')
-                        # 파일명에서 특수문자 제거
-                        safe_filename = "".join(c for c in shopping_query if c.isalnum() or c in (' ', '-', '_')).strip()
-                        safe_filename = safe_filename.replace(' ', '_')[:50]  # 길이 제한
-                        st.download_button(
-                            label="📥 CSV 다운로드",
-                            data=csv,
-                            file_name=f"shopping_search_{safe_filename}.csv",
-                            mime="text/csv"
-                        )
-                else:
-                    st.warning("검색 결과가 없습니다. 다른 키워드를 시도해보세요.")
+                    log_print("ERROR", f"API 호출 중 예외 발생: {e}\n{traceback.format_exc()}", endpoint="shop")
+
+    # 마지막 조회 결과 표시 (슬라이더 등을 움직여도 재조회/재계산하지 않음)
+    shop_entry = get_result(st.session_state, "shop")
+    if shop_entry is not None:
+        result = shop_entry["value"]
+        if result and result.get('items'):
+            st.success(f"✅ '{shop_entry['query'][0]}' {len(result['items'])}개의 상품을 찾았습니다!")
+
+            # 필요한 컬럼만 선택, 한글화, HTML 태그 제거, 가격 숫자 변환
+            df_items = shopping_view(shop_entry["id"], result)
+            stats = price_stats(shop_entry["id"], df_items)
+
+            # 데이터 테이블 표시
+            st.dataframe(df_items, use_container_width=True, height=400)
+
+            # 가격 분포 시각화
+            if '최저가' in df_items.columns:
+                st.subheader("📈 가격 분포")
+
+                col1, col2 = st.columns(2)
+                col1.vega_lite_chart(price_histogram_spec(shop_entry["id"], df_items['최저가']), use_container_width=True)
+                if 'mall_counts' in stats:
+                    col2.vega_lite_chart(mall_counts_spec(shop_entry["id"], stats['mall_counts']), use_container_width=True)
+
+            # 통계 정보
+            st.subheader("📊 가격 통계")
+            col1, col2, col3, col4 = st.columns(4)
+
+            if 'min' in stats:
+                col1.metric("최저가", f"{stats['min']:,.0f}원")
+                col2.metric("최고가", f"{stats['max']:,.0f}원")
+                col3.metric("평균가", f"{stats['mean']:,.0f}원")
+                col4.metric("중간가", f"{stats['median']:,.0f}원")
+
+                # 내보내기 (CSV/Parquet/JSONL)
+                # 파일명에서 특수문자 제거
+                safe_filename = "".join(c for c in shop_entry["query"][0] if c.isalnum() or c in (' ', '-', '_')).strip()
+                safe_filename = safe_filename.replace(' ', '_')[:50]  # 길이 제한
+                export_buttons(df_items, f"shopping_search_{safe_filename}", "shop_export")
+        else:
+            st.warning("검색 결과가 없습니다. 다른 키워드를 시도해보세요.")
+
+    # 순위 추적 (1~1000위 전체 페이지 조회)
+    st.markdown("---")
+    st.subheader("🎯 쇼핑 순위 추적")
+    st.caption("한 줄에 '키워드 | 상품ID 또는 쇼핑몰명' 형식으로 입력하세요. 최대 1000위까지 조회합니다.")
+    rank_input = st.text_area("추적 대상", placeholder="맥북 프로 | 12345678901\n노트북 | 하이마트")
+    rank_concurrency = st.slider("동시 요청 수", min_value=1, max_value=20, value=8)
+    rank_btn = st.button("🎯 순위 조회", key="rank_track")
+
+    if rank_btn and rank_input:
+        if not OPENAPI_READY:
+            st.error("⚠️ 네이버 검색 API 키를 모두 입력해주세요.")
+        else:
+            targets = parse_rank_targets(rank_input)
+            rank_key = (tuple((t["keyword"], t["productId"], t["mallName"]) for t in targets), rank_concurrency)
+            if not targets:
+                st.warning("'키워드 | 대상' 형식의 줄이 없습니다.")
+            elif get_result(st.session_state, "rank", rank_key) is None:
+                with st.spinner(f"순위 조회 중... ({len(targets)}건)"):
+                    df_rank = track_ranks(targets, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, concurrency=rank_concurrency)
+                store_result(st.session_state, "rank", rank_key, df_rank, endpoint="shop")
+
+    rank_entry = get_result(st.session_state, "rank")
+    if rank_entry is not None:
+        df_rank = rank_entry["value"]
+        found = df_rank['rank'].notna().sum()
+        st.success(f"✅ {len(df_rank)}건 중 {found}건의 순위를 찾았습니다.")
+        st.dataframe(df_rank.rename(columns={
+            'keyword': '키워드',
+            'productId': '상품ID',
+            'mallName': '쇼핑몰',
+            'rank': '순위',
+            'title': '상품명',
+            'lprice': '최저가',
+            'error': '오류'
+        }), use_container_width=True)
 
 
 # 탭 3: 네이버 통합검색 트렌드
@@ -547,10 +568,12 @@ with tab3:
         start_date = st.date_input("시작일", value=pd.to_datetime("2017-01-01"))
         end_date = st.date_input("종료일", value=pd.to_datetime("2017-04-30"))
         time_unit = st.selectbox("시간 단위", ["date", "week", "month"], index=2)
-        group1 = st.text_input("그룹1 이름", value="한글")
-        keywords1 = st.text_input("그룹1 키워드(쉼표로 구분)", value="한글,korean")
-        group2 = st.text_input("그룹2 이름", value="영어")
-        keywords2 = st.text_input("그룹2 키워드(쉼표로 구분)", value="영어,english")
+        groups_text = st.text_area(
+            "키워드 그룹 (한 줄에 '그룹명: 키워드1, 키워드2', 개수 제한 없음)",
+            value="한글: 한글,korean\n영어: 영어,english",
+            height=150
+        )
+        anchor_group = st.text_input("기준 그룹 (5개 초과 시 모든 요청에 포함, 비우면 첫 그룹)", value="")
         device = st.selectbox("디바이스", ["all", "pc", "mo"], index=1)
         ages = st.multiselect("연령대", ["1","2","3","4","5","6"], default=["1","2"])
         gender = st.selectbox("성별", ["all", "m", "f"], index=2)
@@ -558,33 +581,324 @@ with tab3:
 
     if submit_trend:
         # API 키 검증
-        if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        trend_groups = parse_keyword_groups(groups_text)
+        trend_key = (str(start_date), str(end_date), time_unit,
+                     tuple((g["groupName"], tuple(g["keywords"])) for g in trend_groups),
+                     anchor_group.strip(), device, tuple(ages), gender)
+        if not OPENAPI_READY:
             st.error("⚠️ 네이버 검색 API 키를 모두 입력해주세요.")
-        else:
-            with st.spinner("트렌드 조회 중..."):
-                result = get_naver_trend(
+        elif anchor_group.strip() and anchor_group.strip() not in {g["groupName"] for g in trend_groups}:
+            st.error(f"⚠️ 기준 그룹 '{anchor_group.strip()}'이(가) 키워드 그룹 목록에 없습니다.")
+        elif get_result(st.session_state, "trend", trend_key) is None:
+            with st.spinner(f"트렌드 조회 중... ({len(trend_groups)}개 그룹)"):
+                # DataLab은 전체를 빈 값으로 받음
+                df_trend, trend_errors = get_trend_frame(
                     NAVER_CLIENT_ID, NAVER_CLIENT_SECRET,
-                    start_date, end_date, time_unit,
-                    group1, keywords1, group2, keywords2,
-                    device, ages, gender
+                    start_date, end_date, time_unit, trend_groups,
+                    device="" if device == "all" else device,
+                    ages=ages,
+                    gender="" if gender == "all" else gender,
+                    anchor=anchor_group.strip() or None
                 )
-                if "results" in result:
-                    st.success("트렌드 데이터 조회 성공!")
-                    st.json(result)
-                else:
-                    error_msg = result.get('error', '알 수 없는 오류')
-                    details = result.get('details', '')
-                    st.error(f"트렌드 조회 실패: {error_msg}")
-                    if details:
-                        st.text(f"상세: {details}")
+            for trend_error in trend_errors:
+                log_print("ERROR", trend_error, endpoint="datalab")
+            if df_trend is None:
+                for trend_error in trend_errors:
+                    st.error(f"트렌드 조회 실패: {trend_error}")
+            else:
+                store_result(st.session_state, "trend", trend_key, (df_trend, trend_errors), endpoint="datalab")
+
+    trend_entry = get_result(st.session_state, "trend")
+    if trend_entry is not None:
+        df_trend, trend_errors = trend_entry["value"]
+        for trend_error in trend_errors:
+            st.error(f"트렌드 조회 실패: {trend_error}")
+        if df_trend is not None:
+            st.success(f"트렌드 데이터 조회 성공! ({df_trend['group'].nunique()}개 그룹, 공통 척도 0~100)")
+            st.line_chart(df_trend.pivot(index="period", columns="group", values="ratio"))
+            st.dataframe(df_trend.rename(columns={
+                'group': '그룹',
+                'keywords': '키워드',
+                'period': '기간',
+                'ratio': '상대 검색량'
+            }), use_container_width=True, height=400)
+
+# 탭 6: 순위 이력 (naver_history.py collect 로 수집한 데이터)
+with tab6:
+    st.header("📈 순위 이력")
+    st.write("수집기(`python naver_history.py collect watchlist.txt`)가 기록한 쇼핑/블로그 순위 변화를 조회합니다.")
+
+    with st.form("history_form"):
+        col1, col2, col3 = st.columns(3)
+        history_kind = col1.selectbox("종류", ["전체", "shop", "blog"])
+        history_keyword = col2.text_input("키워드 (비우면 전체)")
+        history_target = col3.text_input("대상 (비우면 전체)")
+        col1, col2 = st.columns(2)
+        history_start = col1.date_input("시작일", value=pd.Timestamp.now().normalize() - pd.Timedelta(days=30))
+        history_end = col2.date_input("종료일", value=pd.Timestamp.now().normalize())
+        submit_history = st.form_submit_button("이력 조회")
+
+    if submit_history:
+        history_key = (history_kind, history_keyword.strip(), history_target.strip(),
+                       str(history_start), str(history_end))
+        # 수집기가 계속 기록하므로 조회할 때마다 새로 읽고 결과만 보관
+        df_history = RankHistoryStore().query(
+            None if history_kind == "전체" else history_kind,
+            history_keyword.strip() or None,
+            history_target.strip() or None,
+            history_start, history_end
+        )
+        store_result(st.session_state, "history", history_key, df_history)
+
+    history_entry = get_result(st.session_state, "history")
+    if history_entry is not None:
+        df_history = history_entry["value"].copy()
+        if df_history.empty:
+            st.warning("조회 기간에 기록된 이력이 없습니다.")
+        else:
+            st.success(f"✅ 변경 기록 {len(df_history)}건")
+            df_history['series'] = df_history['kind'] + " | " + df_history['keyword'] + " | " + df_history['target']
+            # 변경분만 저장되므로 계단형으로 펼쳐서 표시
+            rank_chart = df_history.pivot_table(index='observed_at', columns='series', values='rank', aggfunc='last')
+            st.line_chart(rank_chart.ffill())
+            st.dataframe(df_history.drop(columns='series').rename(columns={
+                'kind': '종류',
+                'keyword': '키워드',
+                'target': '대상',
+                'rank': '순위',
+                'price': '최저가',
+                'observed_at': '관측 시각'
+            }), use_container_width=True, height=400)
+            export_buttons(df_history.drop(columns='series'), "rank_history", "history_export")
+
+    st.markdown("---")
+    st.subheader("💸 가격 변동")
+    st.write("감시기(`python naver_price.py watch keywords.txt`)가 감지한 최저가/쇼핑몰 변경과 신규/이탈 상품을 조회합니다.")
+
+    with st.form("price_form"):
+        col1, col2 = st.columns(2)
+        price_keyword = col1.text_input("키워드 (비우면 전체)", key="price_keyword")
+        price_change = col2.selectbox("변경 종류", ["전체", *CHANGE_KINDS])
+        col1, col2 = st.columns(2)
+        price_start = col1.date_input("시작일", value=pd.Timestamp.now().normalize() - pd.Timedelta(days=7),
+                                      key="price_start")
+        price_end = col2.date_input("종료일", value=pd.Timestamp.now().normalize(), key="price_end")
+        submit_price = st.form_submit_button("가격 변동 조회")
+
+    if submit_price:
+        price_key = (price_keyword.strip(), price_change, str(price_start), str(price_end))
+        # 감시기가 계속 기록하므로 조회할 때마다 새로 읽고 결과만 보관
+        price_store = PriceSnapshotStore()
+        df_price = price_store.changes(price_keyword.strip() or None,
+                                       None if price_change == "전체" else price_change, price_start, price_end)
+        store_result(st.session_state, "price", price_key, (df_price, price_store.summary()))
+        price_store.close()
+
+    price_entry = get_result(st.session_state, "price")
+    if price_entry is not None:
+        df_price, summary = price_entry["value"]
+        st.caption(f"감시 키워드 {summary['keywords']:,}개 · 추적 상품 {summary['products']:,}개 · "
+                   f"누적 변경 {summary['changes']:,}건")
+        if df_price.empty:
+            st.warning("조회 기간에 감지된 변경이 없습니다.")
+        else:
+            st.success(f"✅ 변경 {len(df_price)}건")
+            st.dataframe(df_price.rename(columns=CHANGE_COLUMNS), use_container_width=True, height=400)
+            export_buttons(df_price, "price_changes", "price_export")
+
+# 탭 8: 작업 큐 (대량 작업을 작업자 프로세스에서 실행, 상태는 SQLite에 보관)
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def job_result_view(job_id, parts):
+    # 부분 결과 묶음 수가 바뀔 때만 다시 읽음
+    return get_job_queue().result(job_id)
+
+
+with tab8:
+    st.header("🗂️ 작업 큐")
+    st.caption("대량 작업은 별도 작업자 프로세스에서 실행됩니다. 브라우저를 닫거나 다시 연결해도 "
+               "작업은 계속되고, 진행률과 부분 결과를 여기서 확인하거나 취소할 수 있습니다.")
+    job_queue = get_job_queue()
+    job_pool = get_worker_pool()
+
+    with st.form("job_form"):
+        col1, col2 = st.columns(2)
+        job_kind = col1.selectbox("작업 종류", list(JOB_KIND_LABELS), format_func=JOB_KIND_LABELS.get)
+        job_owner = col2.text_input("작업자 이름 (목록 필터용)", key="job_owner")
+        job_text = st.text_area(
+            "입력 (키워드 대량 분석: 시드 키워드 쉼표/줄바꿈 구분 · 쇼핑 순위 추적: '키워드 | 상품ID 또는 쇼핑몰명' · "
+            "검색어 트렌드: '그룹명: 키워드1, 키워드2')", height=150)
+        col1, col2, col3 = st.columns(3)
+        job_start = col1.date_input("트렌드 시작일", value=pd.Timestamp.now().normalize() - pd.Timedelta(days=365))
+        job_end = col2.date_input("트렌드 종료일", value=pd.Timestamp.now().normalize())
+        job_time_unit = col3.selectbox("트렌드 시간 단위", ["date", "week", "month"], index=2)
+        submit_job = st.form_submit_button("🗂️ 작업 넣기")
+
+    if submit_job:
+        # API 키는 작업 큐에 저장하지 않음: 사이드바 키는 키 풀에 있는 키일 때 지문으로만 지정
+        job_credential_kind = JOB_CREDENTIAL_KINDS[job_kind]
+        if job_credential_kind == "openapi":
+            job_sidebar_keys = {"client_id": NAVER_CLIENT_ID, "client_secret": NAVER_CLIENT_SECRET}
+        else:
+            job_sidebar_keys = {"api_key": API_KEY, "secret_key": SECRET_KEY, "customer_id": CUSTOMER_ID}
+        job_params = {}
+        if all(job_sidebar_keys.values()):
+            job_params["credential"] = credential_fingerprint(job_credential_kind, job_sidebar_keys)
+        job_key_pool = get_pool(job_credential_kind)
+        if job_kind == "keywords":
+            job_params["seeds"] = split_hint_keywords(job_text)
+            job_ready, job_items = SEARCHAD_READY, job_params["seeds"]
+        elif job_kind == "shop_rank":
+            job_params["targets"] = parse_rank_targets(job_text)
+            job_ready, job_items = OPENAPI_READY, job_params["targets"]
+        else:
+            job_params.update(groups=parse_keyword_groups(job_text), start_date=str(job_start),
+                              end_date=str(job_end), time_unit=job_time_unit)
+            job_ready, job_items = OPENAPI_READY, job_params["groups"]
+        if not job_ready:
+            st.error("⚠️ 작업에 필요한 API 키를 모두 입력해주세요.")
+        elif "credential" in job_params and (job_key_pool is None
+                                             or job_key_pool.find(job_params["credential"]) is None):
+            st.error("⚠️ 작업은 작업자의 키 풀(credentials.json 또는 환경 변수)에 등록된 API 키로만 실행됩니다. "
+                     "사이드바 키를 키 풀에 등록하거나, 사이드바를 비워 두고 키 풀의 키를 사용하세요.")
+        elif not job_items:
+            st.warning("입력 형식에 맞는 항목이 없습니다.")
+        else:
+            job_id = job_queue.submit(job_kind, job_params, owner=job_owner.strip())
+            log_print("INFO", f"작업 등록: id={job_id}, kind={job_kind}, items={len(job_items)}")
+            st.success(f"✅ 작업 {job_id}번을 등록했습니다. (항목 {len(job_items):,}개)")
+
+    col1, col2 = st.columns(2)
+    job_mine_only = col1.checkbox("내 작업만 보기", value=False)
+    job_auto_refresh = col2.checkbox("자동 새로고침 (2초)", value=True)
+
+    @st.fragment(run_every=2 if job_auto_refresh else None)
+    def job_monitor():
+        if job_pool is not None:
+            st.caption(f"작업자 프로세스 {job_pool.alive()}/{job_pool.processes}개 실행 중")
+        df_jobs = job_queue.list_jobs(owner=(job_owner.strip() or None) if job_mine_only else None)
+        if df_jobs.empty:
+            st.info("등록된 작업이 없습니다.")
+            return
+        df_jobs["progress"] = (df_jobs["done"] / df_jobs["total"].where(df_jobs["total"] > 0)).fillna(0)
+        for column in ("created_ts", "started_ts", "finished_ts"):
+            df_jobs[column] = pd.to_datetime(df_jobs[column], unit="s", utc=True).dt.tz_convert("Asia/Seoul")
+        df_jobs["kind"] = df_jobs["kind"].map(JOB_KIND_LABELS)
+        st.dataframe(
+            df_jobs[["id", "kind", "owner", "status", "progress", "message", "rows", "created_ts", "finished_ts"]],
+            column_config={
+                "id": "작업", "kind": "종류", "owner": "작업자", "status": "상태",
+                "progress": st.column_config.ProgressColumn("진행률", min_value=0, max_value=1),
+                "message": "메시지", "rows": "결과 행", "created_ts": "등록 시각", "finished_ts": "종료 시각",
+            },
+            use_container_width=True, hide_index=True)
+
+        selected_job = st.selectbox("작업 선택", df_jobs["id"].tolist(), key="job_selected")
+        job = job_queue.get(selected_job)
+        if job is None:
+            return
+        col1, col2 = st.columns(2)
+        if job["status"] not in FINISHED and col1.button("⏹️ 취소", key="job_cancel"):
+            job_queue.cancel(selected_job)
+            log_print("INFO", f"작업 취소 요청: id={selected_job}")
+        if job["status"] in FINISHED and col2.button("🗑️ 삭제", key="job_delete"):
+            job_queue.delete(selected_job)
+            st.rerun()
+        if job["errors"]:
+            st.warning(f"오류 {len(job['errors']):,}건:\n" + "\n".join(job["errors"][:20]))
+        if job["parts"]:
+            df_job = job_result_view(selected_job, job["parts"])
+            label = "결과" if job["status"] == "done" else "부분 결과"
+            st.write(f"{label} {len(df_job):,}행")
+            st.dataframe(df_job, use_container_width=True, height=400)
+            export_buttons(df_job, f"job_{selected_job}_{job['kind']}", f"job_export_{selected_job}")
+
+    job_monitor()
+
+# 탭 7: 성능 지표 (프로세스 전역, 모든 세션의 호출 포함)
+with tab7:
+    st.header("📊 성능 지표")
+    st.caption("엔드포인트별 단계 지연 시간(sign/http/decode/frame/total)과 할당량 사용량입니다. 캐시 적중은 포함되지 않습니다.")
+    metrics = get_metrics()
+    flight = get_flight()
+    st.caption(f"진행 중인 API 요청 {flight.inflight()}개 · 다른 세션과 합쳐진 호출 {flight.stats['followers']:,}회")
+    canonicalizer = get_canonicalizer()
+    if canonicalizer is not None:
+        canon = canonicalizer.summary()
+        st.caption(f"검색어 정규화 색인 {canon['entries']:,}개 · 동의어 {canon['synonyms']:,}개 · "
+                   f"대표 표기로 바뀐 검색어 {canon['folded']:,}회")
+
+    latency_rows = metrics.latency_summary()
+    if latency_rows:
+        st.subheader("⏱️ 지연 시간 (ms)")
+        st.dataframe(pd.DataFrame(latency_rows).rename(columns={
+            'endpoint': '엔드포인트',
+            'stage': '단계',
+            'count': '호출 수'
+        }).round(1), use_container_width=True)
+    else:
+        st.info("아직 기록된 API 호출이 없습니다.")
+
+    counter_rows = metrics.counters()
+    if counter_rows:
+        st.subheader("🔢 카운터")
+        df_counters = pd.DataFrame(
+            [{"지표": name, **labels, "값": value} for name, labels, value in counter_rows]
+        )
+        st.dataframe(df_counters.sort_values("지표"), use_container_width=True)
+
+    quota_snapshot = get_scheduler().snapshot()
+    if quota_snapshot:
+        st.subheader("📉 할당량")
+        df_quota = pd.DataFrame(quota_snapshot)
+        df_quota['credential'] = df_quota['credential'].map(mask_credential)
+        st.dataframe(df_quota.rename(columns={
+            'credential': '자격증명',
+            'endpoint': '엔드포인트',
+            'rate': '현재 초당 요청',
+            'base_rate': '기본 초당 요청',
+            'used_today': '오늘 사용',
+            'remaining_today': '오늘 남음',
+            'throttled': '429 횟수',
+            'retries': '재시도'
+        }), use_container_width=True)
+
+    with st.expander("Prometheus 형식으로 보기"):
+        st.code(metrics.render_prometheus(quota_gauges(quota_snapshot)), language="text")
+    if st.button("지표 초기화"):
+        metrics.reset()
 
 # 탭 5: 로그(콘솔)
 with tab5:
     st.header("📝 로그(콘솔 출력)")
-    st.code(log_stream.getvalue(), language="text")
+    st.caption(f"최근 {log_sink.capacity:,}개까지 보관합니다. 현재 {len(log_sink):,}개")
+
+    col1, col2, col3, col4 = st.columns([2, 2, 3, 1])
+    log_levels = col1.multiselect("레벨", LOG_LEVELS, default=["INFO", "WARNING", "ERROR"])
+    log_endpoint = col2.selectbox("엔드포인트", ["전체"] + log_sink.endpoints())
+    log_text = col3.text_input("메시지 검색")
+    log_page_size = col4.selectbox("페이지 크기", [20, 50, 100], index=1)
+
+    log_filters = {
+        "levels": log_levels,
+        "endpoint": None if log_endpoint == "전체" else log_endpoint,
+        "text": log_text or None,
+    }
+    _, log_pages, log_matched = log_sink.page(1, log_page_size, **log_filters)
+    log_page = st.number_input(f"페이지 (1~{log_pages}, {log_matched:,}건)", min_value=1, max_value=log_pages, value=1)
+    page_records, _, _ = log_sink.page(log_page, log_page_size, **log_filters)
+    if page_records:
+        df_log = pd.DataFrame(page_records)
+        df_log["ts"] = pd.to_datetime(df_log["ts"], unit="s")
+        st.dataframe(df_log, use_container_width=True, height=400)
+    else:
+        st.info("표시할 로그가 없습니다.")
     if st.button("로그 초기화"):
-        log_stream.truncate(0)
-        log_stream.seek(0)
+        log_sink.clear()
 
 # 푸터
 st.markdown("---")
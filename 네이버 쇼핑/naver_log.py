@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+
+DEFAULT_CAPACITY = 2000
+DEFAULT_FILE_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_FILE_BACKUPS = 3
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+# 레코드에 남길 메시지 최대 길이 (응답 전문 같은 긴 문자열 방지)
+MAX_MESSAGE_CHARS = 2000
+
+
+class RingLogSink:
+    """크기 상한이 있는 구조화 로그 버퍼 (스레드 안전)
+
+    레코드는 level, message, endpoint, latency_ms, status, payload_bytes 등을
+    가진 dict이며, capacity를 넘으면 가장 오래된 것부터 버립니다. file_path를
+    주면 JSON Lines 형식으로 회전 파일에도 기록합니다.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, file_path=None,
+                 file_max_bytes=DEFAULT_FILE_MAX_BYTES, file_backups=DEFAULT_FILE_BACKUPS):
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._file_logger = None
+        if file_path:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            self._file_logger = logging.getLogger(f"naver_log.{os.path.abspath(file_path)}")
+            self._file_logger.setLevel(logging.DEBUG)
+            self._file_logger.propagate = False
+            # 같은 파일의 로거는 프로세스에서 공유하므로 핸들러(열린 파일)는 처음 한 번만 만듦
+            if not self._file_logger.handlers:
+                handler = RotatingFileHandler(file_path, maxBytes=file_max_bytes, backupCount=file_backups,
+                                              encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self._file_logger.addHandler(handler)
+
+    def log(self, level, message, endpoint=None, latency_ms=None, status=None, payload_bytes=None, **extra):
+        """레코드 하나를 추가하고 반환"""
+        message = str(message)
+        if len(message) > MAX_MESSAGE_CHARS:
+            message = message[:MAX_MESSAGE_CHARS] + f"... ({len(message):,}자 중 일부)"
+        record = {
+            "ts": time.time(),
+            "level": level,
+            "endpoint": endpoint,
+            "message": message,
+            "latency_ms": latency_ms,
+            "status": status,
+            "payload_bytes": payload_bytes,
+        }
+        if extra:
+            record["extra"] = extra
+        with self._lock:
+            self._records.append(record)
+        if self._file_logger is not None:
+            self._file_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+        return record
+
+    def records(self, levels=None, endpoint=None, text=None, newest_first=True):
+        """조건에 맞는 레코드 목록 (버퍼 복사본)"""
+        with self._lock:
+            records = list(self._records)
+        if levels:
+            records = [r for r in records if r["level"] in levels]
+        if endpoint:
+            records = [r for r in records if r["endpoint"] == endpoint]
+        if text:
+            records = [r for r in records if text in r["message"]]
+        if newest_first:
+            records.reverse()
+        return records
+
+    def page(self, page=1, page_size=50, **filters):
+        """(해당 페이지 레코드, 전체 페이지 수, 조건에 맞는 레코드 수)"""
+        records = self.records(**filters)
+        pages = max(1, -(-len(records) // page_size))
+        page = min(max(1, page), pages)
+        start = (page - 1) * page_size
+        return records[start:start + page_size], pages, len(records)
+
+    def endpoints(self):
+        with self._lock:
+            return sorted({r["endpoint"] for r in self._records if r["endpoint"]})
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
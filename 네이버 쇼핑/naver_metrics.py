@@ -0,0 +1,172 @@
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# 지연 시간 히스토그램 버킷 (초, Prometheus 기본값 기반)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 백분위 계산용으로 보관할 최근 표본 수
+DEFAULT_RESERVOIR = 2048
+
+STAGES = ("sign", "http", "decode", "frame", "total")
+
+
+class Histogram:
+    """누적 버킷(내보내기용)과 최근 표본(백분위용)을 함께 가진 히스토그램"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, reservoir=DEFAULT_RESERVOIR):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=reservoir)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def percentiles(self, qs=(50, 95, 99)):
+        if not self.samples:
+            return [None] * len(qs)
+        return list(np.percentile(np.fromiter(self.samples, float, len(self.samples)), qs))
+
+
+class MetricsRegistry:
+    """카운터와 히스토그램 저장소 (레이블은 정렬된 (키, 값) 튜플)"""
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, endpoint, stage):
+        """with 블록 실행 시간을 naver_stage_seconds{endpoint, stage}에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("naver_stage_seconds", time.perf_counter() - started, endpoint=endpoint, stage=stage)
+
+    def record_response(self, endpoint, status, payload_bytes):
+        self.inc("naver_requests_total", endpoint=endpoint, status=str(status))
+        self.inc("naver_response_bytes_total", payload_bytes, endpoint=endpoint)
+
+    def record_error(self, endpoint, kind):
+        self.inc("naver_errors_total", endpoint=endpoint, kind=kind)
+
+    def counters(self):
+        """[(이름, 레이블 dict, 값)]"""
+        with self._lock:
+            return [(name, dict(labels), value) for (name, labels), value in self._counters.items()]
+
+    def latency_summary(self):
+        """엔드포인트 x 단계별 호출 수와 p50/p95/p99 (밀리초)"""
+        with self._lock:
+            items = [(dict(labels), h.count, h.percentiles()) for (name, labels), h in self._histograms.items()
+                     if name == "naver_stage_seconds"]
+        rows = []
+        for labels, count, (p50, p95, p99) in items:
+            rows.append({
+                "endpoint": labels.get("endpoint"),
+                "stage": labels.get("stage"),
+                "count": count,
+                "p50_ms": None if p50 is None else p50 * 1000,
+                "p95_ms": None if p95 is None else p95 * 1000,
+                "p99_ms": None if p99 is None else p99 * 1000,
+            })
+        stage_order = {s: i for i, s in enumerate(STAGES)}
+        rows.sort(key=lambda r: (r["endpoint"] or "", stage_order.get(r["stage"], len(STAGES))))
+        return rows
+
+    def render_prometheus(self, gauges=()):
+        """Prometheus 텍스트 형식으로 내보내기. gauges는 [(이름, 레이블 dict, 값)]"""
+        def fmt(labels):
+            if not labels:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for v in labels.values())
+            return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels.keys(), escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            histograms = [(key, list(h.counts), h.count, h.sum, h.buckets) for key, h in histograms]
+
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{fmt(dict(labels))} {value}")
+        for (name, labels), counts, count, total, buckets in histograms:
+            if name not in seen:
+                lines.append(f"# TYPE {name} histogram")
+                seen.add(name)
+            labels = dict(labels)
+            cumulative = 0
+            for bound, n in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{fmt(dict(labels, le=bound))} {cumulative}")
+            lines.append(f"{name}_sum{fmt(labels)} {total}")
+            lines.append(f"{name}_count{fmt(labels)} {count}")
+        for name, labels, value in gauges:
+            if name not in seen:
+                lines.append(f"# TYPE {name} gauge")
+                seen.add(name)
+            lines.append(f"{name}{fmt(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    """프로세스 전역 지표 저장소"""
+    return _metrics
+
+
+def mask_credential(credential):
+    """지표/화면 표시용 자격증명 마스킹 (앞 4자만 노출)"""
+    credential = str(credential)
+    return credential[:4] + "…" if len(credential) > 4 else credential
+
+
+def quota_gauges(snapshot):
+    """RateLimitScheduler.snapshot()을 Prometheus 게이지 목록으로 변환"""
+    gauges = []
+    for row in snapshot:
+        labels = {"credential": mask_credential(row["credential"]), "endpoint": row["endpoint"]}
+        gauges.append(("naver_quota_used_today", labels, row["used_today"]))
+        if row["remaining_today"] is not None:
+            gauges.append(("naver_quota_remaining_today", labels, row["remaining_today"]))
+        gauges.append(("naver_rate_limit_qps", labels, row["rate"]))
+    return gauges
@@ -0,0 +1,405 @@
+"""오프라인 테스트/벤치마크용 네이버 API 모의 서버
+
+쇼핑 검색(/v1/search/shop.json), 블로그 검색(/v1/search/blog), DataLab 검색어
+트렌드(/v1/datalab/search), 검색광고 키워드도구(/keywordstool)를 흉내 냅니다.
+응답은 쿼리에서 결정적으로 만들어지므로 같은 요청에는 항상 같은 결과가 나옵니다.
+
+사용 예:
+    python naver_mock_server.py --port 8700 --latency 0.05 --rate-429 0.02
+    NAVER_OPENAPI_BASE_URL=http://127.0.0.1:8700 NAVER_SEARCHAD_BASE_URL=http://127.0.0.1:8700 \\
+        streamlit run naver_keyword_app.py
+
+코드에서:
+    with MockNaverServer(latency=0.01) as server:
+        ...  # server.base_url 로 요청
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# 검색 API 파라미터 한계 (실제 API와 같음)
+MAX_DISPLAY = 100
+MAX_START = 1000
+MAX_HINT_KEYWORDS = 5
+DEFAULT_TOTAL = 1000
+# 키워드도구가 힌트 하나당 돌려주는 연관 키워드 수
+DEFAULT_RELATED_PER_HINT = 20
+
+MALLS = ["네이버", "쿠팡", "11번가", "G마켓", "옥션", "SSG닷컴", "롯데ON", "하이마트", "위메프", "티몬"]
+BRANDS = ["Apple", "삼성전자", "LG전자", "레노버", "ASUS", "HP", "Dell", ""]
+CATEGORIES = [
+    ("디지털/가전", "노트북", "", ""),
+    ("디지털/가전", "PC", "데스크탑", ""),
+    ("식품", "아이스크림", "", ""),
+    ("생활/건강", "주방용품", "조리도구", "프라이팬"),
+]
+RELATED_SUFFIXES = ["추천", "가격", "후기", "비교", "중고", "할인", "최저가", "순위", "브랜드", "신상",
+                    "구매", "리뷰", "사용법", "세일", "정품", "케이스", "가방", "거치대", "충전기", "파우치"]
+
+
+def _hash(*parts):
+    """요청 내용에서 결정적인 정수 (프로세스/실행과 무관)"""
+    return zlib.crc32("\0".join(str(p) for p in parts).encode("utf-8"))
+
+
+class MockNaverServer:
+    """백그라운드 스레드에서 도는 모의 서버
+
+    - latency/jitter: 응답마다 latency + uniform(0, jitter)초 지연
+    - rate_429: 이 확률로 429 Too Many Requests (Retry-After: retry_after)
+    - malformed_rate: 이 확률로 200과 함께 잘린 JSON 본문
+    - openapi_credentials: {client_id: client_secret}. None이면 비어 있지 않은 값은 모두 허용
+    - searchad_credentials: {api_key: (secret_key, customer_id)}. None이면 서명은
+      검사하지 않고 헤더 존재만 확인
+    - total: 검색 결과 총량 (블로그/쇼핑 공통, 최대 1000위까지 페이지 제공)
+
+    속성은 실행 중에도 바꿀 수 있고, stats에는 엔드포인트/상태별 요청 수가 쌓입니다.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, rate_429=0.0,
+                 malformed_rate=0.0, retry_after=None, openapi_credentials=None,
+                 searchad_credentials=None, total=DEFAULT_TOTAL,
+                 related_per_hint=DEFAULT_RELATED_PER_HINT, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self.openapi_credentials = openapi_credentials
+        self.searchad_credentials = searchad_credentials
+        self.total = total
+        self.related_per_hint = related_per_hint
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="naver-mock-server", daemon=True)
+            self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats.clear()
+
+    def _count(self, endpoint, status):
+        with self._lock:
+            self.stats[(endpoint, status)] += 1
+
+    def _roll(self, probability):
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < probability
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    # 인증
+
+    def check_openapi(self, headers):
+        client_id = headers.get("X-Naver-Client-Id", "")
+        client_secret = headers.get("X-Naver-Client-Secret", "")
+        if not client_id or not client_secret:
+            return False
+        if self.openapi_credentials is None:
+            return True
+        return self.openapi_credentials.get(client_id) == client_secret
+
+    def check_searchad(self, headers, method, uri):
+        api_key = headers.get("X-API-KEY", "")
+        customer_id = headers.get("X-Customer", "")
+        timestamp = headers.get("X-Timestamp", "")
+        signature = headers.get("X-Signature", "")
+        if not (api_key and customer_id and timestamp and signature):
+            return False
+        if self.searchad_credentials is None:
+            return True
+        secret_key, expected_customer = self.searchad_credentials.get(api_key, (None, None))
+        if secret_key is None or str(expected_customer) != customer_id:
+            return False
+        message = f"{timestamp}.{method}.{uri}".encode("utf-8")
+        expected = base64.b64encode(hmac.new(secret_key.encode("utf-8"), message, hashlib.sha256).digest())
+        return hmac.compare_digest(expected.decode("ascii"), signature)
+
+    # 응답 생성
+
+    def shop_items(self, query, start, display):
+        items = []
+        for rank in range(start, min(start + display, self.total + 1)):
+            h = _hash("shop", query, rank)
+            category = CATEGORIES[h % len(CATEGORIES)]
+            lprice = 1000 + h % 2000000
+            items.append({
+                "title": f"<b>{query}</b> 상품 {rank} &amp; 세트",
+                "link": f"https://search.shopping.naver.com/catalog/{80000000000 + h % 1000000000}",
+                "image": f"https://shopping-phinf.pstatic.net/main_{h % 100000000}.jpg",
+                "lprice": str(lprice),
+                "hprice": "" if h % 3 else str(lprice + h % 50000),
+                "mallName": MALLS[h % len(MALLS)],
+                "productId": str(80000000000 + h % 1000000000),
+                "productType": str(1 + h % 3),
+                "brand": BRANDS[h % len(BRANDS)],
+                "maker": BRANDS[(h // 7) % len(BRANDS)],
+                "category1": category[0],
+                "category2": category[1],
+                "category3": category[2],
+                "category4": category[3],
+            })
+        return items
+
+    def blog_items(self, query, start, display):
+        items = []
+        for rank in range(start, min(start + display, self.total + 1)):
+            h = _hash("blog", query, rank)
+            blogger = f"user{h % 500}"
+            items.append({
+                "title": f"<b>{query}</b> 후기 {rank}",
+                "link": f"https://blog.naver.com/{blogger}/{220000000000 + h % 1000000000}",
+                "description": f"오늘은 <b>{query}</b>에 대해 알아보겠습니다 &quot;{rank}&quot;",
+                "bloggername": f"블로거{h % 500}",
+                "bloggerlink": f"blog.naver.com/{blogger}",
+                "postdate": (date(2024, 1, 1) + timedelta(days=h % 365)).strftime("%Y%m%d"),
+            })
+        return items
+
+    def keyword_list(self, hints):
+        rows = []
+        for hint in hints:
+            for i in range(self.related_per_hint + 1):
+                keyword = hint if i == 0 else hint + RELATED_SUFFIXES[(i - 1) % len(RELATED_SUFFIXES)]
+                if i > len(RELATED_SUFFIXES):
+                    keyword += str(i)
+                h = _hash("keyword", keyword)
+                pc = h % 50000
+                mobile = (h // 50000) % 200000
+                rows.append({
+                    "relKeyword": keyword,
+                    "monthlyPcQcCnt": "< 10" if pc < 10 else pc,
+                    "monthlyMobileQcCnt": "< 10" if mobile < 10 else mobile,
+                    "monthlyAvePcClkCnt": round(pc * 0.01, 1),
+                    "monthlyAveMobileClkCnt": round(mobile * 0.02, 1),
+                    "monthlyAvePcCtr": round((h % 500) / 100, 2),
+                    "monthlyAveMobileCtr": round((h % 700) / 100, 2),
+                    "plAvgDepth": h % 16,
+                    "compIdx": ("낮음", "중간", "높음")[h % 3],
+                })
+        return rows
+
+    def trend_results(self, body):
+        start = date.fromisoformat(body["startDate"])
+        end = date.fromisoformat(body["endDate"])
+        unit = body.get("timeUnit", "date")
+        periods = []
+        current = start
+        while current <= end:
+            periods.append(current)
+            if unit == "month":
+                current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+            else:
+                current += timedelta(days=7 if unit == "week" else 1)
+        results = []
+        raw = {}
+        for group in body["keywordGroups"]:
+            name = group["groupName"]
+            raw[name] = [1 + _hash("trend", name, *group["keywords"], p) % 1000 for p in periods]
+        peak = max((max(values) for values in raw.values() if values), default=1)
+        for group in body["keywordGroups"]:
+            values = raw[group["groupName"]]
+            results.append({
+                "title": group["groupName"],
+                "keywords": group["keywords"],
+                "data": [{"period": p.isoformat(), "ratio": round(v / peak * 100, 5)}
+                         for p, v in zip(periods, values)],
+            })
+        return {"startDate": body["startDate"], "endDate": body["endDate"], "timeUnit": unit, "results": results}
+
+
+def _search_params(query):
+    """검색 API 공통 파라미터 검증 (오류 메시지 또는 None, query, display, start)"""
+    text = query.get("query", [""])[0]
+    try:
+        display = int(query.get("display", ["10"])[0])
+        start = int(query.get("start", ["1"])[0])
+    except ValueError:
+        return "Invalid display/start value", None, None, None
+    if not text:
+        return "Incorrect query request (잘못된 쿼리요청입니다.)", None, None, None
+    if not 1 <= display <= MAX_DISPLAY:
+        return "Invalid display value (부적절한 display 값입니다.)", None, None, None
+    if not 1 <= start <= MAX_START:
+        return "Invalid start value (부적절한 start 값입니다.)", None, None, None
+    return None, text, display, start
+
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 헤더와 본문을 따로 쓰므로 Nagle + 지연 ACK로 요청마다 ~40ms가 붙지 않도록
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, endpoint, status, payload=None, raw=None, headers=None):
+            server._count(endpoint, status)
+            body = raw if raw is not None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=1)
+                headers = dict(headers or {}, **{"Content-Encoding": "gzip"})
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, endpoint, status, message, code):
+            self._reply(endpoint, status, {"errorMessage": message, "errorCode": code})
+
+        def _faults(self, endpoint):
+            """지연, 429, 잘린 JSON 주입. 응답을 이미 보냈으면 True"""
+            server._delay()
+            if server._roll(server.rate_429):
+                headers = {} if server.retry_after is None else {"Retry-After": str(server.retry_after)}
+                self._reply(endpoint, 429, {"errorMessage": "Rate limit exceeded. (속도 제한을 초과했습니다.)",
+                                            "errorCode": "012"}, headers=headers)
+                return True
+            if server._roll(server.malformed_rate):
+                self._reply(endpoint, 200, raw=b'{"items": [{"title": "trunc')
+                return True
+            return False
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/keywordstool":
+                self._keywordstool(url.path, query)
+            elif url.path in ("/v1/search/shop.json", "/v1/search/shop"):
+                self._search("shop", query, server.shop_items)
+            elif url.path in ("/v1/search/blog", "/v1/search/blog.json"):
+                self._search("blog", query, server.blog_items)
+            else:
+                self._error("unknown", 404, "Not Found", "404")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            data = self.rfile.read(length) if length else b""
+            if url.path != "/v1/datalab/search":
+                self._error("unknown", 404, "Not Found", "404")
+                return
+            if not server.check_openapi(self.headers):
+                self._error("datalab", 401, "Authentication failed (인증에 실패했습니다.)", "024")
+                return
+            try:
+                body = json.loads(data.decode("utf-8"))
+                groups = body["keywordGroups"]
+                if not 1 <= len(groups) <= 5 or any(not g.get("keywords") for g in groups):
+                    raise ValueError("keywordGroups")
+                date.fromisoformat(body["startDate"])
+                date.fromisoformat(body["endDate"])
+            except (ValueError, KeyError, TypeError):
+                self._error("datalab", 400, "Invalid request body (잘못된 요청입니다.)", "400")
+                return
+            if self._faults("datalab"):
+                return
+            self._reply("datalab", 200, server.trend_results(body))
+
+        def _search(self, endpoint, query, make_items):
+            if not server.check_openapi(self.headers):
+                self._error(endpoint, 401, "Authentication failed (인증에 실패했습니다.)", "024")
+                return
+            error, text, display, start = _search_params(query)
+            if error:
+                self._error(endpoint, 400, error, "SE01")
+                return
+            if self._faults(endpoint):
+                return
+            self._reply(endpoint, 200, {
+                "lastBuildDate": "Mon, 01 Jan 2024 00:00:00 +0900",
+                "total": server.total,
+                "start": start,
+                "display": display,
+                "items": make_items(text, start, display),
+            })
+
+        def _keywordstool(self, uri, query):
+            if not server.check_searchad(self.headers, "GET", uri):
+                self._error("keywordstool", 401, "Invalid signature", "1016")
+                return
+            hints = [h for h in query.get("hintKeywords", [""])[0].split(",") if h]
+            if not hints or len(hints) > MAX_HINT_KEYWORDS or any(" " in h for h in hints):
+                self._error("keywordstool", 400, "Invalid hintKeywords", "11001")
+                return
+            if self._faults("keywordstool"):
+                return
+            self._reply("keywordstool", 200, {"keywordList": server.keyword_list(hints)})
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 API 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--latency", type=float, default=0.0, help="기본 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 최대값(초)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 확률")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="잘린 JSON 응답 확률")
+    parser.add_argument("--total", type=int, default=DEFAULT_TOTAL, help="검색 결과 총량")
+    args = parser.parse_args(argv)
+    server = MockNaverServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                             rate_429=args.rate_429, malformed_rate=args.malformed_rate, total=args.total)
+    print(f"모의 서버 실행 중: {server.start()} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
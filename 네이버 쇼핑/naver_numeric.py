@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+
+# 키워드도구가 10 미만 검색수를 "< 10"으로 주므로 중간값 5로 환산 (기존 convert_to_numeric과 동일)
+LESS_THAN_10_VALUE = 5
+LESS_THAN_TOKENS = ['< 10', '<10']
+
+# keywordList 숫자 필드별 압축 dtype
+COUNT_COLUMNS = ['monthlyPcQcCnt', 'monthlyMobileQcCnt']
+FLOAT_COLUMNS = ['monthlyAvePcClkCnt', 'monthlyAveMobileClkCnt',
+                 'monthlyAvePcCtr', 'monthlyAveMobileCtr', 'plAvgDepth']
+COMP_IDX_LEVELS = ['낮음', '중간', '높음']
+
+
+def _parse_numbers(values, index):
+    """object 배열을 float64로. 쉼표/공백 등 문자열이 섞인 경우에만 문자열 연산 사용"""
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        text = pd.Series(values, index=index).astype(str).str.replace(',', '', regex=False).str.strip()
+        return pd.to_numeric(text, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def to_search_count(series, less_than_value=LESS_THAN_10_VALUE):
+    """검색수 컬럼을 int32로 변환 ("< 10" -> 5, "1,234" -> 1234, 해석 불가 -> 0)"""
+    if pd.api.types.is_numeric_dtype(series):
+        numbers = series.to_numpy(dtype=np.float64)
+    else:
+        values = series.to_numpy()
+        values = np.where(series.isin(LESS_THAN_TOKENS).to_numpy(), less_than_value, values)
+        numbers = _parse_numbers(values, series.index)
+    return pd.Series(np.nan_to_num(numbers, nan=0).astype(np.int32), index=series.index, name=series.name)
+
+
+def to_compact_float(series):
+    """클릭수/클릭률/노출 광고수를 float32로 변환 (해석 불가 -> 0)"""
+    if pd.api.types.is_numeric_dtype(series):
+        numbers = series.to_numpy(dtype=np.float64)
+    else:
+        numbers = _parse_numbers(series.to_numpy(), series.index)
+    return pd.Series(np.nan_to_num(numbers, nan=0).astype(np.float32), index=series.index, name=series.name)
+
+
+def to_comp_idx(series):
+    """compIdx를 순서 있는 범주형으로 (낮음 < 중간 < 높음, 그 외 값은 결측)
+
+    문자열 비교 대신 factorize로 고유값만 한 번 매핑합니다.
+    """
+    codes, uniques = pd.factorize(series)
+    level_of = {level: i for i, level in enumerate(COMP_IDX_LEVELS)}
+    mapper = np.array([level_of.get(u, -1) for u in uniques] + [-1], dtype=np.int8)
+    # factorize의 결측 코드 -1은 mapper의 마지막 원소(-1)를 가리킴
+    return pd.Series(pd.Categorical.from_codes(mapper[codes], categories=COMP_IDX_LEVELS, ordered=True),
+                     index=series.index, name=series.name)
+
+
+def normalize_keyword_frame(df):
+    """keywordList DataFrame의 숫자 필드를 벡터 연산으로 정규화
+
+    검색수 원본 컬럼("< 10" 표기 유지)은 그대로 두고 '<컬럼>_num'(int32)과
+    'totalQcCnt'(PC+모바일)를 추가합니다. 나머지 숫자 필드는 float32로,
+    compIdx는 순서 있는 범주형으로 바꾼 새 DataFrame을 반환합니다.
+    """
+    out = df.copy()
+    for col in COUNT_COLUMNS:
+        if col in out.columns:
+            out[col + '_num'] = to_search_count(out[col])
+    for col in FLOAT_COLUMNS:
+        if col in out.columns:
+            out[col] = to_compact_float(out[col])
+    if 'compIdx' in out.columns:
+        out['compIdx'] = to_comp_idx(out['compIdx'])
+    if all(col + '_num' in out.columns for col in COUNT_COLUMNS):
+        out['totalQcCnt'] = (out['monthlyPcQcCnt_num'] + out['monthlyMobileQcCnt_num']).astype(np.int32)
+    return out
@@ -0,0 +1,144 @@
+import asyncio
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from naver_api import search_naver_shopping
+from naver_flight import ContextThreadPoolExecutor
+from naver_numeric import normalize_keyword_frame
+
+
+DEFAULT_CONCURRENCY = 8
+# compIdx(낮음, 중간, 높음)별 가중치와 compIdx가 없는 키워드의 가중치
+COMP_WEIGHTS = (1.0, 0.6, 0.3)
+MISSING_COMP_WEIGHT = 0.6
+
+OPPORTUNITY_COLUMNS = {
+    'relKeyword': '키워드',
+    'totalQcCnt': '총 검색수',
+    'shoppingTotal': '쇼핑 상품 수',
+    'volumePerProduct': '상품당 검색수',
+    'ctrDemand': '예상 클릭수',
+    'compIdx': '경쟁정도',
+    'compWeight': '경쟁 가중치',
+    'opportunity': '기회 점수',
+}
+
+
+def _shopping_total(result):
+    return int(result.get("total", 0) or 0)
+
+
+def fetch_shopping_totals(keywords, client_id, client_secret, concurrency=DEFAULT_CONCURRENCY, on_progress=None):
+    """키워드별 쇼핑 검색 결과 총량을 병렬 조회 (float64 배열, 실패는 NaN), 오류 목록
+
+    총량만 필요하므로 display=1로 가장 작은 응답을 받습니다.
+    on_progress(완료 수, 전체 수)는 응답이 올 때마다 호출됩니다.
+    """
+    totals = np.full(len(keywords), np.nan)
+    errors = []
+    if not keywords:
+        return totals, errors
+    with ContextThreadPoolExecutor(max_workers=max(1, min(concurrency, len(keywords)))) as executor:
+        futures = {executor.submit(search_naver_shopping, keyword, client_id, client_secret, 1): i
+                   for i, keyword in enumerate(keywords)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            result, error = future.result()
+            if error:
+                errors.append(f"[{keywords[i]}] {error}")
+            else:
+                totals[i] = _shopping_total(result)
+            if on_progress is not None:
+                on_progress(done, len(keywords))
+    return totals, errors
+
+
+async def fetch_shopping_totals_async(client, keywords):
+    """fetch_shopping_totals의 async 버전 (client: naver_async.AsyncNaverClient)"""
+    results = await asyncio.gather(*(client.search_naver_shopping(keyword, display=1) for keyword in keywords))
+    totals = np.full(len(keywords), np.nan)
+    errors = []
+    for i, (result, error) in enumerate(results):
+        if error:
+            errors.append(f"[{keywords[i]}] {error}")
+        else:
+            totals[i] = _shopping_total(result)
+    return totals, errors
+
+
+def _column(df, name):
+    if name not in df.columns:
+        return np.zeros(len(df))
+    return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def opportunity_scores(df, shopping_totals, comp_weights=COMP_WEIGHTS, missing_weight=MISSING_COMP_WEIGHT):
+    """키워드도구 결과와 쇼핑 상품 수로 기회 지표를 벡터 연산으로 계산해 순위표 반환
+
+    - volumePerProduct: 총 검색수 / (쇼핑 상품 수 + 1)
+    - ctrDemand: PC/모바일 검색수 x 클릭률로 본 예상 월간 클릭수
+    - compWeight: compIdx(낮음/중간/높음) 가중치
+    - opportunity: compWeight x log1p(ctrDemand) x log1p(volumePerProduct)를
+      최댓값 100으로 맞춘 점수. 상품 수를 못 받은 키워드는 결측이며 맨 뒤로 갑니다.
+
+    df는 keywordList DataFrame (원본 또는 normalize_keyword_frame 결과),
+    shopping_totals는 df 행 순서와 같은 상품 수 배열입니다.
+    """
+    if 'totalQcCnt' not in df.columns:
+        df = normalize_keyword_frame(df)
+    pc = _column(df, 'monthlyPcQcCnt_num')
+    mobile = _column(df, 'monthlyMobileQcCnt_num')
+    volume = pc + mobile
+    # 클릭률은 % 단위
+    demand = pc * _column(df, 'monthlyAvePcCtr') / 100 + mobile * _column(df, 'monthlyAveMobileCtr') / 100
+    products = np.asarray(shopping_totals, dtype=np.float64)
+    volume_per_product = volume / (products + 1)
+
+    if 'compIdx' in df.columns and isinstance(df['compIdx'].dtype, pd.CategoricalDtype):
+        codes = df['compIdx'].cat.codes.to_numpy()
+    else:
+        codes = np.full(len(df), -1)
+    # 결측 코드 -1은 마지막 원소(missing_weight)를 가리킴
+    weight = np.append(np.asarray(comp_weights, dtype=np.float64), missing_weight)[codes]
+
+    raw = weight * np.log1p(demand) * np.log1p(volume_per_product)
+    peak = np.nanmax(raw) if np.isfinite(raw).any() else 0.0
+    score = raw / peak * 100 if peak > 0 else np.where(np.isnan(raw), np.nan, 0.0)
+
+    out = pd.DataFrame({
+        'relKeyword': df['relKeyword'].to_numpy(),
+        'totalQcCnt': volume.astype(np.int32),
+        'shoppingTotal': pd.array(products, dtype="Float64").astype("Int64"),
+        'volumePerProduct': volume_per_product.astype(np.float32),
+        'ctrDemand': demand.astype(np.float32),
+        'compIdx': df['compIdx'].array if 'compIdx' in df.columns else None,
+        'compWeight': weight.astype(np.float32),
+        'opportunity': score.astype(np.float32),
+    })
+    return out.sort_values('opportunity', ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+
+
+def select_candidates(df, min_volume=0, max_keywords=None):
+    """점수 계산 대상 키워드 (정규화, relKeyword 중복 제거, 최소 검색수, 검색수 상위 max_keywords개)"""
+    if df is None or df.empty or 'relKeyword' not in df.columns:
+        return pd.DataFrame(columns=['relKeyword'])
+    if 'totalQcCnt' not in df.columns:
+        df = normalize_keyword_frame(df)
+    df = df.drop_duplicates(subset='relKeyword', keep='first')
+    df = df[df['totalQcCnt'] >= min_volume]
+    if max_keywords is not None:
+        df = df.nlargest(max_keywords, 'totalQcCnt', keep='first')
+    return df.reset_index(drop=True)
+
+
+def score_keywords(df, client_id, client_secret, min_volume=0, max_keywords=None,
+                   concurrency=DEFAULT_CONCURRENCY, on_progress=None):
+    """키워드도구 결과에 쇼핑 상품 수를 붙여 기회 점수 순위표를 만듦 (DataFrame, 오류 목록)"""
+    candidates = select_candidates(df, min_volume, max_keywords)
+    if candidates.empty:
+        return pd.DataFrame(columns=list(OPPORTUNITY_COLUMNS)), []
+    totals, errors = fetch_shopping_totals(candidates['relKeyword'].tolist(), client_id, client_secret,
+                                           concurrency, on_progress)
+    return opportunity_scores(candidates, totals), errors
@@ -0,0 +1,73 @@
+"""주기 수집기 공용 부분: KST 날짜/시각 변환과 interval 초마다 run_once를 도는 루프
+
+naver_history(순위 이력)와 naver_price(가격 변동)가 함께 씁니다.
+"""
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from naver_ratelimit import KST
+
+
+def day_of(ts):
+    """유닉스 시각 -> KST 날짜 정수 (YYYYMMDD, 날짜 파티션 키)"""
+    return int(datetime.fromtimestamp(ts, KST).strftime("%Y%m%d"))
+
+
+def to_ts(value, end_of_day=False):
+    """'YYYY-MM-DD'/datetime -> 유닉스 시각 (시간대가 없으면 KST)
+
+    end_of_day가 참이고 value가 자정이면 그날 23:59:59로 봅니다 (기간 끝 포함).
+    """
+    moment = pd.Timestamp(value)
+    if moment.tzinfo is None:
+        moment = moment.tz_localize(KST)
+    if end_of_day and moment == moment.normalize():
+        moment = moment + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    return int(moment.timestamp())
+
+
+class PeriodicCollector:
+    """interval 초마다 run_once()를 실행하는 수집기 기반 클래스
+
+    하위 클래스는 run_once()가 (조회 건수, 변경 건수)를 반환하도록 구현합니다.
+    checked_label은 로그의 조회 단위, thread_name은 백그라운드 스레드 이름입니다.
+    """
+
+    checked_label = "조회"
+    thread_name = "collector"
+
+    def __init__(self, interval, on_error=None):
+        self.interval = interval
+        self.on_error = on_error or (lambda message: print(f"[ERROR] {message}", file=sys.stderr))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        raise NotImplementedError
+
+    def run_forever(self):
+        """stop()이 호출될 때까지 interval 초마다 run_once 실행"""
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                checked, changed = self.run_once()
+                print(f"[INFO] {datetime.now(KST):%Y-%m-%d %H:%M:%S} "
+                      f"{self.checked_label} {checked}건, 변경 {changed}건")
+            except Exception as e:
+                self.on_error(f"수집 실패: {e}")
+            self._stop.wait(max(0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        """백그라운드 스레드에서 수집 시작"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name=self.thread_name, daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,292 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from naver_cache import DATA_DIR
+from naver_metrics import mask_credential
+from naver_ratelimit import KST, add_listener, remove_listener, get_scheduler
+
+
+# 설정 파일 형식 (JSON):
+# {"openapi": [{"client_id": "...", "client_secret": "..."}],
+#  "searchad": [{"api_key": "...", "secret_key": "...", "customer_id": "..."}]}
+DEFAULT_CONFIG_PATH = os.path.join(DATA_DIR, "credentials.json")
+KIND_FIELDS = {
+    "openapi": ("client_id", "client_secret"),
+    "searchad": ("api_key", "secret_key", "customer_id"),
+}
+# 스케줄러/한도에서 자격증명을 구분하는 필드 (fetcher가 scheduler.call에 넘기는 값)
+KIND_ID_FIELD = {"openapi": "client_id", "searchad": "customer_id"}
+
+# 인증 오류(401/403) 시 제외 시간. 연속 실패마다 두 배, 최대 AUTH_COOLDOWN_MAX
+AUTH_COOLDOWN = 600
+AUTH_COOLDOWN_MAX = 6 * 3600
+# 429를 받은 키를 다른 호출자가 잠시 피하도록 하는 제외 시간 (연속마다 두 배, 최대 THROTTLE_COOLDOWN_MAX)
+THROTTLE_COOLDOWN = 5
+THROTTLE_COOLDOWN_MAX = 3600
+# 지연 시간 지수 이동 평균 가중치와 점수 계산 시 하한 (초).
+# 아직 측정하지 않은 키는 하한으로 보아 먼저 한 번 써 봄
+LATENCY_ALPHA = 0.2
+MIN_LATENCY = 0.01
+
+
+def credential_fingerprint(kind, credentials):
+    """자격증명 dict의 지문 (작업 큐처럼 키를 저장하면 안 되는 곳에서 같은 키를 다시 찾는 용도)"""
+    values = "\0".join(str(credentials.get(field, "")).strip() for field in KIND_FIELDS[kind])
+    return hashlib.sha256(values.encode("utf-8")).hexdigest()[:16]
+
+
+def _next_kst_midnight(now=None):
+    moment = datetime.fromtimestamp(now if now is not None else time.time(), KST)
+    return (moment.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)).timestamp()
+
+
+class PooledKey:
+    """풀 안의 자격증명 하나와 상태 (제외 여부, 지연 시간, 사용량)"""
+
+    def __init__(self, kind, credentials):
+        self.kind = kind
+        self.credentials = credentials
+        self.id = credentials[KIND_ID_FIELD[kind]]
+        self.latency = None
+        self.inflight = 0
+        self.requests = 0
+        self.errors = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.failures = 0
+        self.last_error = None
+
+    def available(self, now):
+        return now >= self.ejected_until
+
+    def eject(self, seconds, reason, now):
+        self.ejected_until = max(self.ejected_until, now + seconds)
+        self.ejections += 1
+        self.last_error = reason
+
+
+class CredentialPool:
+    """같은 종류(openapi/searchad) 자격증명 여러 개에 요청을 나누는 풀 (스레드 안전)
+
+    남은 일일 한도 비율이 크고 지연 시간이 짧으며 진행 중인 요청이 적은 키를
+    고릅니다. 인증 오류(401/403)나 일일 한도 초과가 난 키는 일정 시간(한도는 KST
+    자정까지) 제외했다가 자동으로 다시 씁니다. 응답 상태와 지연 시간은
+    naver_ratelimit 스케줄러 이벤트로 받으므로 fetcher 코드는 풀을 몰라도 됩니다.
+    """
+
+    def __init__(self, kind, credentials):
+        if kind not in KIND_FIELDS:
+            raise ValueError(f"알 수 없는 자격증명 종류: {kind}")
+        self.kind = kind
+        self._keys = {}
+        for creds in credentials:
+            key = PooledKey(kind, {field: str(creds[field]).strip() for field in KIND_FIELDS[kind]})
+            if key.id and all(key.credentials.values()):
+                self._keys.setdefault(key.id, key)
+        self._lock = threading.Lock()
+        # 같은 키 구성이면 같은 값: 캐시 키에서 개별 자격증명 대신 사용
+        ids = "\0".join(sorted(self._keys))
+        self.scope = f"pool:{kind}:" + hashlib.sha256(ids.encode("utf-8")).hexdigest()[:16]
+        add_listener(self._on_event)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _on_event(self, credential, endpoint, status, latency):
+        key = self._keys.get(credential)
+        if key is None:
+            return
+        now = time.time()
+        with self._lock:
+            if status == "quota":
+                key.eject(_next_kst_midnight(now) - now, f"{endpoint} 일일 한도 초과", now)
+                return
+            key.requests += 1
+            if latency is not None:
+                key.latency = latency if key.latency is None else (
+                    (1 - LATENCY_ALPHA) * key.latency + LATENCY_ALPHA * latency)
+            if status in (401, 403):
+                key.errors += 1
+                key.failures += 1
+                key.eject(min(AUTH_COOLDOWN_MAX, AUTH_COOLDOWN * 2 ** (key.failures - 1)),
+                          f"{endpoint} 인증 오류 {status}", now)
+            elif status == 429:
+                key.errors += 1
+                key.failures += 1
+                key.eject(min(THROTTLE_COOLDOWN_MAX, THROTTLE_COOLDOWN * 2 ** (key.failures - 1)),
+                          f"{endpoint} 429 Too Many Requests", now)
+            elif status < 500:
+                key.failures = 0
+
+    def _score(self, key, endpoint):
+        remaining = get_scheduler().remaining(key.id, endpoint)
+        if remaining == 0:
+            return None
+        limit = get_scheduler().limits.get(endpoint, (None, None))[1]
+        headroom = 1.0 if remaining is None or not limit else remaining / limit
+        latency = key.latency if key.latency is not None else MIN_LATENCY
+        return headroom / (max(latency, MIN_LATENCY) * (1 + key.inflight))
+
+    def acquire(self, endpoint, exclude=()):
+        """요청에 쓸 키 하나를 골라 진행 중으로 표시. 쓸 수 있는 키가 없으면 None"""
+        now = time.time()
+        with self._lock:
+            best, best_score = None, None
+            for key in self._keys.values():
+                if key.id in exclude or not key.available(now):
+                    continue
+                score = self._score(key, endpoint)
+                if score is not None and (best_score is None or score > best_score):
+                    best, best_score = key, score
+            if best is not None:
+                best.inflight += 1
+            return best
+
+    def release(self, key):
+        with self._lock:
+            key.inflight -= 1
+
+    def call(self, endpoint, fetch, is_success, unavailable):
+        """fetch(credentials dict)를 고른 키로 실행
+
+        실패했고 그 사이 키가 제외됐다면 (인증 오류, 한도 초과, 계속된 429) 아직
+        쓰지 않은 다른 키로 다시 시도합니다. 쓸 수 있는 키가 없으면
+        unavailable(메시지)의 결과를 반환합니다.
+        """
+        tried = set()
+        result = None
+        while True:
+            key = self.acquire(endpoint, exclude=tried)
+            if key is None:
+                if result is not None:
+                    return result
+                return unavailable(f"사용 가능한 {self.kind} API 키가 없습니다 (모두 제외 또는 한도 소진).")
+            tried.add(key.id)
+            ejections = key.ejections
+            try:
+                result = fetch(dict(key.credentials))
+            finally:
+                self.release(key)
+            if is_success(result) or key.ejections == ejections:
+                return result
+
+    async def call_async(self, endpoint, fetch, is_success, unavailable):
+        """call의 async 버전 (fetch는 자격증명 dict를 받는 코루틴 함수)"""
+        tried = set()
+        result = None
+        while True:
+            key = self.acquire(endpoint, exclude=tried)
+            if key is None:
+                if result is not None:
+                    return result
+                return unavailable(f"사용 가능한 {self.kind} API 키가 없습니다 (모두 제외 또는 한도 소진).")
+            tried.add(key.id)
+            ejections = key.ejections
+            try:
+                result = await fetch(dict(key.credentials))
+            finally:
+                self.release(key)
+            if is_success(result) or key.ejections == ejections:
+                return result
+
+    def find(self, fingerprint):
+        """credential_fingerprint가 같은 키의 자격증명 dict (없으면 None)"""
+        for key in self._keys.values():
+            if credential_fingerprint(self.kind, key.credentials) == fingerprint:
+                return dict(key.credentials)
+        return None
+
+    def reinstate(self, key_id=None):
+        """제외된 키를 즉시 복귀 (key_id 생략 시 전체)"""
+        with self._lock:
+            for key in self._keys.values():
+                if key_id is None or key.id == key_id:
+                    key.ejected_until = 0.0
+                    key.failures = 0
+
+    def usage(self):
+        """키별 사용 현황 (표시용, 자격증명은 마스킹)"""
+        now = time.time()
+        snapshot = {}
+        for row in get_scheduler().snapshot():
+            snapshot.setdefault(row["credential"], []).append(row)
+        rows = []
+        with self._lock:
+            for key in self._keys.values():
+                quota = snapshot.get(key.id, [])
+                rows.append({
+                    "kind": self.kind,
+                    "key": mask_credential(key.id),
+                    "status": "사용 중" if key.available(now) else
+                              "제외 (~" + datetime.fromtimestamp(key.ejected_until, KST).strftime("%m-%d %H:%M") + ")",
+                    "requests": key.requests,
+                    "errors": key.errors,
+                    "inflight": key.inflight,
+                    "latency_ms": None if key.latency is None else round(key.latency * 1000, 1),
+                    "used_today": sum(r["used_today"] for r in quota),
+                    "remaining_today": ", ".join(
+                        f"{r['endpoint']} {r['remaining_today']:,}" for r in quota if r["remaining_today"] is not None
+                    ) or None,
+                    "last_error": key.last_error,
+                })
+        return rows
+
+
+def load_credentials(path=None, environ=None):
+    """설정 파일과 환경 변수에서 {종류: [자격증명 dict]}를 읽음
+
+    설정 파일: path, 없으면 NAVER_CREDENTIALS_FILE, 없으면 DATA_DIR/credentials.json.
+    환경 변수: NAVER_CREDENTIALS (설정 파일과 같은 JSON), 그리고 단일 키용
+    NAVER_CLIENT_ID/NAVER_CLIENT_SECRET, NAVER_API_KEY/NAVER_SECRET_KEY/NAVER_CUSTOMER_ID.
+    """
+    environ = os.environ if environ is None else environ
+    sources = []
+    path = path or environ.get("NAVER_CREDENTIALS_FILE") or DEFAULT_CONFIG_PATH
+    if os.path.exists(path):
+        with open(path, encoding="utf-8-sig") as f:
+            sources.append(json.load(f))
+    if environ.get("NAVER_CREDENTIALS"):
+        sources.append(json.loads(environ["NAVER_CREDENTIALS"]))
+    sources.append({
+        "openapi": [{"client_id": environ.get("NAVER_CLIENT_ID", ""),
+                     "client_secret": environ.get("NAVER_CLIENT_SECRET", "")}],
+        "searchad": [{"api_key": environ.get("NAVER_API_KEY", ""),
+                      "secret_key": environ.get("NAVER_SECRET_KEY", ""),
+                      "customer_id": environ.get("NAVER_CUSTOMER_ID", "")}],
+    })
+    credentials = {kind: [] for kind in KIND_FIELDS}
+    for source in sources:
+        for kind, fields in KIND_FIELDS.items():
+            for entry in source.get(kind, []):
+                if all(entry.get(field) for field in fields):
+                    credentials[kind].append(entry)
+    return credentials
+
+
+_pools = None
+_pools_lock = threading.Lock()
+
+
+def get_pool(kind):
+    """전역 키 풀 (처음 호출 시 load_credentials로 구성). 키가 없으면 None"""
+    global _pools
+    with _pools_lock:
+        if _pools is None:
+            loaded = load_credentials()
+            _pools = {kind_: CredentialPool(kind_, entries) for kind_, entries in loaded.items()}
+        pool = _pools.get(kind)
+    return pool if pool else None
+
+
+def configure_pools(**credentials):
+    """전역 키 풀 교체. 예: configure_pools(openapi=[{...}], searchad=[{...}])"""
+    global _pools
+    with _pools_lock:
+        for pool in (_pools or {}).values():
+            remove_listener(pool._on_event)
+        _pools = {kind: CredentialPool(kind, credentials.get(kind, [])) for kind in KIND_FIELDS}
+        return _pools
@@ -0,0 +1,435 @@
+"""쇼핑 가격 변동 감시기
+
+사용 예:
+    python naver_price.py watch keywords.txt --interval 600 --outbox alerts.jsonl
+    python naver_price.py watch keywords.txt --once --pages 3 --webhook http://localhost:9000/hook
+    python naver_price.py changes --keyword 노트북 --start 2024-01-01 -o changes.csv
+
+keywords 파일은 한 줄에 키워드 하나입니다 (빈 줄과 '#'으로 시작하는 줄은 무시).
+키워드마다 쇼핑 검색 상위 pages x 100개 상품의 최저가/최고가/쇼핑몰을 마지막으로 본
+값과 비교해 바뀐 상품(price, mall), 새로 들어온 상품(new), 빠진 상품(dropped)만
+저장하고 알림으로 내보냅니다. 처음 조회하는 키워드는 기준값만 저장합니다.
+API 키는 NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경 변수 또는 naver_pool 키 풀에서 읽습니다.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from naver_api import search_naver_shopping
+from naver_cache import DATA_DIR
+from naver_export import ResultWriter
+from naver_flight import ContextThreadPoolExecutor
+from naver_http import get_client
+from naver_items import shop_json_frame
+from naver_periodic import PeriodicCollector, day_of, to_ts
+from naver_pool import get_pool
+from naver_ratelimit import KST
+
+
+DEFAULT_PRICES_PATH = os.path.join(DATA_DIR, "prices.sqlite3")
+DEFAULT_OUTBOX_PATH = os.path.join(DATA_DIR, "price_alerts.jsonl")
+DEFAULT_INTERVAL = 600
+DEFAULT_PAGES = 1
+DEFAULT_CONCURRENCY = 8
+PAGE_SIZE = 100
+# 스냅샷 비교 키와 비교 값
+KEY_COLUMNS = ["keyword", "productId"]
+VALUE_COLUMNS = ["lprice", "hprice", "mallName"]
+CHANGE_KINDS = ("new", "dropped", "price", "mall", "price,mall")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL UNIQUE,
+    checked_ts INTEGER
+);
+-- (키워드, 상품ID)별 마지막으로 본 값. 바뀐 상품만 다시 씀
+CREATE TABLE IF NOT EXISTS snapshot (
+    keyword_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    lprice INTEGER,
+    hprice INTEGER,
+    mall TEXT,
+    title TEXT,
+    PRIMARY KEY (keyword_id, product_id)
+) WITHOUT ROWID;
+-- 변경 이력 (키워드, 시각) 순으로 클러스터링
+CREATE TABLE IF NOT EXISTS changes (
+    keyword_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    change TEXT NOT NULL,
+    old_lprice INTEGER,
+    lprice INTEGER,
+    old_hprice INTEGER,
+    hprice INTEGER,
+    old_mall TEXT,
+    mall TEXT,
+    title TEXT,
+    rank INTEGER,
+    PRIMARY KEY (keyword_id, ts, product_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_changes_day ON changes (day, keyword_id);
+"""
+
+CHANGE_COLUMNS = {
+    'changed_at': '감지 시각',
+    'keyword': '키워드',
+    'productId': '상품ID',
+    'change': '변경',
+    'old_lprice': '이전 최저가',
+    'lprice': '최저가',
+    'lprice_delta': '최저가 변동',
+    'lprice_pct': '변동률(%)',
+    'old_hprice': '이전 최고가',
+    'hprice': '최고가',
+    'old_mallName': '이전 쇼핑몰',
+    'mallName': '쇼핑몰',
+    'title': '상품명',
+    'rank': '순위',
+}
+
+
+def _typed(df):
+    """비교용 dtype으로 통일 (가격/상품ID는 Int64, 쇼핑몰/상품명은 string)"""
+    df = df.copy()
+    for column in ("productId", "lprice", "hprice"):
+        df[column] = pd.to_numeric(df[column]).astype("Int64")
+    for column in ("mallName", "title"):
+        df[column] = df[column].astype("string")
+    return df
+
+
+def _differs(old, new):
+    """결측끼리는 같고 결측과 값은 다르다고 보는 벡터 비교"""
+    return (old != new).fillna(False).astype(bool) | (old.isna() != new.isna())
+
+
+def diff_snapshots(previous, current):
+    """이전/현재 스냅샷을 (keyword, productId)로 맞춰 바뀐 행만 반환
+
+    previous, current는 keyword, productId, lprice, hprice, mallName, title 컬럼을
+    가진 DataFrame이며 current에는 rank도 있습니다. previous에 있고 current에 없는
+    상품은 dropped가 되므로 previous는 이번에 조회에 성공한 키워드만 넘겨야 합니다.
+    """
+    merged = previous.merge(current, on=KEY_COLUMNS, how="outer", suffixes=("_old", ""), indicator=True)
+    side = merged.pop("_merge")
+    new = (side == "right_only").to_numpy()
+    dropped = (side == "left_only").to_numpy()
+    both = (side == "both").to_numpy()
+    price = both & (_differs(merged["lprice_old"], merged["lprice"])
+                    | _differs(merged["hprice_old"], merged["hprice"])).to_numpy()
+    mall = both & _differs(merged["mallName_old"], merged["mallName"]).to_numpy()
+    change = np.select([new, dropped, price & mall, price, mall],
+                       ["new", "dropped", "price,mall", "price", "mall"], default="")
+    keep = change != ""
+
+    out = merged[keep].reset_index(drop=True)
+    out.insert(2, "change", pd.Categorical(change[keep], categories=CHANGE_KINDS))
+    out["title"] = out["title"].fillna(out.pop("title_old"))
+    out["lprice_delta"] = out["lprice"] - out["lprice_old"]
+    out["lprice_pct"] = (out["lprice_delta"] / out["lprice_old"] * 100).astype("Float64").round(2)
+    out = out.rename(columns={f"{c}_old": f"old_{c}" for c in VALUE_COLUMNS})
+    if "rank" in out.columns:
+        out["rank"] = out["rank"].astype("Int32")
+    columns = [c for c in CHANGE_COLUMNS if c in out.columns]
+    return out[columns].sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)
+
+
+def _records(df):
+    """NaN/NA를 None으로 바꾼 튜플 목록 (SQLite 바인딩용)"""
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
+
+class PriceSnapshotStore:
+    """(키워드, 상품ID) 스냅샷과 변경 이력을 보관하는 SQLite 저장소 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_PRICES_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _keyword_ids(self, keywords):
+        """키워드별 (id, 마지막 확인 시각) (없으면 생성)"""
+        self._db.executemany("INSERT OR IGNORE INTO keywords (keyword) VALUES (?)", [(k,) for k in keywords])
+        ids = {}
+        for keyword in keywords:
+            ids[keyword] = self._db.execute(
+                "SELECT id, checked_ts FROM keywords WHERE keyword = ?", (keyword,)).fetchone()
+        return ids
+
+    def _load(self, keyword_ids):
+        """keyword_ids의 스냅샷 (기본 키 범위 조회, 바인딩 변수 제한 때문에 500개씩)"""
+        frames = []
+        for i in range(0, len(keyword_ids), 500):
+            chunk = keyword_ids[i:i + 500]
+            frames.append(pd.read_sql_query(
+                "SELECT k.keyword, s.product_id AS productId, s.lprice, s.hprice, s.mall AS mallName, s.title "
+                f"FROM snapshot s JOIN keywords k ON k.id = s.keyword_id "
+                f"WHERE s.keyword_id IN ({','.join('?' * len(chunk))})", self._db, params=chunk))
+        if not frames:
+            return _typed(pd.DataFrame(columns=KEY_COLUMNS + VALUE_COLUMNS + ["title"]))
+        return _typed(pd.concat(frames, ignore_index=True))
+
+    def apply(self, current, keywords, ts=None):
+        """이번 조회 결과를 스냅샷과 비교해 바뀐 행만 기록하고 변경 DataFrame을 반환
+
+        current는 keywords(조회에 성공한 키워드) 전체의 현재 상품 목록입니다.
+        처음 보는 키워드는 스냅샷만 채우고 new로 알리지 않습니다. 값이 같은 상품은
+        다시 쓰지 않습니다.
+        """
+        ts = int(ts if ts is not None else time.time())
+        keywords = list(dict.fromkeys(keywords))
+        current = _typed(current)
+        with self._lock, self._db:
+            ids = self._keyword_ids(keywords)
+            previous = self._load([ids[k][0] for k in keywords])
+            changes = diff_snapshots(previous, current)
+            baseline = {k for k in keywords if ids[k][1] is None}
+            key_id = changes["keyword"].map({k: v[0] for k, v in ids.items()})
+
+            stored = changes[changes["change"] != "dropped"]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO snapshot (keyword_id, product_id, lprice, hprice, mall, title) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                _records(pd.concat([key_id[stored.index], stored[["productId", "lprice", "hprice", "mallName",
+                                                                  "title"]]], axis=1)))
+            dropped = changes[changes["change"] == "dropped"]
+            self._db.executemany(
+                "DELETE FROM snapshot WHERE keyword_id = ? AND product_id = ?",
+                _records(pd.concat([key_id[dropped.index], dropped["productId"]], axis=1)))
+
+            changes = changes[~changes["keyword"].isin(baseline)].reset_index(drop=True)
+            history = changes.assign(keyword=changes["keyword"].map({k: v[0] for k, v in ids.items()}),
+                                     ts=ts, day=day_of(ts))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO changes (keyword_id, ts, product_id, day, change, old_lprice, lprice, "
+                "old_hprice, hprice, old_mall, mall, title, rank) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _records(history[["keyword", "ts", "productId", "day", "change", "old_lprice", "lprice",
+                                  "old_hprice", "hprice", "old_mallName", "mallName", "title", "rank"]]))
+            self._db.executemany("UPDATE keywords SET checked_ts = ? WHERE keyword = ?",
+                                 [(ts, k) for k in keywords])
+        changes.insert(0, "changed_at", pd.Timestamp(ts, unit="s", tz="UTC").tz_convert(KST))
+        return changes
+
+    def changes(self, keyword=None, change=None, start=None, end=None):
+        """변경 이력 조회 (start/end는 'YYYY-MM-DD' 또는 datetime, KST 기준, end 포함)"""
+        where = []
+        params = []
+        if keyword:
+            where.append("k.keyword = ?")
+            params.append(keyword)
+        if change:
+            where.append("c.change = ?")
+            params.append(change)
+        # day 조건을 함께 걸어 키워드 조건이 없을 때도 날짜 인덱스를 타게 함
+        if start:
+            start_ts = to_ts(start)
+            where += ["c.day >= ?", "c.ts >= ?"]
+            params += [day_of(start_ts), start_ts]
+        if end:
+            end_ts = to_ts(end, end_of_day=True)
+            where += ["c.day <= ?", "c.ts <= ?"]
+            params += [day_of(end_ts), end_ts]
+        sql = ("SELECT c.ts, k.keyword, c.product_id AS productId, c.change, c.old_lprice, c.lprice, "
+               "c.old_hprice, c.hprice, c.old_mall AS old_mallName, c.mall AS mallName, c.title, c.rank "
+               "FROM changes c JOIN keywords k ON k.id = c.keyword_id")
+        sql += (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY c.ts, k.keyword, c.product_id"
+        with self._lock:
+            df = pd.read_sql_query(sql, self._db, params=params)
+        df.insert(0, "changed_at", pd.to_datetime(df.pop("ts"), unit="s", utc=True).dt.tz_convert(KST))
+        for column in ("productId", "old_lprice", "lprice", "old_hprice", "hprice"):
+            df[column] = df[column].astype("Int64")
+        df["rank"] = df["rank"].astype("Int32")
+        df["lprice_delta"] = df["lprice"] - df["old_lprice"]
+        df["lprice_pct"] = (df["lprice_delta"] / df["old_lprice"] * 100).astype("Float64").round(2)
+        return df[list(CHANGE_COLUMNS)]
+
+    def summary(self):
+        """키워드 수, 추적 중인 상품 수, 변경 이력 수"""
+        with self._lock:
+            return dict(zip(("keywords", "products", "changes"), self._db.execute(
+                "SELECT (SELECT COUNT(*) FROM keywords), (SELECT COUNT(*) FROM snapshot), "
+                "(SELECT COUNT(*) FROM changes)").fetchone()))
+
+    def close(self):
+        self._db.close()
+
+
+def fetch_snapshots(keywords, client_id, client_secret, pages=DEFAULT_PAGES, concurrency=DEFAULT_CONCURRENCY):
+    """키워드별 쇼핑 검색 상위 pages x 100개 상품 (DataFrame, 성공한 키워드 목록, 오류 목록)
+
+    한 페이지라도 실패한 키워드는 결과에서 빼서 빠진 상품으로 잘못 잡히지 않게 합니다.
+    감시는 최신 값이 필요하므로 응답 캐시를 쓰지 않습니다.
+    """
+    jobs = [(keyword, 1 + page * PAGE_SIZE) for keyword in keywords for page in range(pages)]
+    frames = {}
+    errors = {}
+    with ContextThreadPoolExecutor(max_workers=max(1, min(concurrency, len(jobs)))) as executor:
+        results = executor.map(
+            lambda job: search_naver_shopping(job[0], client_id, client_secret, PAGE_SIZE, job[1], use_cache=False),
+            jobs)
+        for (keyword, start), (result, error) in zip(jobs, results):
+            if error:
+                errors.setdefault(keyword, f"[{keyword}] {error}")
+                continue
+            df = shop_json_frame(result.get("items", []), ["productId", "title", "lprice", "hprice", "mallName"])
+            df["mallName"] = df["mallName"].astype("string")
+            df.insert(0, "keyword", keyword)
+            df["rank"] = np.arange(start, start + len(df), dtype=np.int32)
+            frames.setdefault(keyword, []).append(df)
+
+    checked = [k for k in dict.fromkeys(keywords) if k not in errors and k in frames]
+    if not checked:
+        return pd.DataFrame(columns=KEY_COLUMNS + VALUE_COLUMNS + ["title", "rank"]), [], list(errors.values())
+    current = pd.concat([df for k in checked for df in frames[k]], ignore_index=True)
+    # 상품ID가 없거나 (페이지 경계에서) 두 번 나온 상품은 높은 순위 하나만
+    current = current.dropna(subset=["productId"]).drop_duplicates(KEY_COLUMNS, keep="first")
+    return current.reset_index(drop=True), checked, list(errors.values())
+
+
+class OutboxSink:
+    """알림을 한 줄에 하나씩 JSON으로 이어 쓰는 로컬 outbox 파일"""
+
+    def __init__(self, path=DEFAULT_OUTBOX_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+
+    def send(self, alerts):
+        with open(self.path, "a", encoding="utf-8") as f:
+            lines = alerts.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+            f.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+class WebhookSink:
+    """알림 묶음을 {"alerts": [...]} JSON으로 POST (공용 HTTP 세션 사용)"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        payload = json.loads(alerts.to_json(orient="records", force_ascii=False, date_format="iso"))
+        r = get_client().post(self.url, json={"alerts": payload}, timeout=self.timeout)
+        r.raise_for_status()
+
+
+class PriceMonitor(PeriodicCollector):
+    """키워드 목록의 쇼핑 가격을 주기적으로 조회해 바뀐 상품만 기록하고 알림으로 보냄"""
+
+    checked_label = "상품"
+    thread_name = "price-monitor"
+
+    def __init__(self, store, keywords, client_id, client_secret, interval=DEFAULT_INTERVAL, pages=DEFAULT_PAGES,
+                 concurrency=DEFAULT_CONCURRENCY, sinks=(), min_change_pct=0.0, on_error=None):
+        super().__init__(interval, on_error)
+        self.store = store
+        self.keywords = list(dict.fromkeys(keywords))
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.pages = pages
+        self.concurrency = concurrency
+        self.sinks = list(sinks)
+        self.min_change_pct = min_change_pct
+
+    def alerts(self, changes):
+        """알릴 변경만 (가격만 바뀐 상품은 최저가 변동률이 min_change_pct 이상일 때)"""
+        if not self.min_change_pct:
+            return changes
+        small = (changes["change"] == "price") & ~(changes["lprice_pct"].abs() >= self.min_change_pct).fillna(False)
+        return changes[~small]
+
+    def run_once(self):
+        """한 번 조회해서 기록하고 (조회한 상품 수, 변경 건수)를 반환"""
+        ts = int(time.time())
+        current, checked, errors = fetch_snapshots(self.keywords, self.client_id, self.client_secret,
+                                                   self.pages, self.concurrency)
+        for error in errors:
+            self.on_error(f"shop {error}")
+        if not checked:
+            return 0, 0
+        changes = self.store.apply(current, checked, ts)
+        alerts = self.alerts(changes)
+        if not alerts.empty:
+            for sink in self.sinks:
+                try:
+                    sink.send(alerts)
+                except Exception as e:
+                    self.on_error(f"알림 전송 실패 ({type(sink).__name__}): {e}")
+        return len(current), len(changes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 쇼핑 가격 변동 감시/조회")
+    parser.add_argument("--db", default=DEFAULT_PRICES_PATH, help="스냅샷 저장소 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    watch = sub.add_parser("watch", help="키워드 목록을 주기적으로 감시")
+    watch.add_argument("keywords", help="한 줄에 키워드 하나인 파일")
+    watch.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help="감시 주기(초)")
+    watch.add_argument("--pages", type=int, default=DEFAULT_PAGES, help="키워드당 조회할 100개 단위 페이지 수 (최대 10)")
+    watch.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수")
+    watch.add_argument("--outbox", default=DEFAULT_OUTBOX_PATH, help="알림 JSONL 파일 ('' 이면 쓰지 않음)")
+    watch.add_argument("--webhook", help="알림을 POST할 URL")
+    watch.add_argument("--min-change-pct", type=float, default=0.0, help="가격 알림 최소 변동률(%%)")
+    watch.add_argument("--once", action="store_true", help="한 번만 조회하고 종료")
+    changes = sub.add_parser("changes", help="변경 이력 조회")
+    changes.add_argument("--keyword")
+    changes.add_argument("--change", choices=CHANGE_KINDS)
+    changes.add_argument("--start")
+    changes.add_argument("--end")
+    changes.add_argument("-o", "--output", help="파일로 저장 (.csv, .jsonl, .parquet. 생략 시 화면 출력)")
+    args = parser.parse_args(argv)
+
+    store = PriceSnapshotStore(args.db)
+    if args.command == "changes":
+        df = store.changes(args.keyword, args.change, args.start, args.end)
+        if args.output:
+            with ResultWriter(args.output) as writer:
+                writer.write(df)
+            print(f"✅ {writer.rows}행 저장: {args.output}")
+        else:
+            print(df.to_string(index=False))
+        return 0
+
+    client_id = os.getenv("NAVER_CLIENT_ID", "")
+    client_secret = os.getenv("NAVER_CLIENT_SECRET", "")
+    # 키 풀(credentials.json, NAVER_CREDENTIALS)이 있으면 풀에서 키를 나눠 씀
+    if get_pool("openapi") is not None:
+        client_id = client_secret = ""
+    elif not client_id or not client_secret:
+        print("⚠️  환경 변수가 설정되지 않았습니다: NAVER_CLIENT_ID, NAVER_CLIENT_SECRET", file=sys.stderr)
+        return 1
+    with open(args.keywords, encoding="utf-8-sig") as f:
+        lines = (line.strip() for line in f)
+        keywords = [line for line in lines if line and not line.startswith("#")]
+    sinks = []
+    if args.outbox:
+        sinks.append(OutboxSink(args.outbox))
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    monitor = PriceMonitor(store, keywords, client_id, client_secret, args.interval,
+                           max(1, min(args.pages, 10)), args.concurrency, sinks, args.min_change_pct)
+    if args.once:
+        checked, changed = monitor.run_once()
+        print(f"✅ 상품 {checked}건, 변경 {changed}건")
+        return 0
+    try:
+        monitor.run_forever()
+    except KeyboardInterrupt:
+        monitor.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
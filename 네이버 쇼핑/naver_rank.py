@@ -0,0 +1,285 @@
+from concurrent.futures import wait, FIRST_COMPLETED
+
+import pandas as pd
+
+from naver_api import search_naver_shopping, get_blog_results
+from naver_flight import ContextThreadPoolExecutor
+from naver_items import ShopItem
+
+
+# 쇼핑 검색 API 한계: display 최대 100, start 최대 1000
+PAGE_SIZE = 100
+MAX_RANK = 1000
+DEFAULT_CONCURRENCY = 8
+# 대상 하나당 동시에 미리 요청할 페이지 수
+DEFAULT_PAGE_LOOKAHEAD = 3
+
+
+def parse_rank_targets(text):
+    """'키워드 | 상품ID 또는 쇼핑몰명' 형식의 줄 목록을 추적 대상으로 변환
+
+    대상이 숫자로만 이루어져 있으면 상품ID, 그렇지 않으면 쇼핑몰명으로 봅니다.
+    """
+    targets = []
+    for line in text.splitlines():
+        if "|" not in line:
+            continue
+        keyword, target = (part.strip() for part in line.split("|", 1))
+        if not keyword or not target:
+            continue
+        if target.isdigit():
+            targets.append({"keyword": keyword, "productId": target, "mallName": None})
+        else:
+            targets.append({"keyword": keyword, "productId": None, "mallName": target})
+    return targets
+
+
+def _match_index(items, product_id, mall_name):
+    """페이지 안에서 대상과 일치하는 첫 상품의 위치 (없으면 None)"""
+    for i, item in enumerate(items):
+        if product_id and str(item.get("productId")) == str(product_id):
+            return i
+        if mall_name and item.get("mallName") == mall_name:
+            return i
+    return None
+
+
+def _last_page_start(total):
+    """결과 총량 total을 덮는 마지막 페이지의 start 값"""
+    if total <= 0:
+        return 1
+    return (total - 1) // PAGE_SIZE * PAGE_SIZE + 1
+
+
+class _TargetState:
+    def __init__(self, target, max_rank):
+        self.target = target
+        self.next_start = 1
+        self.last_start = max_rank - PAGE_SIZE + 1
+        self.in_flight = 0
+        self.pages_done = set()
+        self.best = None  # (rank, item)
+        self.error = None
+        self.finished = False
+
+    @property
+    def keyword(self):
+        return self.target["keyword"]
+
+    def limit(self):
+        """이 순위 이상에서 시작하는 페이지는 더 볼 필요 없음"""
+        return self.best[0] if self.best else self.last_start + PAGE_SIZE
+
+    def can_submit(self, lookahead):
+        if self.finished or self.error or self.in_flight >= lookahead:
+            return False
+        if self.next_start > self.last_start:
+            return False
+        # 이미 찾은 위치보다 뒤 페이지는 요청하지 않음
+        return self.next_start < self.limit()
+
+    def settle(self):
+        """찾은 순위 앞쪽 페이지가 모두 도착했으면 종료 처리"""
+        if self.error:
+            self.finished = self.in_flight == 0
+            return
+        needed = range(1, min(self.limit(), self.last_start + 1), PAGE_SIZE)
+        if self.in_flight == 0 and all(s in self.pages_done for s in needed):
+            self.finished = True
+
+    def handle(self, start, result):
+        """쇼핑 검색 응답 페이지 하나 반영"""
+        items = result.get("items", [])
+        self.pages_done.add(start)
+        index = _match_index(items, self.target.get("productId"), self.target.get("mallName"))
+        if index is not None:
+            rank = start + index
+            if self.best is None or rank < self.best[0]:
+                # 일치한 상품 하나만 파싱해 보관 (페이지 dict 전체를 붙잡지 않음)
+                self.best = (rank, ShopItem.from_json(items[index]))
+        # 결과 총량을 넘는 페이지는 요청하지 않음
+        total = int(result.get("total", 0) or 0)
+        self.last_start = min(self.last_start, _last_page_start(total))
+        if len(items) < PAGE_SIZE:
+            self.last_start = min(self.last_start, start)
+
+    def result(self):
+        row = {
+            "keyword": self.target["keyword"],
+            "productId": self.target.get("productId"),
+            "mallName": self.target.get("mallName"),
+            "rank": None,
+            "title": None,
+            "lprice": None,
+            "error": self.error,
+        }
+        if self.best:
+            rank, item = self.best
+            row.update({
+                "rank": rank,
+                "title": item.title,
+                "lprice": item.lprice,
+                "productId": str(item.product_id) if item.product_id is not None else None,
+                "mallName": item.mall_name,
+            })
+        return row
+
+
+def track_ranks(targets, client_id, client_secret, max_rank=MAX_RANK,
+                concurrency=DEFAULT_CONCURRENCY, page_lookahead=DEFAULT_PAGE_LOOKAHEAD,
+                sort='sim', use_cache=True):
+    """(키워드, 상품ID/쇼핑몰명) 목록의 쇼핑 검색 순위를 병렬로 조회
+
+    전체 동시 요청 수는 concurrency로 제한되며, 대상별로 최대 page_lookahead
+    페이지를 미리 요청합니다. 대상을 찾았거나 결과 총량/1000위 한계에
+    도달하면 해당 대상의 페이지 요청을 멈춥니다. 순위를 찾지 못하면 rank는
+    None입니다. 최신 순위가 필요한 주기 수집은 use_cache=False로 응답 캐시를 건너뜁니다.
+    """
+    states = [_TargetState(t, max_rank) for t in targets]
+
+    def fetch(keyword, start):
+        return search_naver_shopping(keyword, client_id, client_secret, PAGE_SIZE, start, sort, use_cache=use_cache)
+
+    _run_pages(states, fetch, concurrency, page_lookahead)
+    df = pd.DataFrame([s.result() for s in states],
+                      columns=["keyword", "productId", "mallName", "rank", "title", "lprice", "error"])
+    df["rank"] = df["rank"].astype("Int64")
+    df["lprice"] = df["lprice"].astype("Int64")
+    return df
+
+
+def _run_pages(states, fetch, concurrency, page_lookahead):
+    """대상 상태들의 페이지 요청을 전체 concurrency개 이내로 병렬 실행
+
+    fetch(keyword, start)는 (응답, 오류)를 반환하고, 성공한 응답은
+    state.handle(start, 응답)으로 넘깁니다. 모든 상태가 끝나면 반환합니다.
+    """
+    if not states:
+        return
+    pending = {}
+    with ContextThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        cursor = 0
+        while True:
+            # 빈 슬롯을 대상들에 돌아가며 배분 (한 대상이 슬롯을 독점하지 않도록)
+            scanned = 0
+            while len(pending) < concurrency and scanned < len(states):
+                state = states[cursor % len(states)]
+                cursor += 1
+                scanned += 1
+                if state.can_submit(page_lookahead):
+                    start = state.next_start
+                    state.next_start += PAGE_SIZE
+                    state.in_flight += 1
+                    future = executor.submit(fetch, state.keyword, start)
+                    pending[future] = (state, start)
+                    scanned = 0
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                state, start = pending.pop(future)
+                state.in_flight -= 1
+                result, error = future.result()
+                if error:
+                    state.error = error
+                else:
+                    state.handle(start, result)
+                state.settle()
+
+
+def normalize_blog_target(target):
+    """블로그 URL/bloggerlink 비교용 정규화 (스킴, www., m., 끝 슬래시 제거)"""
+    target = str(target).strip().lower()
+    for prefix in ("https://", "http://"):
+        if target.startswith(prefix):
+            target = target[len(prefix):]
+    for prefix in ("www.", "m."):
+        if target.startswith(prefix):
+            target = target[len(prefix):]
+    return target.rstrip("/")
+
+
+def _blog_link_matches(link, wanted):
+    """정규화된 링크가 대상 블로그(또는 그 아래 글)인지"""
+    return bool(link) and (link == wanted or link.startswith(wanted + "/"))
+
+
+def parse_blog_keywords(text):
+    """줄바꿈/쉼표로 구분된 블로그 검색 키워드 목록 (공백은 유지, 중복 제거)"""
+    keywords = []
+    seen = set()
+    for keyword in text.replace(",", "\n").splitlines():
+        keyword = " ".join(keyword.split())
+        if keyword and keyword not in seen:
+            seen.add(keyword)
+            keywords.append(keyword)
+    return keywords
+
+
+class _BlogKeywordState(_TargetState):
+    """키워드 하나에 대해 여러 대상 블로그의 첫 노출 순위를 찾는 상태
+
+    모든 대상을 찾으면 가장 뒤에 찾은 순위 앞쪽 페이지까지만 요청합니다.
+    """
+
+    def __init__(self, keyword, targets, max_rank):
+        super().__init__({"keyword": keyword}, max_rank)
+        # 원래 입력 -> 정규화 값 (같은 블로그를 가리키는 입력이 여러 개여도 각각 채움)
+        self.wanted = {target: normalize_blog_target(target) for target in targets}
+        self.ranks = {}
+
+    def limit(self):
+        if self.wanted and len(self.ranks) == len(self.wanted):
+            return max(self.ranks.values())
+        return self.last_start + PAGE_SIZE
+
+    def handle(self, start, df):
+        """블로그 검색 결과 페이지(DataFrame) 하나 반영"""
+        self.pages_done.add(start)
+        count = 0 if df is None else len(df)
+        if count:
+            blogger_links = df["bloggerlink"].tolist() if "bloggerlink" in df.columns else [""] * count
+            links = df["link"].tolist() if "link" in df.columns else [""] * count
+            for i, (blogger_link, link) in enumerate(zip(blogger_links, links)):
+                rank = start + i
+                candidates = (normalize_blog_target(blogger_link or ""), normalize_blog_target(link or ""))
+                for target, wanted in self.wanted.items():
+                    if rank < self.ranks.get(target, MAX_RANK + 1) and any(
+                            _blog_link_matches(c, wanted) for c in candidates):
+                        self.ranks[target] = rank
+        # 블로그 검색 응답 DataFrame에는 total이 없으므로 덜 찬 페이지를 마지막으로 봄
+        if count < PAGE_SIZE:
+            self.last_start = min(self.last_start, start)
+
+    def result(self):
+        row = {"keyword": self.keyword}
+        row.update({target: self.ranks.get(target) for target in self.wanted})
+        row["error"] = self.error
+        return row
+
+
+def track_blog_ranks(keywords, targets, client_id, client_secret, max_rank=MAX_RANK,
+                     concurrency=DEFAULT_CONCURRENCY, page_lookahead=DEFAULT_PAGE_LOOKAHEAD,
+                     sort='sim', use_cache=True):
+    """여러 키워드의 블로그 검색에서 대상 블로그들이 처음 나오는 순위 행렬
+
+    targets는 블로그 URL 또는 bloggerlink 목록입니다. 키워드별 페이지를
+    track_ranks와 같은 방식으로 병렬 조회하고, 그 키워드에서 모든 대상을
+    찾으면 남은 페이지는 요청하지 않습니다. 반환값은 keyword, 대상별 순위
+    (Int64, 못 찾으면 결측), error 컬럼을 가진 DataFrame입니다. use_cache는
+    track_ranks와 같습니다.
+    """
+    targets = list(dict.fromkeys(t.strip() for t in targets if t and t.strip()))
+    states = [_BlogKeywordState(keyword, targets, max_rank) for keyword in dict.fromkeys(keywords)]
+
+    def fetch(keyword, start):
+        return get_blog_results(client_id, client_secret, keyword, PAGE_SIZE, start, sort, use_cache=use_cache)
+
+    # 대상이 없으면 찾을 것도 없으므로 요청하지 않음
+    _run_pages(states if targets else [], fetch, concurrency, page_lookahead)
+    df = pd.DataFrame([s.result() for s in states], columns=["keyword", *targets, "error"])
+    for target in targets:
+        df[target] = df[target].astype("Int64")
+    return df
+
@@ -0,0 +1,435 @@
+import asyncio
+import contextlib
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+from naver_flight import current_session
+from naver_metrics import get_metrics
+
+
+# 네이버 문서 기준 엔드포인트별 한도: (초당 요청 수, 일일 호출 한도 또는 None)
+# 검색 API는 애플리케이션당 하루 25,000회, DataLab 검색어 트렌드는 1,000회
+ENDPOINT_LIMITS = {
+    "keywordstool": (5, None),
+    "shop": (10, 25000),
+    "blog": (10, 25000),
+    "datalab": (5, 1000),
+}
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 30.0
+# 429 이후 속도를 줄일 수 있는 하한 (기본 속도 대비 비율)
+MIN_RATE_RATIO = 0.1
+# 일일 한도는 한국 시간 자정에 초기화됨
+KST = timezone(timedelta(hours=9))
+
+
+class QuotaExceededError(Exception):
+    """일일 호출 한도를 모두 사용한 경우"""
+
+
+# 응답/한도 초과 이벤트 구독자: fn(credential, endpoint, status, latency)
+# status는 HTTP 상태 코드 또는 일일 한도 초과 시 "quota" (latency는 None)
+_listeners = []
+
+
+def add_listener(listener):
+    """모든 스케줄러의 응답 이벤트를 받을 함수 등록 (키 풀의 상태 추적용)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(credential, endpoint, status, latency):
+    for listener in list(_listeners):
+        listener(credential, endpoint, status, latency)
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 초당 요청 수 제한기 (스레드 안전)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def set_rate(self, rate):
+        """버킷 속도 변경 (지금까지 쌓인 토큰은 이전 속도로 계산)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def _try_take(self):
+        """토큰을 얻으면 0, 아니면 다음 토큰까지 남은 초를 반환"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class FairGate:
+    """세션별 대기열을 돌아가며 한 번에 한 호출자만 통과시키는 문 (라운드 로빈)
+
+    토큰 버킷 앞에 두면 한 세션이 스레드 수십 개로 대량 조회를 돌리는 중에도
+    다른 세션의 호출은 세션 수만큼의 차례 안에 토큰을 받습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiting = OrderedDict()  # 세션 -> 기다리는 Event 목록
+        self._busy = False
+
+    @contextlib.contextmanager
+    def turn(self, session):
+        with self._lock:
+            if self._busy:
+                event = threading.Event()
+                self._waiting.setdefault(session, deque()).append(event)
+            else:
+                self._busy = True
+                event = None
+        if event is not None:
+            event.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            if not self._waiting:
+                self._busy = False
+                return
+            # 맨 앞 세션의 첫 호출자를 깨우고 그 세션은 맨 뒤로 보냄
+            session, queue = self._waiting.popitem(last=False)
+            event = queue.popleft()
+            if queue:
+                self._waiting[session] = queue
+        event.set()
+
+    def waiting(self):
+        """세션별 대기 호출 수"""
+        with self._lock:
+            return {session: len(queue) for session, queue in self._waiting.items()}
+
+
+class DailyQuota:
+    """하루 호출 수 카운터 (KST 날짜가 바뀌면 초기화)"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.day = datetime.now(KST).date()
+        self._lock = threading.Lock()
+
+    def _roll(self):
+        today = datetime.now(KST).date()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+
+    def take(self):
+        with self._lock:
+            self._roll()
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    def remaining(self):
+        with self._lock:
+            self._roll()
+            return None if self.limit is None else max(0, self.limit - self.used)
+
+
+_QUOTA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_quota (
+    key TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, day)
+);
+"""
+_quota_dbs = {}
+_quota_dbs_lock = threading.Lock()
+
+
+def _today():
+    return int(datetime.now(KST).strftime("%Y%m%d"))
+
+
+def _quota_db(path):
+    """경로별 (연결, 잠금)을 프로세스에서 하나만 열어 둠. 지난 날짜 행은 열 때 지움"""
+    with _quota_dbs_lock:
+        entry = _quota_dbs.get(path)
+        if entry is None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_QUOTA_SCHEMA)
+            db.execute("DELETE FROM api_quota WHERE day < ?", (_today(),))
+            entry = _quota_dbs[path] = (db, threading.Lock())
+        return entry
+
+
+class SharedDailyQuota:
+    """여러 프로세스가 SQLite 파일 하나에서 함께 세는 하루 호출 수 카운터
+
+    DailyQuota와 같은 인터페이스입니다. 작업자 프로세스와 Streamlit 프로세스가
+    같은 파일을 쓰면 모두 한 일일 예산에서 차감합니다. 자격증명은 해시로만 저장합니다.
+    """
+
+    def __init__(self, path, credential, endpoint, limit):
+        self.limit = limit
+        self._key = hashlib.sha256(f"{credential}\0{endpoint}".encode("utf-8")).hexdigest()[:16]
+        self._db, self._lock = _quota_db(path)
+
+    def take(self):
+        day = _today()
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO api_quota (key, day) VALUES (?, ?)", (self._key, day))
+            # 한도 확인과 차감을 한 문장으로 해서 프로세스 사이에서도 원자적
+            cursor = self._db.execute(
+                "UPDATE api_quota SET used = used + 1 WHERE key = ? AND day = ? AND (? IS NULL OR used < ?)",
+                (self._key, day, self.limit, self.limit))
+            return cursor.rowcount == 1
+
+    @property
+    def used(self):
+        with self._lock:
+            row = self._db.execute("SELECT used FROM api_quota WHERE key = ? AND day = ?",
+                                   (self._key, _today())).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self):
+        return None if self.limit is None else max(0, self.limit - self.used)
+
+
+class _Slot:
+    def __init__(self, qps, quota):
+        self.base_rate = float(qps)
+        self.limiter = RateLimiter(qps)
+        self.gate = FairGate()
+        self.quota = quota
+        self.throttled = 0
+        self.retries = 0
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 기다릴 초(float)로. 해석할 수 없으면 None"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        moment = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError, IndexError):
+        return None
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        # 시간대가 없는 HTTP 날짜는 GMT
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, moment.timestamp() - (time.time() if now is None else now))
+
+
+class RateLimitScheduler:
+    """자격증명 x 엔드포인트별 토큰 버킷, 일일 한도, 429 재시도를 한곳에서 관리
+
+    429를 받으면 해당 버킷의 속도를 절반으로 줄이고 (기본 속도의 MIN_RATE_RATIO
+    까지) Retry-After 또는 지터가 섞인 지수 백오프만큼 기다렸다가 재시도합니다.
+    성공할 때마다 속도를 조금씩 기본값으로 되돌리므로 병렬 호출자들이 지속
+    가능한 최대 처리량에 수렴합니다.
+
+    quota_path를 주면 일일 한도를 그 SQLite 파일에서 세어 같은 파일을 쓰는
+    모든 프로세스가 한 예산을 나눠 씁니다 (한도가 없는 엔드포인트는 제외).
+    """
+
+    def __init__(self, limits=None, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, quota_path=None):
+        self.limits = dict(ENDPOINT_LIMITS, **(limits or {}))
+        self.quota_path = quota_path
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, credential, endpoint):
+        key = (credential, endpoint)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                qps, daily = self.limits.get(endpoint, (10, None))
+                if self.quota_path and daily is not None:
+                    quota = SharedDailyQuota(self.quota_path, credential, endpoint, daily)
+                else:
+                    quota = DailyQuota(daily)
+                slot = _Slot(qps, quota)
+                self._slots[key] = slot
+            return slot
+
+    def _take_quota(self, slot, credential, endpoint):
+        if not slot.quota.take():
+            get_metrics().record_error(endpoint, "quota")
+            _notify(credential, endpoint, "quota", None)
+            raise QuotaExceededError(
+                f"일일 호출 한도 초과: {endpoint} ({slot.quota.limit}회, 자정(KST)에 초기화)"
+            )
+
+    def acquire(self, credential, endpoint):
+        """일일 한도를 확인하고 토큰을 얻을 때까지 대기
+
+        토큰은 세션(naver_flight.current_session)별로 돌아가며 나눠 줍니다.
+        """
+        slot = self._slot(credential, endpoint)
+        self._take_quota(slot, credential, endpoint)
+        with slot.gate.turn(current_session()):
+            slot.limiter.acquire()
+
+    async def acquire_async(self, credential, endpoint):
+        slot = self._slot(credential, endpoint)
+        self._take_quota(slot, credential, endpoint)
+        await slot.limiter.acquire_async()
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """지터가 섞인 지수 백오프. Retry-After가 있으면 그보다 짧게 기다리지 않음"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = parse_retry_after(retry_after)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def on_throttled(self, credential, endpoint):
+        get_metrics().inc("naver_throttled_total", endpoint=endpoint)
+        slot = self._slot(credential, endpoint)
+        slot.throttled += 1
+        slot.limiter.set_rate(max(slot.base_rate * MIN_RATE_RATIO, slot.limiter.rate / 2))
+
+    def on_success(self, credential, endpoint):
+        slot = self._slot(credential, endpoint)
+        if slot.limiter.rate < slot.base_rate:
+            slot.limiter.set_rate(min(slot.base_rate, slot.limiter.rate + slot.base_rate * 0.05))
+
+    def remaining(self, credential, endpoint):
+        """남은 일일 호출 수 (한도가 없으면 None)"""
+        return self._slot(credential, endpoint).quota.remaining()
+
+    def call(self, credential, endpoint, send):
+        """send()가 돌려준 requests.Response가 429면 백오프 후 재시도
+
+        재시도를 모두 쓰면 마지막 응답을 그대로 반환합니다. 일일 한도를 다 쓴
+        경우 QuotaExceededError를 던집니다.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(credential, endpoint)
+            started = time.perf_counter()
+            response = send()
+            _notify(credential, endpoint, response.status_code, time.perf_counter() - started)
+            if response.status_code != 429:
+                self.on_success(credential, endpoint)
+                return response
+            self.on_throttled(credential, endpoint)
+            if attempt == self.max_retries:
+                return response
+            self._slot(credential, endpoint).retries += 1
+            get_metrics().inc("naver_retries_total", endpoint=endpoint)
+            time.sleep(self.backoff_delay(attempt, response.headers.get("Retry-After")))
+        return response
+
+    async def call_async(self, credential, endpoint, send):
+        """call의 asyncio 버전. send()는 (status, reason, text, headers) 코루틴"""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(credential, endpoint)
+            started = time.perf_counter()
+            result = await send()
+            status, headers = result[0], result[3]
+            _notify(credential, endpoint, status, time.perf_counter() - started)
+            if status != 429:
+                self.on_success(credential, endpoint)
+                return result
+            self.on_throttled(credential, endpoint)
+            if attempt == self.max_retries:
+                return result
+            self._slot(credential, endpoint).retries += 1
+            get_metrics().inc("naver_retries_total", endpoint=endpoint)
+            await asyncio.sleep(self.backoff_delay(attempt, headers.get("Retry-After")))
+        return result
+
+    def snapshot(self):
+        """버킷별 현재 속도/남은 한도/429 횟수"""
+        with self._lock:
+            items = list(self._slots.items())
+        return [
+            {
+                "credential": credential,
+                "endpoint": endpoint,
+                "rate": slot.limiter.rate,
+                "base_rate": slot.base_rate,
+                "used_today": slot.quota.used,
+                "remaining_today": slot.quota.remaining(),
+                "throttled": slot.throttled,
+                "retries": slot.retries,
+            }
+            for (credential, endpoint), slot in items
+        ]
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """프로세스 전역 스케줄러 반환 (최초 호출 시 생성)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RateLimitScheduler()
+        return _scheduler
+
+
+def configure_scheduler(**kwargs):
+    """전역 스케줄러를 새 설정으로 교체 (kwargs는 RateLimitScheduler 인자)"""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = RateLimitScheduler(**kwargs)
+        return _scheduler
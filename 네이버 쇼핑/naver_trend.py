@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from naver_api import get_naver_trend_groups
+from naver_flight import ContextThreadPoolExecutor
+
+
+# DataLab 검색어 트렌드 한도: 요청당 그룹 5개, 그룹당 키워드 20개
+MAX_GROUPS_PER_REQUEST = 5
+MAX_KEYWORDS_PER_GROUP = 20
+DEFAULT_MAX_WORKERS = 4
+
+
+def parse_keyword_groups(text):
+    """'그룹명: 키워드1, 키워드2' 형식의 줄 목록을 keywordGroups로 변환
+
+    ':'가 없는 줄은 키워드 하나짜리 그룹(그룹명 = 키워드)으로 봅니다.
+    """
+    groups = []
+    seen = set()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if ":" in line:
+            name, keywords = line.split(":", 1)
+            name = name.strip()
+            keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+        else:
+            name, keywords = line, [line]
+        if not name or not keywords or name in seen:
+            continue
+        seen.add(name)
+        groups.append({"groupName": name, "keywords": keywords[:MAX_KEYWORDS_PER_GROUP]})
+    return groups
+
+
+def pack_groups(groups, anchor=None):
+    """그룹 목록을 요청 단위로 묶음
+
+    5개 이하면 한 번에 요청합니다. 그보다 많으면 모든 요청에 같은 기준(anchor)
+    그룹을 넣고 나머지 4칸을 채워, 요청 간 비율을 기준 그룹으로 맞출 수 있게
+    합니다. 반환값은 (요청별 그룹 목록, 기준 그룹명)입니다. anchor가 없으면 첫
+    그룹을 기준으로 쓰고, 그룹 목록에 없는 이름이면 ValueError를 냅니다.
+    """
+    if anchor is not None and not any(g["groupName"] == anchor for g in groups):
+        raise ValueError(f"기준 그룹 '{anchor}'이(가) 키워드 그룹 목록에 없습니다.")
+    if len(groups) <= MAX_GROUPS_PER_REQUEST:
+        return [list(groups)], None
+    anchor_group = next((g for g in groups if g["groupName"] == anchor), groups[0])
+    others = [g for g in groups if g["groupName"] != anchor_group["groupName"]]
+    size = MAX_GROUPS_PER_REQUEST - 1
+    batches = [[anchor_group] + others[i:i + size] for i in range(0, len(others), size)]
+    return batches, anchor_group["groupName"]
+
+
+def trend_result_to_frame(result, batch):
+    """DataLab 응답 하나를 (batch, group, period, ratio) long 형식으로 변환"""
+    rows = [
+        (batch, item["title"], point["period"], point["ratio"])
+        for item in result.get("results", [])
+        for point in item.get("data", [])
+    ]
+    return pd.DataFrame(rows, columns=["batch", "group", "period", "ratio"])
+
+
+def rescale_batches(df, anchor):
+    """요청마다 최댓값 기준으로 매겨진 비율을 하나의 공통 척도로 재조정
+
+    기준 그룹의 기간 합계 비율(기준 요청 / 각 요청)을 요청별 배율로 삼아 곱한
+    뒤, 기준 그룹 중복 행을 기준 요청(가장 앞선 요청) 것만 남기고 전체 최댓값을
+    100으로 맞춥니다. 기준 그룹의 합계가 0인 요청은 비교할 수 없으므로 ratio가 NaN이 됩니다.
+    """
+    if df.empty:
+        return df
+    if anchor is not None and df["batch"].nunique() > 1:
+        anchor_sums = df[df["group"] == anchor].groupby("batch")["ratio"].sum()
+        reference_batch = df["batch"].min()
+        reference = anchor_sums.get(reference_batch, np.nan)
+        factors = reference / anchor_sums.replace(0, np.nan)
+        df = df.assign(ratio=df["ratio"].to_numpy() * df["batch"].map(factors).to_numpy())
+        df = df[(df["group"] != anchor) | (df["batch"] == reference_batch)]
+    peak = df["ratio"].max()
+    if peak and not np.isnan(peak):
+        df = df.assign(ratio=df["ratio"] / peak * 100)
+    return df.reset_index(drop=True)
+
+
+def get_trend_frame(client_id, client_secret, start_date, end_date, time_unit, groups,
+                    device="", ages=None, gender="", anchor=None, max_workers=DEFAULT_MAX_WORKERS):
+    """여러 키워드 그룹의 검색어 트렌드를 하나의 척도로 조회
+
+    groups는 [{"groupName", "keywords"}] 목록이며 개수 제한이 없습니다.
+    요청들을 병렬로 보낸 뒤 기준 그룹으로 재조정한 long 형식 DataFrame
+    (group, keywords, period, ratio)과 오류 메시지 목록을 반환합니다.
+    """
+    if not groups:
+        return None, ["조회할 키워드 그룹이 없습니다."]
+    batches, anchor_name = pack_groups(groups, anchor)
+
+    def fetch(batch_groups):
+        return get_naver_trend_groups(client_id, client_secret, start_date, end_date, time_unit,
+                                      batch_groups, device, ages or [], gender)
+
+    frames = []
+    errors = []
+    with ContextThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+        for i, result in enumerate(executor.map(fetch, batches)):
+            if "results" in result:
+                frames.append(trend_result_to_frame(result, i))
+            else:
+                names = ", ".join(g["groupName"] for g in batches[i])
+                errors.append(f"[{names}] {result.get('error', '알 수 없는 오류')} {result.get('details', '')}".strip())
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if df.empty:
+        return None, errors or ["트렌드 데이터가 없습니다."]
+    df = rescale_batches(df, anchor_name)
+    keywords = {g["groupName"]: ", ".join(g["keywords"]) for g in groups}
+    df["period"] = pd.to_datetime(df["period"])
+    df["group"] = pd.Categorical(df["group"], categories=[g["groupName"] for g in groups])
+    df.insert(2, "keywords", df["group"].map(keywords).astype(str))
+    return df.drop(columns="batch").sort_values(["group", "period"]).reset_index(drop=True), errors
@@ -0,0 +1,139 @@
+import itertools
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from naver_cache import DEFAULT_TTLS
+from naver_export import EXPORT_FORMATS, deferred_download
+from naver_items import shop_json_frame
+from naver_numeric import normalize_keyword_frame
+
+
+# 세션 상태에 결과를 보관하는 키와 탭(슬롯)별 최대 보관 쿼리 수
+RESULTS_STATE_KEY = "_naver_results"
+MAX_RESULTS_PER_SLOT = 10
+# 파생 뷰 메모이제이션 최대 항목 수 (프로세스 전역, 결과 id로 구분)
+VIEW_CACHE_ENTRIES = 64
+
+KEYWORD_COLUMNS = {
+    'relKeyword': '연관 키워드',
+    'monthlyPcQcCnt': '월간 PC 검색수',
+    'monthlyMobileQcCnt': '월간 모바일 검색수',
+    'monthlyAvePcClkCnt': '월평균 PC 클릭수',
+    'monthlyAveMobileClkCnt': '월평균 모바일 클릭수',
+    'monthlyAvePcCtr': '월평균 PC 클릭률',
+    'monthlyAveMobileCtr': '월평균 모바일 클릭률',
+    'plAvgDepth': '월평균 노출 광고수',
+    'compIdx': '경쟁정도',
+    'monthlyPcQcCnt_num': '월간 PC 검색수_num',
+    'monthlyMobileQcCnt_num': '월간 모바일 검색수_num',
+    'totalQcCnt': '총 검색수'
+}
+
+SHOP_COLUMNS = {
+    'title': '상품명',
+    'lprice': '최저가',
+    'hprice': '최고가',
+    'mallName': '쇼핑몰',
+    'productId': '상품ID',
+    'productType': '상품타입',
+    'brand': '브랜드',
+    'maker': '제조사',
+    'category1': '대분류',
+    'category2': '중분류',
+    'category3': '소분류',
+    'category4': '세분류'
+}
+
+_result_ids = itertools.count(1)
+
+
+def store_result(state, slot, query, value, endpoint=None):
+    """조회 결과를 세션 상태에 쿼리별로 저장하고 항목(dict)을 반환
+
+    항목의 id는 프로세스 전체에서 유일하므로 파생 뷰 캐시 키로 씁니다.
+    slot은 탭 이름처럼 결과를 구분하는 문자열, query는 해시 가능한 조회 조건입니다.
+    """
+    results = state.get(RESULTS_STATE_KEY)
+    if results is None:
+        results = state[RESULTS_STATE_KEY] = {}
+    slot_results = results.setdefault(slot, OrderedDict())
+    entry = {"id": next(_result_ids), "query": query, "value": value,
+             "endpoint": endpoint, "fetched_at": time.time()}
+    slot_results[query] = entry
+    slot_results.move_to_end(query)
+    while len(slot_results) > MAX_RESULTS_PER_SLOT:
+        slot_results.popitem(last=False)
+    return entry
+
+
+def get_result(state, slot, query=None):
+    """저장된 결과 항목. query가 없으면 마지막으로 저장/조회한 것
+
+    응답 캐시 TTL이 지난 항목은 없는 것으로 봅니다.
+    """
+    slot_results = (state.get(RESULTS_STATE_KEY) or {}).get(slot)
+    if not slot_results:
+        return None
+    if query is None:
+        query = next(reversed(slot_results))
+    entry = slot_results.get(query)
+    if entry is None:
+        return None
+    ttl = DEFAULT_TTLS.get(entry["endpoint"])
+    if ttl is not None and time.time() - entry["fetched_at"] > ttl:
+        del slot_results[query]
+        return None
+    slot_results.move_to_end(query)
+    return entry
+
+
+# 아래 뷰 함수들은 결과 id로만 캐시됨 (_로 시작하는 인자는 해시하지 않음)
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def keyword_view(result_id, _df):
+    """키워드도구 결과 -> 숫자 변환, 한글 컬럼, 총 검색수 내림차순"""
+    df_display = normalize_keyword_frame(_df).rename(columns=KEYWORD_COLUMNS)
+    if '총 검색수' in df_display.columns:
+        df_display = df_display.sort_values('총 검색수', ascending=False)
+    return df_display
+
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def shopping_view(result_id, _result):
+    """쇼핑 검색 응답 JSON -> 표시용 DataFrame
+
+    HTML 태그 제거와 가격 정수 변환은 파싱할 때 한 번에 하고, 표시할 컬럼만 만듭니다.
+    """
+    return shop_json_frame(_result.get('items', []), list(SHOP_COLUMNS)).rename(columns=SHOP_COLUMNS)
+
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def price_stats(result_id, _df_items):
+    """최저가 통계와 쇼핑몰별 상품 수 (상위 10개)"""
+    stats = {}
+    if '최저가' in _df_items.columns:
+        prices = _df_items['최저가'].dropna()
+        stats.update(min=prices.min(), max=prices.max(), mean=prices.mean(), median=prices.median())
+    if '쇼핑몰' in _df_items.columns:
+        stats["mall_counts"] = _df_items['쇼핑몰'].value_counts().head(10)
+    return stats
+
+
+def export_buttons(df, file_stem, key):
+    """CSV(utf-8-sig)/Parquet/JSONL 형식 선택과 다운로드 버튼
+
+    내보내기는 다운로드를 누를 때만 합니다 (download_button의 data 콜백,
+    Streamlit 1.52 이상). 만든 파일은 다운로드로 보낼 때 전체가 메모리에 올라갑니다.
+    """
+    col1, col2 = st.columns([3, 1])
+    fmt = col1.radio("내보내기 형식", list(EXPORT_FORMATS), horizontal=True, key=f"{key}_format")
+    mime, suffix = EXPORT_FORMATS[fmt]
+    col2.download_button(
+        label=f"📥 {fmt.upper()} 다운로드",
+        data=deferred_download(df, fmt),
+        file_name=f"{file_stem}{suffix}",
+        mime=mime,
+        key=f"{key}_download"
+    )